@@ -1,6 +1,7 @@
-from .anneal import SimulatedAnnealing, SAAnnealable
+from .anneal import SimulatedAnnealing, SAAnnealable, annealChains
 from .gold import goldSect
 from .genal import GeneticAlgorithm, GeneticAnimal
 from .differential_evolution import DifferentialEvolution
 from .ga import gaRun, GaStructure
 from .optimline import fitline_simple, fitline_perp, fitline_endpoints
+from .pool import WorkerPool, Objective
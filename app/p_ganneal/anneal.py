@@ -1,6 +1,7 @@
 import sys, random
 from math import exp
 import p_ggen, p_gmath
+from .pool import WorkerPool
 
 
 class SimulatedAnnealing(object):
@@ -145,6 +146,37 @@ class SimulatedAnnealing(object):
         return (x < xm)
 
 
+def annealChains(makeObj, nchains, seed=0, nworkers=0, **kw):
+    """Run nchains independent annealing chains, in parallel, and return the best one.
+
+    makeObj() creates a new annealable object (for example a class, or a
+    functools.partial of a class); makeObj and the states of the objects must
+    be picklable. The random generators of chain i are seeded with seeds which
+    depend only on seed and i, so that the result is reproducible and it does not
+    depend on the number of workers (see WorkerPool). kw are passed to
+    SimulatedAnnealing.config(); prt defaults to doNothing, since the messages
+    of the chains would be mixed.
+    It returns the index, the (real) energy and the state of the best chain;
+    ties are resolved in favour of the smaller index."""
+    r = random.Random(seed)
+    seeds = [(r.getrandbits(64), r.getrandbits(64)) for i in range(nchains)]
+    kw.setdefault("prt", p_ggen.doNothing)
+    with WorkerPool(nworkers) as pool:
+        res = pool.map(_annealChain, seeds, makeObj, kw)
+    i = min(range(nchains), key=lambda i: (res[i][0], i))
+    return i, res[i][0], res[i][1]
+
+
+def _annealChain(seeds, makeObj, kw):
+    "Run one annealing chain with the given seeds and return the energy and the state of the best configuration."
+    obj = makeObj()
+    sa = SimulatedAnnealing(**kw)
+    sa.r.seed(seeds[0])
+    obj.r.seed(seeds[1])
+    sa.anneal(obj)
+    return obj.energyState(), obj.getState()
+
+
 class SAAnnealable(object):
     "An abstract class for objects that can be annealed."
 
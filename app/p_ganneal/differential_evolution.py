@@ -1,6 +1,7 @@
 import numpy as np
 import numpy.random as nprand
 import time
+from .pool import WorkerPool
 
 
 class DifferentialEvolution:
@@ -9,9 +10,13 @@ class DifferentialEvolution:
     for global optimization over continuous spaces", Journal of Global Optimization, 11, pp.341–359.
 
     More at: https://doi.org/10.1023/A:1008202821328
+
+    If workers is not 1, the population is evaluated in parallel by worker
+    processes (0 means the number of CPUs); the optimization_problem must
+    then be picklable.
     """
 
-    def __init__(self, optimization_problem, population_size, mutation_factor, crossover_probability):
+    def __init__(self, optimization_problem, population_size, mutation_factor, crossover_probability, workers=1):
 
         self.dimension = optimization_problem.dimension
         self.lower_bounds = np.array(optimization_problem.lower_bounds)
@@ -31,6 +36,9 @@ class DifferentialEvolution:
 
         self.objective = lambda x: optimization_problem.fitness(x)
         self.constraints = lambda x: optimization_problem.constraints(x)
+        self.workers = workers
+        self.__problem = optimization_problem
+        self.__pool = None
 
         self.MAX_FUNCTION_EVALUATIONS = self.dimension * 4000  # Default value of maximum function evaluations
         self.PENALTY_FACTOR = 10 ** 15  # Default value of penalty factor
@@ -64,7 +72,7 @@ class DifferentialEvolution:
 
         for parent in range(self.population_size):
             self.__individuals[parent, :] = self.lower_bounds + self.__bound_range * nprand.rand(self.dimension)
-            self.__fitness[parent] = self.__evaluate(self.__individuals[parent, :])
+        self.__fitness[:] = self.__evaluateAll(self.__individuals)
 
         # Find the current best
         bestID = np.argmin(self.__fitness)
@@ -95,8 +103,9 @@ class DifferentialEvolution:
                     self.__trial[i, dim] = self.lower_bounds[dim] + self.__bound_range[dim] * nprand.rand()
 
     def __selection(self):
+        fitness_trials = self.__evaluateAll(self.__trial)
         for i in range(self.population_size):
-            fitness_trial = self.__evaluate(self.__trial[i, :])
+            fitness_trial = fitness_trials[i]
 
             if fitness_trial <= self.__fitness[i]:
                 self.__individuals[i, :] = self.__trial[i, :]
@@ -108,24 +117,31 @@ class DifferentialEvolution:
 
         self.__function_evaluations += self.population_size
 
+    def __evaluateAll(self, xs):
+        # Evaluate the rows of xs, in parallel if there are worker processes
+        if self.__pool is None or self.__pool.nworkers <= 1:
+            return [self.__evaluate(x) for x in xs]
+        return self.__pool.map(_evaluate, list(xs), self.__problem, self.PENALTY_FACTOR)
+
     def __evaluate(self, x):
         f = self.objective(x)
 
         return f + self.__penalty(self.constraints(x))
 
     def __penalty(self, g):
-        z = 0
-
-        for k in range(len(g)):
-            if g[k] > 0:
-                z = z + self.PENALTY_FACTOR * g[k] ** 2
-
-        return z
+        return _penalty(g, self.PENALTY_FACTOR)
 
     def solve(self):
+        with WorkerPool(self.workers) as self.__pool:
+            try:
+                self.__solve()
+            finally:
+                self.__pool = None
+
+    def __solve(self):
         self.__initialize()
 
-        tic = time.clock()
+        tic = time.perf_counter()
         while self.__function_evaluations < self.MAX_FUNCTION_EVALUATIONS:
             self.__mutation()
             self.__crossover()
@@ -133,7 +149,7 @@ class DifferentialEvolution:
             self.__selection()
 
             if self.verbose:
-                toc = time.clock()
+                toc = time.perf_counter()
                 time_elapsed = toc - tic
 
                 x = self.__best
@@ -145,3 +161,20 @@ class DifferentialEvolution:
 
                 print('FES: %4i | Fit: %12.4e' % (self.__function_evaluations, self.__fitness_min) + \
                       ' | CurBest: %s' % x + ' | Duration: %0.0f seconds' % time_elapsed)
+
+
+def _evaluate(x, optimization_problem, penalty_factor):
+    # Penalized fitness of x; it is called by the worker processes
+    f = optimization_problem.fitness(x)
+
+    return f + _penalty(optimization_problem.constraints(x), penalty_factor)
+
+
+def _penalty(g, penalty_factor):
+    z = 0
+
+    for k in range(len(g)):
+        if g[k] > 0:
+            z = z + penalty_factor * g[k] ** 2
+
+    return z
@@ -1,7 +1,17 @@
 import numpy as np
+from .pool import WorkerPool
 #from ypstruct import structure
 
 def gaRun(problem, params):
+    """Run the genetic algorithm.
+
+    If params.workers exists and it is not 1, the costs are computed in parallel
+    by worker processes (0 means the number of CPUs); problem.costfunc must
+    then be picklable (a module level function or an Objective)."""
+    with WorkerPool(getattr(params, "workers", 1)) as pool:
+        return _gaRun(problem, params, pool)
+
+def _gaRun(problem, params, pool):
     
     # Problem Information
     costfunc = problem.costfunc
@@ -32,9 +42,10 @@ def gaRun(problem, params):
     pop = empty_individual.repeat(npop)
     for i in range(npop):
         pop[i].position = np.random.uniform(varmin, varmax, nvar)
-        pop[i].cost = costfunc(pop[i].position)
-        if pop[i].cost < bestsol.cost:
-            bestsol = pop[i].deepcopy()
+    for x, cost in zip(pop, pool.map(costfunc, [x.position for x in pop])):
+        x.cost = cost
+        if x.cost < bestsol.cost:
+            bestsol = x.deepcopy()
 
     # Best Cost of Iterations
     bestcost = np.empty(maxit)
@@ -71,19 +82,15 @@ def gaRun(problem, params):
             apply_bound(c1, varmin, varmax)
             apply_bound(c2, varmin, varmax)
 
-            # Evaluate First Offspring
-            c1.cost = costfunc(c1.position)
-            if c1.cost < bestsol.cost:
-                bestsol = c1.deepcopy()
-
-            # Evaluate Second Offspring
-            c2.cost = costfunc(c2.position)
-            if c2.cost < bestsol.cost:
-                bestsol = c2.deepcopy()
-
             # Add Offsprings to popc
             popc.append(c1)
             popc.append(c2)
+
+        # Evaluate Offsprings
+        for c, cost in zip(popc, pool.map(costfunc, [c.position for c in popc])):
+            c.cost = cost
+            if c.cost < bestsol.cost:
+                bestsol = c.deepcopy()
         
 
         # Merge, Sort and Select
@@ -8,6 +8,7 @@ from math import ceil
 import random, copy
 import p_ggen
 from p_gmath import thanNearx
+from .pool import WorkerPool
 
 
 class GeneticAlgorithm(object):
@@ -40,12 +41,20 @@ class GeneticAlgorithm(object):
         self.nSample = 10       #Number animals taken in the sample in tournamentThanasis(); the least fit of these animals dies.
         self.comBiggerIsBetter = True    #If true justFitness() returns a number which must be maximised
                                          #If false justFitness() returns a number which must be minimised
+        self.nWorkers = 1       #Number of worker processes which compute the fitness (see WorkerPool)
+        self.pool = None        #The worker pool, while genetic() runs
         self.config(**kw)
 
 
-    def config(self, prt=None, nAnim=None, nGen=None, pmut=None, nValmax=None, nChrom=None, fitmax=None, biggerIsBetter=None):
-        "Change default values."
+    def config(self, prt=None, nAnim=None, nGen=None, pmut=None, nValmax=None, nChrom=None, fitmax=None, biggerIsBetter=None,
+        nWorkers=None):
+        """Change default values.
+
+        If nWorkers is not 1, the fitness of the animals of each generation is
+        computed in parallel by worker processes (0 means the number of CPUs):
+        the animals and justFitness() must be picklable."""
         if prt     is not None: self.prt     = prt
+        if nWorkers is not None: self.nWorkers = nWorkers
         if nAnim   is not None:
             if nAnim < self.nSample: raise ValueError("At least %d animals are required (for tournamentThanasis())" % (self.nSample,))
             self.nAnim   = nAnim
@@ -102,11 +111,20 @@ class GeneticAlgorithm(object):
         At the begining the animals aree random. Thus the biggest fitness of all animals is
         a reasonable big fitness.
         """
-        self.comFitmax = max(anim.justFitness(self) for anim in self.animals)
+        self.comFitmax = max(self.pool.map(_justFitness, self.animals, self))
 
 
     def genetic(self, DisAnimal):
         "Execute the genetic algorithm."
+        with WorkerPool(self.nWorkers) as self.pool:
+            try:
+                return self.__genetic(DisAnimal)
+            finally:
+                self.pool = None
+
+
+    def __genetic(self, DisAnimal):
+        "Execute the genetic algorithm; it actually does the job."
         self.animals.clear()
         del self.bests[:]
         for i in range(self.nAnim):
@@ -115,11 +133,13 @@ class GeneticAlgorithm(object):
         for self.bestall in self.animals: break     # Give a initial value to bestall
         for self.igen in range(self.nGen):
 #            print "Generation%4d" % igen
+            self.evaluate()
             self.bestIngen(self.igen)
             if self.converged(): break
             self.tournamentthanasis()
             self.breed()
         else:
+            self.evaluate()
             self.bestIngen(self.nGen)
             self.prt("Genetic algorithm terminated due to max generations", "can1")
         #self.prt("\nBest fitness for every generation", "info1")
@@ -134,6 +154,27 @@ class GeneticAlgorithm(object):
         return self.bestall, self.bests
 
 
+    def evaluate(self):
+        """Compute the fitness of the animals which have not been evaluated, if there are worker processes.
+
+        Otherwise the fitness is computed (serially) when it is first needed."""
+        if self.pool is None or self.pool.nworkers <= 1: return
+        anims = [anim for anim in self.animals if anim.ftns is None]
+        fs = self.pool.map(_justFitness, anims, self)
+        for anim, f in zip(anims, fs): anim.setFitness(self, f)   #works for python2,3
+
+
+    def __getstate__(self):
+        "When pickled (to be sent to the worker processes), the population, the worker pool and prt are left out."
+        d = self.__dict__.copy()
+        d["animals"] = set()
+        d["bests"] = []
+        d["bestall"] = None
+        d["pool"] = None
+        d["prt"] = p_ggen.doNothing
+        return d
+
+
     def converged(self):
         "Check if the genetic algoρithm converged; 30 steps with no optimisation."
         if len(self.bests) < 100: return False    #At least 100 generations
@@ -299,15 +340,19 @@ class GeneticAnimal(object):
 
     def fitness(self, ga):
         "The fitness corrected according to big or small is better, and corrected with deficiency."
-        if self.ftns == None:
-            self.ftns = self.justFitness(ga)   #Either bigger or smaller is better
-            if not ga.comBiggerIsBetter: self.ftns = ga.comFitmax - self.ftns
-            rep = self.ftns > ga.bestall.fitnessr(ga)
-            self.ftns -= self.defic
-            if rep: ga.bestall = copy.copy(self)
+        if self.ftns == None: self.setFitness(ga, self.justFitness(ga))
         return self.ftns
 
 
+    def setFitness(self, ga, f):
+        "Set the fitness from the value f of justFitness() (which may have been computed by a worker process)."
+        self.ftns = f                      #Either bigger or smaller is better
+        if not ga.comBiggerIsBetter: self.ftns = ga.comFitmax - self.ftns
+        rep = self.ftns > ga.bestall.fitnessr(ga)
+        self.ftns -= self.defic
+        if rep: ga.bestall = copy.copy(self)
+
+
     def justFitness(self, ga):
         "The fitness of the animal; the bigger the better."
         raise AttributeError("Method justFitness() should be overriden.")
@@ -321,3 +366,8 @@ class GeneticAnimal(object):
     def detail(self, ga, fw):
         "Details about the distribution represented by the animal."
         pass
+
+
+def _justFitness(anim, ga):
+    "Compute the fitness of an animal; it is called by the worker processes."
+    return anim.justFitness(ga)
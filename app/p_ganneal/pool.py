@@ -0,0 +1,67 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+class Objective(object):
+    """A picklable objective function with constant extra arguments.
+
+    Lambdas and closures can not be sent to worker processes; Objective(fun, *args)
+    can, provided that fun is a module level function (or a method of a
+    picklable object) and args are picklable. Objective(fun, *args)(x) returns
+    fun(x, *args)."""
+
+    def __init__(self, fun, *args):
+        "Save the function and the extra arguments."
+        self.fun = fun
+        self.args = args
+
+    def __call__(self, x):
+        "Evaluate the function."
+        return self.fun(x, *self.args)
+
+
+class WorkerPool(object):
+    """A pool of worker processes which evaluates a function for many arguments.
+
+    If nworkers is 1 there are no worker processes: the function is evaluated
+    serially in the current process. If nworkers is 0 or None, the number of
+    CPUs is used. The processes are created the first time they are needed,
+    and they live until close() is called (or the with block ends).
+    initializer(*initargs) is called once in each worker process (or once in
+    the current process if there are no workers); it may store large constant
+    data, such as a DTM, so that they are not sent again with each item."""
+
+    def __init__(self, nworkers=1, initializer=None, initargs=()):
+        "Set the number of workers."
+        if not nworkers: nworkers = os.cpu_count() or 1
+        self.nworkers = nworkers
+        self.initializer = initializer
+        self.initargs = initargs
+        self.ex = None
+        self.initialized = False       #True if initializer was called in the current process
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def map(self, fun, items, *args):
+        """Return the list of fun(item, *args) for all the items, in the order of items.
+
+        fun, items and args must be picklable, if there are worker processes."""
+        items = list(items)
+        if self.nworkers <= 1 or (len(items) <= 1 and self.ex is None):
+            if self.initializer is not None and not self.initialized:
+                self.initializer(*self.initargs)
+                self.initialized = True
+            return [fun(item, *args) for item in items]
+        if self.ex is None: self.ex = ProcessPoolExecutor(self.nworkers, initializer=self.initializer, initargs=self.initargs)
+        chunksize = max(1, len(items) // (4*self.nworkers))   #About 4 chunks per worker
+        return list(self.ex.map(Objective(fun, *args), items, chunksize=chunksize))
+
+    def close(self):
+        "Terminate the worker processes."
+        if self.ex is None: return
+        self.ex.shutdown()
+        self.ex = None
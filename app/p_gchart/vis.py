@@ -170,7 +170,7 @@ class ChartWinx:
         self.thanMenubar = self.__createMenubar()
         self.showMenubar.trace("w", self.__showMenubar)
         self.__showMenubar()
-        self.thanToolbar = self.__createToolbar()
+        self.thanToolbar = None               #The toolbar is created when it is first shown
         self.showToolbar.trace("w", self.__showToolbar)
         self.__showToolbar()
 
@@ -308,8 +308,11 @@ class ChartWinx:
         else: self["menu"] = Menu(self)
 
     def __showToolbar(self, *args):
-        if self.showToolbar.get(): self.thanToolbar.grid(row=0, sticky="wn")
-        else: self.thanToolbar.grid_forget()
+        if self.showToolbar.get():
+            if self.thanToolbar is None: self.thanToolbar = self.__createToolbar()
+            self.thanToolbar.grid(row=0, sticky="wn")
+        elif self.thanToolbar is not None:
+            self.thanToolbar.grid_forget()
 
 #============================================================================
 
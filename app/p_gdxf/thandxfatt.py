@@ -31,18 +31,27 @@ class ThanDxfAtt:
 
     def thanDxfWrPlineWidth(self):
         "Writes the (variable) line width for polylines."
+        self.thanFdxf.write(self.thanDxfPlineWidth())
+
+    def thanDxfPlineWidth(self):
+        "Returns the (variable) line width for polylines as dxf text."
         if self.thanPlineWidth[0] != 0.0 or self.thanPlineWidth[1] != 0.0:
-            thanDxfWrEntry(40, self.thanPlineWidth[0])
-            thanDxfWrEntry(41, self.thanPlineWidth[1])
+            return "40\n%s\n41\n%s\n" % self.thanPlineWidth
+        return ""
 
 
     def thanDxfWrLinatts(self):
         "Writes all the attributes of a linear entity together."
-        self.thanFdxf.write("8\n" + self.thanLayer + "\n")
+        self.thanFdxf.write(self.thanDxfLinatts())
+
+    def thanDxfLinatts(self):
+        "Returns all the attributes of a linear entity as dxf text."
+        t = "8\n" + self.thanLayer + "\n"
         if self.thanLtype != "BYLAYER":
-            self.thanFdxf.write("6\n" + self.thanLtype + "\n")
+            t += "6\n" + self.thanLtype + "\n"
         if self.thanColor > 0:
-            self.thanFdxf.write("62\n" + str(self.thanColor) + "\n")
+            t += "62\n" + str(self.thanColor) + "\n"
+        return t
 
     def thanDxfWrXy(self, x, y):
         "Writes xy coordinates."
@@ -133,13 +133,11 @@ class ThanDxfDra:
 
 
     def thanDxfPlotPoint3(self, xp, yp, zp):
-        "Plots a 3d point."
-        self.thanDxfWrEntry(0, 'POINT')
-        self.thanDxfWrLayer()
-        self.thanDxfWrColor()
-
+        "Plots a 3d point; it is written to the file at once."
+        t = "0\nPOINT\n8\n" + self.thanLayer + "\n"
+        if self.thanColor > 0: t += "62\n%s\n" % (self.thanColor,)
         (px, py, pz) = self.thanDxfTop3(xp, yp, zp)
-        self.thanDxfWrXyz(px, py, pz)
+        self.thanFdxf.write(t + "10\n%s\n20\n%s\n30\n%s\n" % (px, py, pz))
 
 
     def thanDxfPlotSolid4 (self, xx1, yy1, xx2, yy2, xx3, yy3, xx4, yy4):
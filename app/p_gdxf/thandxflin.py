@@ -33,54 +33,59 @@ class ThanDxfLin:
 
     def thanDxfPlotPolyline (self, xgram, ygram, zgram1=0.0):      #Thanasis2024_01_23: added zgram1
         "Plots a 2d polyline."
-        ig = len(xgram)
-        if ig < 2: return
-
-        self.thanDxfWrEntry(0, 'POLYLINE')
-        self.thanDxfWrLinatts()
-
-        (px, py, pz) = self.thanDxfTop3(xgram[0], ygram[0], zgram1)             #Thanasis2024_01_23
-        px = py = 0.0   #According to dxf12 manual page 23, these must be zero  #Thanasis2024_01_23
-        self.thanDxfWrEntry(66, 1)
-        self.thanDxfWrXyz(px, py, pz)
-        self.thanDxfWrEntry(70, PLINEWHOKNOWS)
-        self.thanDxfWrPlineWidth()
-
-        for i in range(ig):
-            (px, py) = self.thanDxfTop(xgram[i], ygram[i])
-            self.thanDxfWrEntry(0, 'VERTEX')
-            self.thanDxfWrLinatts()
-            self.thanDxfWrXy(px, py)
-
-        self.thanDxfWrEntry(0, 'SEQEND')
-        self.thanDxfSetNow(px, py)
+        self.thanDxfPlotPolylineCp(list(zip(xgram, ygram)), zgram1)   #works for python2,3
 
 #===========================================================================
 
     def thanDxfPlotPolyline3 (self, xgram, ygram, zgram):
         "Plots a 3d polyline."
-        ig = len(xgram)
-        if ig < 2: return
+        self.thanDxfPlotPolyline3Cp(list(zip(xgram, ygram, zgram)))  #works for python2,3
 
-        self.thanDxfWrEntry(0, 'POLYLINE')
-        self.thanDxfWrLinatts()
+#===========================================================================
 
-        (px, py, pz) = self.thanDxfTop3(xgram[0], ygram[0], zgram[0])
-        px = py = 0.0   #According to dxf12 manual page 23, these must be zero  #Thanasis2024_01_23
-        self.thanDxfWrEntry(66, 1)
-        self.thanDxfWrXyz(px, py, pz)
-        self.thanDxfWrEntry(70, PLINE3)
-        self.thanDxfWrPlineWidth()
+    def thanDxfPlotPolylineCp(self, cp, zgram1=0.0):
+        """Plots a 2d polyline, whose nodes are cp, with elevation zgram1.
 
-        for i in range(ig):
-            (px, py, pz) = self.thanDxfTop3(xgram[i], ygram[i], zgram[i])
-            self.thanDxfWrEntry(0, 'VERTEX')
-            self.thanDxfWrLinatts()
-            self.thanDxfWrXyz(px, py, pz)
-            self.thanDxfWrEntry(70, PLINEVERTEX3)
+        Only the x, y coordinates of the nodes are used. The whole polyline is
+        formatted in memory and it is written to the file at once."""
+        ig = len(cp)
+        if ig < 2: return
+        xar, yar, xfac, yfac = self.thanXar, self.thanYar, self.thanXfac, self.thanYfac
+        pxar, pyar = self.thanPXar, self.thanPYar
+        la = self.thanDxfLinatts()
+        (px, py, pz) = self.thanDxfTop3(cp[0][0], cp[0][1], zgram1)             #Thanasis2024_01_23
+        buf = ["0\nPOLYLINE\n", la,
+               "66\n1\n10\n0.0\n20\n0.0\n30\n%s\n" % (pz,),   #According to dxf12 manual page 23, x, y must be zero
+               "70\n%d\n" % PLINEWHOKNOWS, self.thanDxfPlineWidth()]
+        vert = "0\nVERTEX\n" + la + "10\n%s\n20\n%s\n"
+        buf.extend(vert % (pxar + (c[0]-xar) * xfac, pyar + (c[1]-yar) * yfac) for c in cp)
+        buf.append("0\nSEQEND\n")
+        self.thanFdxf.write("".join(buf))
+        self.thanDxfSetNow(*self.thanDxfTop(cp[-1][0], cp[-1][1]))
 
-        self.thanDxfWrEntry(0, 'SEQEND')
-        self.thanDxfSetNow3(px, py, pz)
+#===========================================================================
+
+    def thanDxfPlotPolyline3Cp(self, cp):
+        """Plots a 3d polyline whose nodes are cp.
+
+        Only the x, y, z coordinates of the nodes are used. The whole polyline
+        is formatted in memory and it is written to the file at once."""
+        ig = len(cp)
+        if ig < 2: return
+        xar, yar, zar = self.thanXar, self.thanYar, self.thanZar
+        xfac, yfac, zfac = self.thanXfac, self.thanYfac, self.thanZfac
+        pxar, pyar, pzar = self.thanPXar, self.thanPYar, self.thanPZar
+        la = self.thanDxfLinatts()
+        (px, py, pz) = self.thanDxfTop3(cp[0][0], cp[0][1], cp[0][2])
+        buf = ["0\nPOLYLINE\n", la,
+               "66\n1\n10\n0.0\n20\n0.0\n30\n%s\n" % (pz,),   #According to dxf12 manual page 23, x, y must be zero
+               "70\n%d\n" % PLINE3, self.thanDxfPlineWidth()]
+        vert = "0\nVERTEX\n" + la + "10\n%s\n20\n%s\n30\n%s\n70\n" + str(PLINEVERTEX3) + "\n"
+        buf.extend(vert % (pxar + (c[0]-xar) * xfac, pyar + (c[1]-yar) * yfac, pzar + (c[2]-zar) * zfac)
+                   for c in cp)
+        buf.append("0\nSEQEND\n")
+        self.thanFdxf.write("".join(buf))
+        self.thanDxfSetNow3(*self.thanDxfTop3(cp[-1][0], cp[-1][1], cp[-1][2]))
 
 #===========================================================================
 
@@ -1,5 +1,5 @@
 from .nge_behs import getN, getNegs, getNlf80, getHgmeEgsa87, getDhEgsa87
-from .nge_egm08.egm08interp_1min import (egm08ReadGridEdgesDyn, egm08Ndyn, egm08NEgsa87dyn,
+from .nge_egm08.egm08interp_1min import (egm08ReadGridEdgesDyn, egm08Ndyn, egm08Nmany, egm08NEgsa87dyn,
     egm08PixelCoor, egm08joinDem)
 from .gdem.gdem import (GDEM, SRTMGDEM, ASTERGDEM, GreekcGDEM, TanIDEM, TanXDEM30,
     TanXDEM12, gdem, datGdem, datGdemMult)
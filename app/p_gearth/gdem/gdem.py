@@ -13,14 +13,16 @@ class GDEM(p_gtri.ThanDTMDEM):
     filnam = ""                 #This is for ThanCad
     im = "GDEM"                 #This is for ThanCad: If it is None, ThanCad assumes that the DEM was not loaded/found
     fwild = "*"                 #bash regular expression for the filenames of frames: used in thanGetAvailable()
+    maxframes = 9               #Max number of frames kept in memory; least recently used frames are discarded
 
     def __init__(self, isorthometric=True, nodatadef=None, prt=p_ggen.prg):
         "Make initial arrangements."
         self.isorthometric = isorthometric
         self.nodatadef = nodatadef
         self.prt = prt
-        self.cgiarDem = {}               #SRTM files read so far
+        self.cgiarDem = p_ggen.LruCache(self.maxframes, self.__discardFrame)  #SRTM files read recently
         self.cgiarNotfound = set()       #SRTM files which were searched for, and were not found
+        self.cgiarLoaded = set()         #SRTM files read so far, even if they were discarded from the cache
         self.demcur = None               #At first we feel lucky and try current (previous) dem for the point
         self.projcur = p_ggeod.egsa87    #Default user geodetic projection
         subdir = self.subdir.strip().strip("/\\") + "/"
@@ -76,6 +78,11 @@ class GDEM(p_gtri.ThanDTMDEM):
             for pref in path_earth:
                 self.path_gd.append(pref.rstrip()+subdir)
 
+    def __discardFrame(self, fn, dem):
+        "A frame was discarded from the cache; forget it."
+        if self.demcur is dem: self.demcur = None
+
+
     def addAllSubdirsold(self, parent, subdir):
         "Check resurively all subdirs of parent and if their name is subdir add them to a list; return the list."
         if p_ggen.Pyos.Windows: pref = "F:/"
@@ -159,6 +166,7 @@ class GDEM(p_gtri.ThanDTMDEM):
                 self.cgiarNotfound.add(fn)             #So that we don't have to search for it in the future
                 return None
             self.cgiarDem[fn] = dem
+            self.cgiarLoaded.add(fn)
         self.demcur = dem
         return dem.thanPointZ(cp)
 
@@ -168,7 +176,7 @@ class GDEM(p_gtri.ThanDTMDEM):
         xymm = min(ca[0], cb[0]), min(ca[1], cb[1]), max(ca[0], cb[0]), max(ca[1], cb[1])
         dems, loaded, notfound, notcovered = self.thanGetWin(xymm)
         cint = []
-        for dtm in self.cgiarDem.values():   #OK for python 2,3
+        for dtm in dems:
             cints1 = dtm.thanIntersegZ(ca, cb, native)
             cint.extend(cints1)
         return cint
@@ -177,7 +185,7 @@ class GDEM(p_gtri.ThanDTMDEM):
     def thanXymm(self, native=False):
         "Return the min and max x and y coordinates."
         xymm = p_gvarcom.Xymm()
-        for dem in self.cgiarDem.values():              #SRTM files read so far  #OK for python 2,3
+        for dem in self.iterLoaded():                   #SRTM files read so far
             xymm.includeXymm(dem.thanXymm(native))
         if xymm.isNull(): return None                   #No SRTM files read (or found)
         return xymm
@@ -298,6 +306,17 @@ class GDEM(p_gtri.ThanDTMDEM):
         loaded = []      #DEMs which were loaded now
         notfound = []    #DEMs which were not found in current computer (you can download them from internet)
         notcovered = []  #DEMs which the gdem does not cover at all
+        nframes = (nlb-nla+1) * (npa-npb+1)
+        if nframes > self.maxframes: self.cgiarDem.resize(nframes)   #All the frames of the window must fit in the cache during this request
+        try:
+            self.__getWin(nla, nlb, npa, npb, dems, loaded, notfound, notcovered)
+        finally:
+            self.cgiarDem.resize(self.maxframes)      #Frames in dems are still valid, even if they are discarded
+        return dems, loaded, notfound, notcovered
+
+
+    def __getWin(self, nla, nlb, npa, npb, dems, loaded, notfound, notcovered):
+        "Load the frames nla..nlb, npa..npb and put them in the appropriate lists."
         for nl in range(nla, nlb+1):
             for np in range(npa, npb-1, -1):
                 covered = self.frameXymm(nl, np)
@@ -305,8 +324,9 @@ class GDEM(p_gtri.ThanDTMDEM):
                     notcovered.append((nl, np))
                     continue
                 fn = self.frameNameN(nl, np)
-                if fn in self.cgiarDem:
-                    dems.append(self.cgiarDem[fn])
+                dem = self.cgiarDem.get(fn)
+                if dem is not None:
+                    dems.append(dem)
                     continue
                 if fn in self.cgiarNotfound:   #We searched for this fn previously and we did not find it
                     notfound.append((nl, np))
@@ -314,12 +334,12 @@ class GDEM(p_gtri.ThanDTMDEM):
                 dem, terr = self.openFrameFile(fn)
                 if dem is not None:
                     self.cgiarDem[fn] = dem
+                    self.cgiarLoaded.add(fn)
                     dems.append(dem)
                     loaded.append((nl, np))
                     continue
                 notfound.append((nl, np))
                 self.cgiarNotfound.add(fn)    #So that we don't have to search for it in the future
-        return dems, loaded, notfound, notcovered
 
 
     def thanGetWinC(self, xymm, fail=True, prg=p_ggen.prg):
@@ -341,7 +361,9 @@ class GDEM(p_gtri.ThanDTMDEM):
 
 
     def joinDem(self, xymm):
-        "Return a single DEM that contains the region xymm."
+        """Return a single DEM that contains the region xymm.
+
+        Only the parts of the frames which are inside xymm are read."""
         dems, loaded, notfound, notcovered = self.thanGetWin(xymm)
         if len(dems) == 0: return None
         alama, phia, _ = self.user2geodetGRS80((xymm[0], xymm[3], 0.0))    #Up, left point of the window
@@ -352,6 +374,7 @@ class GDEM(p_gtri.ThanDTMDEM):
             nodata=dem1.GDAL_NODATA, native=True, user2geodetGRS80=self.user2geodetGRS80, geodetGRS802User=self.geodetGRS802User)
         assert ok
         nxcolsnew, nyrowsnew = demnew.thanGetSize()
+        za = demnew.thanArray().copy()
         for dem1 in dems:
             xymm1 = dem1.thanXymm(native=True)
             jxanew, iyanew = demnew.thanPixelCoor((xymm1[0], xymm1[3], 0.0), native=True)  #Up, left point of the dem
@@ -369,8 +392,8 @@ class GDEM(p_gtri.ThanDTMDEM):
             if jxbnew > nxcolsnew-1: jxb += nxcolsnew-1-jxbnew; jxbnew = nxcolsnew-1
             if iybnew > nyrowsnew-1: iyb += nyrowsnew-1-iybnew; iybnew = nyrowsnew-1
             #self.testwrite(dem1, jxa, jxb, iya, iyb)
-            im1 = dem1.im.crop((jxa, iya, jxb, iyb))
-            demnew.im.paste(im1, (jxanew, iyanew))
+            za[iyanew:iyanew+iyb-iya, jxanew:jxanew+jxb-jxa] = dem1.thanArray()[iya:iyb, jxa:jxb]
+        demnew.thanSetArray(za)
         return demnew
 
 
@@ -424,7 +447,7 @@ class GDEM(p_gtri.ThanDTMDEM):
 
     def iterNodes(self, validnodes=True, invalidnodes=False, xymm=None):
         "Iterate through valid and or invalid nodes of the DEM; xymm is according to ThanCad conventions."
-        for dem in self.cgiarDem.values():  #SRTM files read so far   #OK for python 2,3
+        for dem in self.iterLoaded():       #SRTM files read so far
             if xymm is None:
                 for cc in dem.iterNodes(validnodes=validnodes, invalidnodes=invalidnodes, xymm=xymm):
                     yield cc
@@ -433,6 +456,19 @@ class GDEM(p_gtri.ThanDTMDEM):
                     yield cc
 
 
+    def iterLoaded(self):
+        """Iterate through all the frames read so far.
+
+        The frames which were discarded from the cache are opened again (only
+        their header is read), but they are not put back into the cache."""
+        for fn in sorted(self.cgiarLoaded):
+            dem = self.cgiarDem.get(fn)
+            if dem is None:
+                dem, terr = self.openFrameFile(fn)
+                if dem is None: continue     #The file was deleted or moved
+            yield dem
+
+
     def destroy(self):
         "Break circular references."
         del self.cgiarDem, self.demcur, self.projcur
@@ -10,11 +10,12 @@ class Gortho:
     filnam = ""                 #This is for ThanCad
     im = "GDEM"                 #This is for ThanCad: If it is None, ThanCad assumes that the DEM was not loaded/found
     fwild = "*"                 #bash regular expression for the filenames of frames: used in thanGetAvailable()
+    maxframes = 1000            #Max number of frame pathnames kept; least recently used are discarded
 
     def __init__(self, isorthometric=True, nodatadef=None, prt=p_ggen.prg):
         "Make initial arrangements."
         self.prt = prt
-        self.cgiarDem = {}               #SRTM files read so far
+        self.cgiarDem = p_ggen.LruCache(self.maxframes)  #Pathnames of the frames found recently
         self.cgiarNotfound = set()       #SRTM files which were searched for, and were not found
         self.projcur = p_ggeod.egsa87    #Default user geodetic projection
         subdir = self.subdir.strip().strip("/\\") + "/"
@@ -94,11 +95,19 @@ class Gortho:
         cg = self.user2geodetGRS80(cp)
         fn = self.frameName(cg[0], cg[1])
         if fn is None: return None
-        if fn in self.cgiarNotfound: return None
+        return self.framePath(fn)
+
+
+    def framePath(self, fn):
+        "Return the pathname of frame fn, or None if it can not be found; pathnames are cached."
+        fnpath = self.cgiarDem.get(fn)
+        if fnpath is not None: return fnpath
+        if fn in self.cgiarNotfound: return None    #We searched for this fn previously and we did not find it
         fnpath, terr = self.openFrameFile(fn)
         if fnpath is None:
             self.cgiarNotfound.add(fn)    #So that we don't have to search for it in the future
             return None
+        self.cgiarDem[fn] = fnpath
         return fnpath
 
 
@@ -191,7 +200,7 @@ class Gortho:
                     yield fnpath
                     continue
                 xymm1 = self.frameXymm(nl, np, check=False)  #If we found the frame, then check has no meaning
-                if xymm.intersectsXymm(xym11):  #Return frame only if (patially) inside xymm
+                if xymm.intersectsXymm(xymm1):  #Return frame only if (patially) inside xymm
                     yield fnpath
 
 
@@ -216,16 +225,9 @@ class Gortho:
                 if covered is None:
                     notcovered.append((nl, np))
                     continue
-                fn = self.frameNameN(nl, np)
-                if fn in self.cgiarNotfound:   #We searched for this fn prebiously and we did not find it
-                    notfound.append((nl, np))
-                    continue
-                fnpath, terr = self.openFrameFile(fn)
-                if fnpath is not None:
-                    dems.append(fnpath)
-                    continue
-                notfound.append((nl, np))
-                self.cgiarNotfound.add(fn)    #So that we don't have to search for it in the future
+                fnpath = self.framePath(self.frameNameN(nl, np))
+                if fnpath is not None: dems.append(fnpath)
+                else:                  notfound.append((nl, np))
         return dems, notfound, notcovered
 
 
@@ -31,31 +31,89 @@ On the other hand the difference between the hgme of diagram on page 26 (GRS80)
 and the hgme computed by NASA EGM2008 (Pavlis Nikolaos:
 http://earth-info.nga.mil/GandG/wgs84/gravitymod/egm2008/egm08_wgs84.html)
 are about zero.
+
+The contour map is read when hgme is first computed, and not when the
+module is imported. The text tables are parsed only once: the DTM, with
+its segment index, is saved in binary form (pickle) in the configuration
+directory of ThanCad, and it is read from there the next times.
 """
 
 from math import pi
-import p_gtri
+import os, sys, hashlib, pickle
+import p_gtri, p_ggeom
+from p_ggen import configFile
 from p_ggeod import egsa87, GRS80
 
 useGRS80 = True    #If this is set to False the results will be about 0.60-0.70m wrong. See above.
-
-
-if useGRS80:
-    from . import hgme_grs80brk as hgmebrk, hgme_grs80syk as hgmesyk
-else:
-    from . import hgme_egsa87brk as hgmebrk, hgme_egsa87syk as hgmesyk
-
-_hgme = p_gtri.ThanDTMlines()
-hgmebrk.addlines(_hgme)
-hgmesyk.addlines(_hgme)
-_hgme.thanRecreate()
+_hgme = None       #The DTM of the contour map; it is read when it is first needed
+_BINVERSION = 2    #Version of the binary form of the DTM
+_PROBE = (23.7, 38.0)  #A point within the contour map, used to check the binary form
 
 
 def getN(l, f):
     "Compute the difference of elevation between geoid and the (chosen) ellipsoid; l, f in decimal degrees."
+    global _hgme
+    if _hgme is None: _hgme = _loadHgme()
     return _hgme.thanPointZ((l, f))
 
 
+def _loadHgme():
+    "Read the DTM from its binary form; if it does not exist, parse the text tables and save the binary form."
+    fn = _binaryName()
+    if fn is not None:
+        try:
+            with open(fn, "rb") as fr:
+                version, dtm = pickle.load(fr)
+            if version == _BINVERSION and isinstance(dtm, p_gtri.ThanDTMlines) and \
+               dtm.thanPointZ(_PROBE) is not None: return dtm
+        except Exception:                 #Missing, corrupted or stale file (e.g. AttributeError): parse the tables again
+            pass
+    dtm = _parseHgme()
+    if fn is not None:
+        try:
+            with open(fn + ".tmp", "wb") as fw:
+                pickle.dump((_BINVERSION, dtm), fw, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(fn + ".tmp", fn)   #Other processes never see a partial file
+        except (IOError, OSError, pickle.PicklingError):
+            pass                          #Saving is optional
+    return dtm
+
+
+def _parseHgme():
+    "Parse the text tables of the contour map into a DTM and build its segment index."
+    if useGRS80:
+        from . import hgme_grs80brk as hgmebrk, hgme_grs80syk as hgmesyk
+    else:
+        from . import hgme_egsa87brk as hgmebrk, hgme_egsa87syk as hgmesyk
+    dtm = p_gtri.ThanDTMlines()
+    hgmebrk.addlines(dtm)
+    hgmesyk.addlines(dtm)
+    dtm.thanRecreate()
+    dtm.thanBuildIndex()
+    return dtm
+
+
+def _binaryName():
+    """Return the name of the file with the binary form of the DTM, or None if it can not be saved.
+
+    The name depends on the version of the binary form, and on the size and
+    the modification time of the text tables and of the modules of the
+    pickled classes, so that the binary form is created again if any of
+    them changes."""
+    names = ("hgme_grs80brk.py", "hgme_grs80syk.py") if useGRS80 else ("hgme_egsa87brk.py", "hgme_egsa87syk.py")
+    dir = os.path.dirname(os.path.abspath(__file__))
+    fns = [os.path.join(dir, name) for name in names]
+    for cls in p_gtri.ThanDTMlines, p_gtri.ThanDTMDEM, p_ggeom.Rtree:
+        fns.append(getattr(sys.modules[cls.__module__], "__file__", None))
+    try:
+        key = [(os.path.basename(fn), os.stat(fn)) for fn in fns]
+    except (OSError, TypeError):
+        return None
+    key = repr([_BINVERSION, useGRS80] + [(name, st.st_size, st.st_mtime) for name, st in key]).encode("utf-8")
+    fn, terr = configFile("hgme_%s.bin" % (hashlib.md5(key).hexdigest(),), "thancad")
+    return fn
+
+
 def getNegs(cpegs):
     "Calculate DH geoid-ellipsoid for point with egsa87 coordinates."
     assert not useGRS80, "useGRS80 should be False"
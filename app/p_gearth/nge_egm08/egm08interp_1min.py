@@ -18,15 +18,14 @@ c     ONCE, AS THE FIRST VALUE IN THEIR RESPECTIVE RECORD AT ZERO
 c     LONGITUDE. THESE VALUES ARE NOT REPEATED AT THE END OF THEIR
 c     RESPECTIVE RECORDS AT LONGITUDE = 360 DEGREEES.
 """
-#from past.builtins import xrange
-from p_ggen.py23 import xrange
-import struct
 from math import cos, radians, floor
-import p_ggen, p_gnum, p_gfil
+import numpy as np
+from PIL import Image
+import p_ggen, p_gfil
 from p_gmath import EquidistantSpline
 from p_ggeod import egsa87
 
-uGri = None
+grid = None     #The grid file mapped to memory: row i-1 is the parallel band i
 iwind    = 6
 iw       = iwind+1
 nrows    = 10801
@@ -47,20 +46,20 @@ path_gd = ('                                        ',
 name_gd  = 'Und_min1x1_egm2008_isw=82_WGS84_TideFree_SE'    #Grid without edges
 name_gde = 'thanegm08.bin'                                  #Grid with edges
 dostat = False
-gridyn = {}     #This array is for dynamic read
 notinitialised = True
+nchunk = 100000 #Number of points interpolated at once by interp()
 
 prt = p_ggen.prg
 
 
 def openGrid (fn):
-    "Opens the file which contains the grid."
-    global uGri
+    "Maps to memory the file which contains the grid; only the pages which are used are read."
+    global grid
     fn = fn.strip()
     for par in path_gd:
         fnu1 = par.strip() + fn
-        try:            uGri = open(fnu1, "rb")
-        except IOError: pass
+        try:            grid = np.memmap(fnu1, dtype=np.float32, mode="r", shape=(nriw2, nciw2))
+        except (IOError, OSError, ValueError): pass
         else:           break
     else:
         terr = 'File '+fn+' can not be accessed'
@@ -71,12 +70,11 @@ def openGrid (fn):
 
 def egm08ReadGridEdgesDyn(prt1=p_ggen.prg):
     "Reads dynamically the grid which was already the edges."
-    global gridyn, prt, notinitialised
+    global prt, notinitialised
     if prt1 is None: prt1 = p_ggen.prgnone
     prt = prt1
     openGrid(name_gde)
     prt('Preparing dynamic reading of EGM08 grid..', "info1")
-    gridyn.clear()
     notinitialised = False
 
 
@@ -105,6 +103,18 @@ def egm08Ndyn (flon, flat):
     return val
 
 
+def egm08Nmany(flon, flat):
+    """Check (GRS80) geodetic coordinates of many points and compute their N.
+
+    flon, flat are sequences or NumPy arrays (decimal degrees); a NumPy array
+    is returned with 999999.0 where N could not be computed."""
+    if notinitialised: egm08ReadGridEdgesDyn()
+    flon = np.asarray(flon, dtype=float) % 360.0
+    flat = np.asarray(flat, dtype=float) % 360.0
+    flat = np.where(flat > 180.0, flat-360.0, flat)
+    return interp(flat, flon)
+
+
 def egm08PixelCoor(flon, flat):
     "Return the column and row of the nearest undulation to flon, flat."
     if notinitialised: egm08ReadGridEdgesDyn()
@@ -121,15 +131,8 @@ def egm08joinDem(xymm):
     "Return a single DEM that contains the region xymm."
     jxa, iya = egm08PixelCoor(xymm[0], xymm[3])    #Up, left point of the window
     jxb, iyb = egm08PixelCoor(xymm[2], xymm[1])    #Down, right point of the window
-    a = p_gnum.zeros((iya-iyb+1, jxb-jxa+1), p_gnum.Float32)
-    i = 0
-    for iy in xrange(iya, iyb-1, -1):
-        _ = gridcell(iy, 0)      #Force dynamic load of row iy
-        a[i, :] = gridyn[iy][jxa:jxb+1]
-#        print i
-#        print a[i, :]
-        i += 1
-    return p_gnum.num2im(a)
+    a = np.array(grid[iya-1:iyb-2 if iyb > 1 else None:-1, jxa:jxb+1])    #Rows iya, iya-1, .., iyb
+    return Image.fromarray(a)
 
 
 def egm08NEgsa87dyn (flon, flat):
@@ -141,14 +144,82 @@ def egm08NEgsa87dyn (flon, flat):
 
 
 def gridcell(i, j):
-    "Return the i, j element of grid; read the data if not there."
-    row = gridyn.get(i)
-    if row is None:
-        uGri.seek((i-1)*nciw2*4)
-        dl = uGri.read(nciw2*4)
-        fmt = "%df" % (nciw2,)
-        row = gridyn[i] = p_gnum.array(struct.unpack(fmt, dl), p_gnum.Float32)
-    return row[j-1]
+    "Return the i, j element of grid (Fortran style indexes which start from 1)."
+    return grid.item(i-1, j-1)
+
+
+def interp(flat, flon):
+    """Interpolate N at many points with the iwind x iwind spline of interpdyn(); return a NumPy array.
+
+    flat, flon are NumPy arrays of the geodetic coordinates (decimal degrees,
+    -90<=flat<=90, 0<=flon<=360). The spline is linear with respect to the grid
+    values, and thus it is computed as weighted sum of the values of the window;
+    999999.0 is returned where N can not be computed."""
+    if notinitialised: egm08ReadGridEdgesDyn()
+    flat = np.asarray(flat, dtype=float).ravel()
+    flon = np.asarray(flon, dtype=float).ravel()
+    val = np.full(flat.shape, 999999.0)
+    slat = -90.0 - dlat*iw  #  (lat < -90) OK
+    wlon =       - dlon*iw  #  (lon <   0) OK
+    ri = (flat-slat)/dlat
+    rj = (flon-wlon)/dlon
+    iwo = max(2, iwind)
+    if iwo % 2 == 1:
+        i0 = np.trunc(ri-0.5)
+        j0 = np.trunc(rj-0.5)
+    else:
+        i0 = np.trunc(ri)
+        j0 = np.trunc(rj)
+    i0 = i0 - (iwo//2) + 1
+    j0 = j0 - (iwo//2) + 1
+    ok = (flat <= 90.0) & (flat >= -90.0) & (flon <= 360.0) & (flon >= 0.0)
+    ok &= (i0 >= 0) & (i0+iwo-1 < nriw2) & (j0 >= 0) & (j0+iwo-1 < nciw2)
+    nbad = flat.size - int(np.count_nonzero(ok))
+    if nbad > 0: prt('%d STATIONS TOO NEAR GRID BOUNDARY  - NO INT. POSSIBLE|' % (nbad,), "can")
+    iok = np.flatnonzero(ok)
+    k = np.arange(iwo)
+    for ia in range(0, iok.size, nchunk):
+        ii = iok[ia:ia+nchunk]
+        i1 = i0[ii].astype(np.intp)
+        j1 = j0[ii].astype(np.intp)
+        h = grid[i1[:, None, None]+k[None, :, None], j1[:, None, None]+k[None, None, :]].astype(float)
+        if iwo > 2:
+            wi = _splineWeights(ri[ii]-i1+1.0, iwo)
+            wj = _splineWeights(rj[ii]-j1+1.0, iwo)
+        else:
+            wi = _linearWeights(ri[ii]-i1)
+            wj = _linearWeights(rj[ii]-j1)
+        val[ii] = np.einsum("ni,nij,nj->n", wi, h, wj)
+    return val
+
+
+_splmoments = {}
+
+
+def _splineWeights(x, n):
+    """Return the weights of the n values for the EquidistantSpline interpolation at x (1 <= x <= n).
+
+    The spline moments are linear with respect to the values; they are
+    computed once, for each of the n unit vectors, with EquidistantSpline."""
+    m = _splmoments.get(n)
+    if m is None:
+        m = _splmoments[n] = np.array([EquidistantSpline(e).R[1:] for e in np.eye(n).tolist()]).T  #m[k] = weights of moment k
+    jj = np.clip(np.floor(x).astype(np.intp), 1, n-1)
+    xx = x - jj
+    jj -= 1                                         #Python indexes start from 0
+    w = np.zeros((x.size, n))
+    rows = np.arange(x.size)
+    w[rows, jj] += 1.0 - xx
+    w[rows, jj+1] += xx
+    cj  = xx * (-1.0/3.0 + xx * (0.5 - xx/6.0))     #Coefficient of moment J
+    cj1 = xx * (-1.0/6.0 + xx*xx/6.0)               #Coefficient of moment J+1
+    w += cj[:, None]*m[jj] + cj1[:, None]*m[jj+1]
+    return w
+
+
+def _linearWeights(x):
+    "Return the weights of the 2 values for linear interpolation at x (0<=x<=1)."
+    return np.column_stack((1.0-x, x))
 
 
 def interpdyn(iwo,dmin,h,phis,dlaw,ddfi,ddla,nphi,ndla,ipdim,ildim,phi,dla):
@@ -229,9 +300,9 @@ def interpdyn(iwo,dmin,h,phis,dlaw,ddfi,ddla,nphi,ndla,ipdim,ildim,phi,dla):
         return valint
     if iwo > 2:
         hc = []
-        for i in xrange(1, iwo+1):
+        for i in range(1, iwo+1):
             a = []
-            for j in xrange(1, iwo+1):
+            for j in range(1, iwo+1):
                 a.append(h(i0+i,j0+j))
 #            print 'i=', i, 'a=', a
             spl = EquidistantSpline(a)
@@ -9,4 +9,5 @@ from .thantrans import Translation
 from .opguitrans import Tgui
 from .systemem import memTotal
 from .extracted import extracted
+from .lru import LruCache
 from .genjson import getjson
@@ -0,0 +1,99 @@
+"""\
+This module defines a small least recently used (LRU) cache.
+
+When the cache is full, the least recently used item is discarded to make
+room for the new item. An optional function is called for each discarded
+item, so that resources (open files, memory maps etc.) can be released.
+If a weight function is given, maxsize limits the total weight of the items
+(for example the number of pixels of images), instead of their number.
+"""
+from collections import OrderedDict
+
+
+class LruCache:
+    "A dictionary-like object which holds up to maxsize items; least recently used items are discarded."
+
+    def __init__(self, maxsize=128, ondiscard=None, weight=None):
+        "Ondiscard(key, value) is called for each item which is discarded; weight(value) is the size of an item."
+        self.maxsize = max(int(maxsize), 1)
+        self.ondiscard = ondiscard
+        self.weight = weight
+        self.total = 0          # Total weight (or number) of the items
+        self.__d = OrderedDict()
+
+
+    def get(self, key, defv=None):
+        "Return the value of key, or defv if key is not in the cache; key becomes most recently used."
+        try:
+            val = self.__d.pop(key)
+        except KeyError:
+            return defv
+        self.__d[key] = val
+        return val
+
+
+    def __getitem__(self, key):
+        "Return the value of key; key becomes most recently used; raise KeyError if not in the cache."
+        val = self.__d.pop(key)
+        self.__d[key] = val
+        return val
+
+
+    def __setitem__(self, key, val):
+        """Add or replace the value of key; discard the least recently used items if the cache is full.
+
+        The most recently used item is never discarded, even if its weight is more than maxsize."""
+        if key in self.__d: self.total -= self.__weight(self.__d.pop(key))
+        self.__d[key] = val
+        self.total += self.__weight(val)
+        self.__shrink()
+
+
+    def resize(self, maxsize):
+        "Change maxsize; discard the least recently used items if the cache is now too full."
+        self.maxsize = max(int(maxsize), 1)
+        self.__shrink()
+
+
+    def __shrink(self):
+        "Discard the least recently used items until the total weight is not more than maxsize."
+        while self.total > self.maxsize and len(self.__d) > 1:
+            key1, val1 = self.__d.popitem(last=False)
+            self.total -= self.__weight(val1)
+            if self.ondiscard is not None: self.ondiscard(key1, val1)
+
+
+    def __weight(self, val):
+        "Return the weight of an item."
+        if self.weight is None: return 1
+        return self.weight(val)
+
+
+    def __delitem__(self, key):
+        "Remove key from the cache; ondiscard is called."
+        val = self.__d.pop(key)
+        self.total -= self.__weight(val)
+        if self.ondiscard is not None: self.ondiscard(key, val)
+
+
+    def __contains__(self, key):
+        "Return True if key is in the cache; it does not change the order of use."
+        return key in self.__d
+
+
+    def __len__(self):
+        "Return the number of items in the cache."
+        return len(self.__d)
+
+
+    def values(self):
+        "Return the values from the least to the most recently used; it does not change the order of use."
+        return list(self.__d.values())
+
+
+    def clear(self):
+        "Discard all the items of the cache."
+        while self.__d:
+            key1, val1 = self.__d.popitem(last=False)
+            if self.ondiscard is not None: self.ondiscard(key1, val1)
+        self.total = 0
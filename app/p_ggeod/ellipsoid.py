@@ -1,6 +1,19 @@
-from math import sin, cos, atan, atan2, sqrt, hypot, pi
+from math import pi
+import math
+from types import SimpleNamespace
+import numpy as np
 import p_gmath
 
+#The functions of the math module for NumPy arrays: the same formulas compute
+#one point (with math) or many points at once (with npmath)
+npmath = SimpleNamespace(sin=np.sin, cos=np.cos, tan=np.tan, sqrt=np.sqrt, atan=np.arctan,
+    atan2=np.arctan2, hypot=np.hypot, log=np.log, fabs=np.fabs)
+
+
+def asarrays(*args):
+    "Convert the arguments to NumPy float arrays of the same shape."
+    return np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in args))
+
 
 class Ellipsoid(object):
     """A reference ellipsoid plus origin."
@@ -24,23 +37,45 @@ class Ellipsoid(object):
 
     def geodet2cen (self, lam, phi, h, hgme=0.0):
         "Return the geocentric coordinates of an ellipsoid given the geodetic coords and height."
-        N = self.a / sqrt(1.0 - self.e2*sin(phi)**2)
-        xt = (N+h+hgme) * cos(phi) * cos(lam)
-        yt = (N+h+hgme) * cos(phi) * sin(lam)
-        zt = ((1.0-self.e2) * N + h + hgme) * sin(phi)
+        return self._geodet2cen(lam, phi, h, hgme, math)
+
+
+    def geodet2cens(self, lam, phi, h, hgme=0.0):
+        "Same as geodet2cen(), but for NumPy arrays of coordinates."
+        lam, phi, h = asarrays(lam, phi, h)
+        return self._geodet2cen(lam, phi, h, hgme, npmath)
+
+
+    def _geodet2cen(self, lam, phi, h, hgme, m):
+        "Return the geocentric coordinates given the geodetic; m is the math module or npmath."
+        N = self.a / m.sqrt(1.0 - self.e2*m.sin(phi)**2)
+        xt = (N+h+hgme) * m.cos(phi) * m.cos(lam)
+        yt = (N+h+hgme) * m.cos(phi) * m.sin(lam)
+        zt = ((1.0-self.e2) * N + h + hgme) * m.sin(phi)
         return xt, yt, zt
 
 
     def geocen2det (self, xt, yt, zt, hgme=0.0):
         "Return the geodetic coordinates and height of an ellipsoid given the geocentric."
-        par = hypot(xt, yt)
-        phi = atan(zt*(1.0+self.et2) / par)
+        return self._geocen2det(xt, yt, zt, hgme, math)
+
+
+    def geocen2dets(self, xt, yt, zt, hgme=0.0):
+        "Same as geocen2det(), but for NumPy arrays of coordinates."
+        xt, yt, zt = asarrays(xt, yt, zt)
+        return self._geocen2det(xt, yt, zt, hgme, npmath)
+
+
+    def _geocen2det(self, xt, yt, zt, hgme, m):
+        "Return the geodetic coordinates and height given the geocentric; m is the math module or npmath."
+        par = m.hypot(xt, yt)
+        phi = m.atan(zt*(1.0+self.et2) / par)
         for i in range(4):
-            N = self.a / sqrt(1.0 - self.e2*sin(phi)**2)
-            phi = atan((zt+self.e2*N*sin(phi))/par)
-        N = self.a / sqrt(1.0 - self.e2*sin(phi)**2)
-        lam = atan2(yt, xt)         #Thanasis2013_04_23
-        h = xt/(cos(phi)*cos(lam)) - N - hgme
+            N = self.a / m.sqrt(1.0 - self.e2*m.sin(phi)**2)
+            phi = m.atan((zt+self.e2*N*m.sin(phi))/par)
+        N = self.a / m.sqrt(1.0 - self.e2*m.sin(phi)**2)
+        lam = m.atan2(yt, xt)         #Thanasis2013_04_23
+        h = xt/(m.cos(phi)*m.cos(lam)) - N - hgme
         return lam, phi, h
 
     tee = "Don't know how to convert from %s ellipsoid to %s ellipsoid"
@@ -49,11 +84,21 @@ class Ellipsoid(object):
         if self.tra2cur is None: raise ValueError(self.tee % (self.name, GRS80.name))
         return self.tra2GRS80.calc((X, Y, Z))
 
+    def geocen2geocenGRS80s(self, X, Y, Z):
+        "Same as geocen2geocenGRS80(), but for NumPy arrays of coordinates."
+        if self.tra2cur is None: raise ValueError(self.tee % (self.name, GRS80.name))
+        return self.tra2GRS80.calcs(X, Y, Z)
+
     def geocenGRS802geocen(self, X, Y, Z):
         "Convert datum geocentric coordinates to GRS80 geocentric coordinates."
-        if self.tra2cur is None: raise ValueError(self.tee % (GRS80.name, self.EOID.name))
+        if self.tra2cur is None: raise ValueError(self.tee % (GRS80.name, self.name))
         return self.tra2cur.calc((X, Y, Z))
 
+    def geocenGRS802geocens(self, X, Y, Z):
+        "Same as geocenGRS802geocen(), but for NumPy arrays of coordinates."
+        if self.tra2cur is None: raise ValueError(self.tee % (GRS80.name, self.name))
+        return self.tra2cur.calcs(X, Y, Z)
+
     def setBursaWolf(self, tx, ty, tz, ex, ey, ez, sk):
         "Set the coefficients of Bursa-Wolf transformation; the coefficients transform from GRS80 to current ellipsoid."
         self.tra2cur = p_gmath.SimilarTransformation(cu=(tx, ty, tz), gon=(ex, ey, ez), am=sk)
@@ -1,6 +1,6 @@
-from math import pi, sqrt, hypot, cos, sin, tan, atan, log
-from p_gmath import fsign
-from .ellipsoid import WGS84
+from math import pi, sqrt, cos, sin, log
+import math
+from .ellipsoid import WGS84, npmath, asarrays
 from .mercator import GeodProjection
 
 
@@ -107,11 +107,11 @@ class LambertConfConic(GeodProjection):
         self.rho0 = self.rho(t0)
 
 
-    def ti(self, phi1):
-        """Compute ti formula; page 107 "Map projections - A working manual"."""
+    def ti(self, phi1, m=math):
+        """Compute ti formula; page 107 "Map projections - A working manual"; m is the math module or npmath."""
         e = self.e
-        sinf = sin(phi1)
-        return tan(pi/4-phi1/2) / ( (1-e*sinf)/(1+e*sinf) )**(e/2)
+        sinf = m.sin(phi1)
+        return m.tan(pi/4-phi1/2) / ( (1-e*sinf)/(1+e*sinf) )**(e/2)
 
 
     def mi(self, phi1):
@@ -126,36 +126,59 @@ class LambertConfConic(GeodProjection):
 
     def geodet2en(self, lam, phi):
         "Convert geodetic coordinates to easting, northing."
-        rho = self.rho(self.ti(phi))
+        return self._geodet2en(lam, phi, math)
+
+
+    def geodet2ens(self, lam, phi):
+        "Same as geodet2en(), but for NumPy arrays of coordinates."
+        lam, phi = asarrays(lam, phi)
+        return self._geodet2en(lam, phi, npmath)
+
+
+    def _geodet2en(self, lam, phi, m):
+        "Convert geodetic coordinates to easting, northing; m is the math module or npmath."
+        rho = self.rho(self.ti(phi, m))
         theta = self.n*(lam - self.lam0)
-        x = rho * sin(theta)
-        y = self.rho0 - rho*cos(theta)
-        x += self.falseeasting
-        y += self.falsenorthing
+        x = rho * m.sin(theta)
+        y = self.rho0 - rho*m.cos(theta)
+        x = x + self.falseeasting
+        y = y + self.falsenorthing
         return x, y
 
 
     def en2geodet(self, x, y):
         "Convert easting, northing to geodetic coordinates."
-        x -= self.falseeasting
-        y -= self.falsenorthing
+        return self._en2geodet(x, y, math)
+
+
+    def en2geodets(self, x, y):
+        "Same as en2geodet(), but for NumPy arrays of coordinates."
+        x, y = asarrays(x, y)
+        return self._en2geodet(x, y, npmath)
+
+
+    def _en2geodet(self, x, y, m):
+        "Convert easting, northing to geodetic coordinates; m is the math module or npmath."
+        x = x - self.falseeasting
+        y = y - self.falsenorthing
         rho0 = self.rho0
         #if self.n < 0:
         #    x = -x
         #    y = -y
         #    rho0 = -rho0
-        theta = atan(x/(rho0-y))
+        theta = m.atan(x/(rho0-y))
         lam = theta/self.n + self.lam0
-        rho = fsign(hypot(x, self.rho0-y), self.n)
+        rho = m.hypot(x, self.rho0-y)
+        if self.n < 0.0: rho = -rho          #fsign(rho, n)
         t = (rho / (self.EOID.a * self.F))**(1/self.n)
 
-        phi = pi/2 - 2*atan(t)
+        phi = pi/2 - 2*m.atan(t)
         e = self.e
 #        print("------------------")
         for i in range(5):
             phip = phi
-            sinf = sin(phi)
-            phi = pi/2 - 2*atan( t * ((1-e*sinf)/(1+e*sinf))**(e/2) )
+            sinf = m.sin(phi)
+            phi = pi/2 - 2*m.atan( t * ((1-e*sinf)/(1+e*sinf))**(e/2) )
 #            print(phi)
 #        print("------------------")
         return lam, phi
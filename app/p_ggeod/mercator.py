@@ -1,6 +1,8 @@
-from math import pi, cos, sin, tan, sqrt
+from math import pi
+import math
+import numpy as np
 from p_gmath import dpt
-from .ellipsoid import GRS80, Greek1987
+from .ellipsoid import GRS80, Greek1987, npmath, asarrays
 
 class GeodProjection(object):
     "A base class for geodetic projections."
@@ -20,6 +22,28 @@ class GeodProjection(object):
         "Compute the geodetic coordinates given Easting Northing of the projection."
         raise AttributeError("Please override function en2geodet()")
 
+    def geodet2ens(self, lam, phi):
+        """Same as geodet2en(), but for NumPy arrays of coordinates.
+
+        This calls geodet2en() for each point; it should be overridden with vectorized formulas."""
+        lam, phi = asarrays(lam, phi)
+        en = [self.geodet2en(a, b) for a, b in zip(lam.ravel().tolist(), phi.ravel().tolist())]   #works for python2,3
+        return self.__unzip(en, lam.shape)
+
+    def en2geodets(self, x, y):
+        """Same as en2geodet(), but for NumPy arrays of coordinates.
+
+        This calls en2geodet() for each point; it should be overridden with vectorized formulas."""
+        x, y = asarrays(x, y)
+        lp = [self.en2geodet(a, b) for a, b in zip(x.ravel().tolist(), y.ravel().tolist())]      #works for python2,3
+        return self.__unzip(lp, x.shape)
+
+    @staticmethod
+    def __unzip(cc, shape):
+        "Split a list of pairs to 2 NumPy arrays of shape shape."
+        cc = np.array(cc, dtype=float).reshape(-1, 2)
+        return cc[:, 0].reshape(shape), cc[:, 1].reshape(shape)
+
     def geodetGRS802en(self, lam, phi):
         "Compute the Easting Northing of the projection given the GRS80 geodetic coordinates."
         xt, yt, zt = GRS80.geodet2cen(lam, phi, 0.0)
@@ -27,6 +51,13 @@ class GeodProjection(object):
         lam, phi, h = self.EOID.geocen2det(xt, yt, zt)
         return self.geodet2en(lam, phi)
 
+    def geodetGRS802ens(self, lam, phi):
+        "Same as geodetGRS802en(), but for NumPy arrays of coordinates."
+        xt, yt, zt = GRS80.geodet2cens(lam, phi, 0.0)
+        xt, yt, zt = self.EOID.geocenGRS802geocens(xt, yt, zt)
+        lam, phi, h = self.EOID.geocen2dets(xt, yt, zt)
+        return self.geodet2ens(lam, phi)
+
     def en2geodetGRS80(self, x, y):
         "Compute the geodetic coordinates given Easting Northing of the projection."
         lam, phi = self.en2geodet(x, y)
@@ -35,6 +66,14 @@ class GeodProjection(object):
         lam, phi, h = GRS80.geocen2det(xt, yt, zt)
         return lam, phi
 
+    def en2geodetGRS80s(self, x, y):
+        "Same as en2geodetGRS80(), but for NumPy arrays of coordinates."
+        lam, phi = self.en2geodets(x, y)
+        xt, yt, zt = self.EOID.geodet2cens(lam, phi, 0.0)
+        xt, yt, zt = self.EOID.geocen2geocenGRS80s(xt, yt, zt)
+        lam, phi, h = GRS80.geocen2dets(xt, yt, zt)
+        return lam, phi
+
     def geocenGRS802en(self, xt, yt, zt, hgme=0.0):
         """Compute the Easting Northing of the projection given the GRS80 geocentric coordinates."
 
@@ -95,13 +134,22 @@ class TMercator(GeodProjection):
 
     def geodet2en (self, lam, phi):
         "Compute the Easting Northing of the projection given the geodetic coordinates."
-        lam -= self.lam0
+        return self._geodet2en(lam, phi, math)
+
+    def geodet2ens(self, lam, phi):
+        "Same as geodet2en(), but for NumPy arrays of coordinates."
+        lam, phi = asarrays(lam, phi)
+        return self._geodet2en(lam, phi, npmath)
+
+    def _geodet2en(self, lam, phi, m):
+        "Compute the Easting Northing given the geodetic coordinates; m is the math module or npmath."
+        lam = lam - self.lam0
         n = (self.a-self.b) / (self.a+self.b)
-        v = self.a/sqrt(1.0 - self.e2*sin(phi)**2)
+        v = self.a/m.sqrt(1.0 - self.e2*m.sin(phi)**2)
         rho = v**3*(1.0-self.e2)/self.a**2
         beta = v/rho
-        c = cos(phi)
-        t = tan(phi)
+        c = m.cos(phi)
+        t = m.tan(phi)
         t2 = t**2
         lc = lam*c
         lc2 = lc**2
@@ -110,8 +158,8 @@ class TMercator(GeodProjection):
         b2 = -self.b*n*(1.5 + n*(1.5 + n*21.0/16.0))
         b4 = self.b*n**2*15.0/16.0*(1.0 + n)
         b6 = -self.b*35.0/48.0*n**3
-        mf = b0*phi + b2*sin(2.0*phi) + b4*sin(4.0*phi) + \
-             b6*sin(6.0*phi)
+        mf = b0*phi + b2*m.sin(2.0*phi) + b4*m.sin(4.0*phi) + \
+             b6*m.sin(6.0*phi)
 
         w3 = beta - t2
 #        w5 = 4.0*beta**3*(1.0-6.0*t2) + beta**2*(1.0+8.0*t2) - 2.0*beta*t2 + t2**2
@@ -127,15 +175,24 @@ class TMercator(GeodProjection):
             lc2/20.0*(w5+lc2/42.0*w7)))
         y = self.k0*(mf + lc2*v*t/2.0*(1.0 + lc2/12.0*(w4 + \
             lc2/30.0*(w6 + lc2/56.0*w8))))
-        x += self.falseeasting
-        y += self.falsenorthing
+        x = x + self.falseeasting
+        y = y + self.falsenorthing
         return x, y
 
 
     def en2geodet (self, x, y):
         "Compute the geodetic coordinates given Easting Northing of the projection."
-        x -= self.falseeasting
-        y -= self.falsenorthing
+        return self._en2geodet(x, y, math)
+
+    def en2geodets(self, x, y):
+        "Same as en2geodet(), but for NumPy arrays of coordinates."
+        x, y = asarrays(x, y)
+        return self._en2geodet(x, y, npmath)
+
+    def _en2geodet(self, x, y, m):
+        "Compute the geodetic coordinates given Easting Northing; m is the math module or npmath."
+        x = x - self.falseeasting
+        y = y - self.falsenorthing
         n = (self.a-self.b) / (self.a+self.b)
 
         d2 = n*(1.5 - 27.0/32.0*n**2)
@@ -145,13 +202,13 @@ class TMercator(GeodProjection):
         b0 = self.b*(1.0 + n*(1.0 + n*5.0/4.0*(1.0 + n)))
         mp = pi*b0/2.0
         mu = pi*y/(2.0*mp*self.k0)
-        phi1 = mu + d2*sin(2.0*mu) + d4*sin(4.0*mu) + d6*sin(6.0*mu) + d8*sin(8.0*mu) #Thanasis2014_11_23
+        phi1 = mu + d2*m.sin(2.0*mu) + d4*m.sin(4.0*mu) + d6*m.sin(6.0*mu) + d8*m.sin(8.0*mu) #Thanasis2014_11_23
 
-        v1 = self.a/sqrt(1.0 - self.e2*sin(phi1)**2)
+        v1 = self.a/m.sqrt(1.0 - self.e2*m.sin(phi1)**2)
         rho1 = v1**3*(1.0-self.e2)/self.a**2
         beta1 = v1/rho1
-        c1 = cos(phi1)
-        t1 = tan(phi1)
+        c1 = m.cos(phi1)
+        t1 = m.tan(phi1)
         t12 = t1**2
         t14 = t12**2
 
@@ -171,7 +228,7 @@ class TMercator(GeodProjection):
         lam = x/c1/kv * (1.0 + xkv2/6.0*(-v3 + xkv2/20.0*(-v5 + xkv2/42.0*(-v7))))
         phi = phi1 + beta1*t1*xkv2/2.0*(-1.0 + xkv2/12.0*(-u4 + \
                               xkv2/30.0*(-u6 + xkv2/56.0*(-u8))))
-        lam += self.lam0
+        lam = lam + self.lam0
         return lam, phi
 
 
@@ -206,6 +263,16 @@ class GeodetGRS80(GeodProjection):
         "Compute the geodetic coordinates given Easting Northing of the projection."
         return x/self.frad2en, y/self.frad2en     #Convert EN to rad
 
+    def geodet2ens(self, lam, phi):
+        "Same as geodet2en(), but for NumPy arrays of coordinates."
+        lam, phi = asarrays(lam, phi)
+        return lam*self.frad2en, phi*self.frad2en
+
+    def en2geodets(self, x, y):
+        "Same as en2geodet(), but for NumPy arrays of coordinates."
+        x, y = asarrays(x, y)
+        return x/self.frad2en, y/self.frad2en
+
 
 def computeUTMzone(alam, phi):
     """Find the Universal transverse Mercatoric projection zone from geodetic coordinates in radians.
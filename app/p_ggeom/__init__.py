@@ -1,9 +1,12 @@
 from .mesa import MesaQuad, MesaTri, MesaTriLocal, MesaHull, MesaXymm
 from .trilocal import TriLocal
+from .rtree import Rtree
+from .crossing import (rectInRect, rectCrossRect, rect2Polygon, segCrossRect, polylineCrossRect,
+    segCrossSeg, polylineCrossPolyline, pointInPolygon, polylineInPolygon, polylineCrossPolygon)
 from .polyg import Polygon
 from .area import area, areapn, spin
 from .pin import Pin, poly2pin
-from .simplif import lineSimplify3d
+from .simplif import lineSimplify3d, lineDecimate2d
 from .polygcentroid import polygCentroid, polygCentroidin
 from . import optpath
 from . import  geomloop
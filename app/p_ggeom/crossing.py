@@ -0,0 +1,120 @@
+"""\
+This module defines fast inclusion and crossing tests of polylines against
+rectangles, polylines and polygons. They are meant for the selection of
+elements: the coarse test is done with the bounding rectangles and these
+functions do the exact test. Only the x, y coordinates are taken into account.
+A rectangle is given as xymm = xmin, ymin, xmax, ymax.
+"""
+from p_ggen import iterby2
+
+
+def rectInRect(xymm, xymmout):
+    "Return True if rectangle xymm is completely inside rectangle xymmout."
+    return xymm[0] >= xymmout[0] and xymm[1] >= xymmout[1] and \
+           xymm[2] <= xymmout[2] and xymm[3] <= xymmout[3]
+
+
+def rectCrossRect(xymm, xymm2):
+    "Return True if rectangles xymm and xymm2 intersect (or touch)."
+    return not (xymm[0] > xymm2[2] or xymm[1] > xymm2[3] or xymm[2] < xymm2[0] or xymm[3] < xymm2[1])
+
+
+def rect2Polygon(xymm):
+    "Return the closed polygon which represents rectangle xymm."
+    xa, ya, xb, yb = xymm
+    return [(xa, ya), (xb, ya), (xb, yb), (xa, yb), (xa, ya)]
+
+
+def segCrossRect(ca, cb, xymm):
+    "Return True if segment ca-cb intersects (or is inside) rectangle xymm; Liang-Barsky clipping."
+    xa, ya = ca[0], ca[1]
+    dx = cb[0] - xa
+    dy = cb[1] - ya
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, xa-xymm[0]), (dx, xymm[2]-xa), (-dy, ya-xymm[1]), (dy, xymm[3]-ya)):
+        if p == 0.0:
+            if q < 0.0: return False       # Parallel to and outside of this edge
+            continue
+        t = q / p
+        if p < 0.0:
+            if t > t1: return False
+            if t > t0: t0 = t
+        else:
+            if t < t0: return False
+            if t < t1: t1 = t
+    return True
+
+
+def polylineCrossRect(cp, xymm):
+    "Return True if polyline cp intersects (or is inside) rectangle xymm."
+    if len(cp) == 1:
+        c = cp[0]
+        return xymm[0] <= c[0] <= xymm[2] and xymm[1] <= c[1] <= xymm[3]
+    return any(segCrossRect(ca, cb, xymm) for ca, cb in iterby2(cp))
+
+
+def _orient(ca, cb, cc):
+    "Return the sign of the orientation of the triangle ca, cb, cc."
+    d = (cb[0]-ca[0])*(cc[1]-ca[1]) - (cb[1]-ca[1])*(cc[0]-ca[0])
+    if d > 0.0: return 1
+    if d < 0.0: return -1
+    return 0
+
+
+def _onSeg(ca, cb, cc):
+    "Return True if the collinear point cc is within the bounding rectangle of segment ca-cb."
+    return min(ca[0], cb[0]) <= cc[0] <= max(ca[0], cb[0]) and \
+           min(ca[1], cb[1]) <= cc[1] <= max(ca[1], cb[1])
+
+
+def segCrossSeg(ca, cb, c1, c2):
+    "Return True if segment ca-cb intersects (or touches) segment c1-c2; collinear overlap counts."
+    o1 = _orient(ca, cb, c1)
+    o2 = _orient(ca, cb, c2)
+    o3 = _orient(c1, c2, ca)
+    o4 = _orient(c1, c2, cb)
+    if o1 != o2 and o3 != o4: return True
+    if o1 == 0 and _onSeg(ca, cb, c1): return True
+    if o2 == 0 and _onSeg(ca, cb, c2): return True
+    if o3 == 0 and _onSeg(c1, c2, ca): return True
+    if o4 == 0 and _onSeg(c1, c2, cb): return True
+    return False
+
+
+def polylineCrossPolyline(cp, cp2):
+    "Return True if polyline cp intersects (or touches) polyline cp2."
+    if len(cp) == 1: cp = [cp[0], cp[0]]
+    if len(cp2) == 1: cp2 = [cp2[0], cp2[0]]
+    segs2 = []
+    for c1, c2 in iterby2(cp2):
+        segs2.append((min(c1[0], c2[0]), min(c1[1], c2[1]), max(c1[0], c2[0]), max(c1[1], c2[1]), c1, c2))
+    for ca, cb in iterby2(cp):
+        xa, xb = min(ca[0], cb[0]), max(ca[0], cb[0])
+        ya, yb = min(ca[1], cb[1]), max(ca[1], cb[1])
+        for x1, y1, x2, y2, c1, c2 in segs2:
+            if x1 > xb or x2 < xa or y1 > yb or y2 < ya: continue
+            if segCrossSeg(ca, cb, c1, c2): return True
+    return False
+
+
+def pointInPolygon(c, pol):
+    "Return True if point c is inside the closed polygon pol (ray crossing test)."
+    x, y = c[0], c[1]
+    inside = False
+    for ca, cb in iterby2(pol):
+        if (ca[1] > y) != (cb[1] > y):
+            xt = ca[0] + (y-ca[1]) * (cb[0]-ca[0]) / (cb[1]-ca[1])
+            if x < xt: inside = not inside
+    return inside
+
+
+def polylineInPolygon(cp, pol):
+    "Return True if polyline cp is completely inside the closed polygon pol."
+    if not all(pointInPolygon(c, pol) for c in cp): return False
+    return len(cp) < 2 or not polylineCrossPolyline(cp, pol)
+
+
+def polylineCrossPolygon(cp, pol):
+    "Return True if polyline cp intersects (or is inside) the closed polygon pol."
+    if any(pointInPolygon(c, pol) for c in cp): return True
+    return polylineCrossPolyline(cp, pol)
@@ -0,0 +1,84 @@
+"""\
+This module defines a static R-tree of rectangles, bulk loaded with the
+Sort-Tile-Recursive (STR) algorithm.
+
+The tree is built once from all the rectangles and it is not modified
+afterwards; objects which change are handled by the caller, usually by
+rebuilding the tree when enough changes have accumulated. STR bulk loading
+is O(n log n) and gives well packed nodes, so that a window query costs
+about O(log n + k), where k is the number of rectangles found.
+"""
+from math import ceil, sqrt
+
+
+class Rtree:
+    "A static R-tree of rectangles (xmin, ymin, xmax, ymax) with arbitrary objects."
+
+    def __init__(self, items=(), nodecap=16):
+        "Items is an iterable of (xymm, obj); obj is returned by the queries."
+        self.nodecap = max(int(nodecap), 2)
+        leaves = [(x[0], x[1], x[2], x[3], obj) for x, obj in items]
+        self.n = len(leaves)
+        self.root = None
+        if self.n == 0: return
+        nodes = self.__pack(leaves, True)
+        while len(nodes) > 1:
+            nodes = self.__pack(nodes, False)
+        self.root = nodes[0]
+
+
+    def __pack(self, entries, leaf):
+        "Pack entries into nodes of one level, using sort-tile-recursive ordering."
+        m = self.nodecap
+        nnodes = int(ceil(len(entries) / m))
+        nslabs = int(ceil(sqrt(nnodes)))
+        entries.sort(key=lambda e: e[0]+e[2])        # Sort by x of the centre
+        slab = nslabs * m
+        nodes = []
+        for i in range(0, len(entries), slab):
+            temp = entries[i:i+slab]
+            temp.sort(key=lambda e: e[1]+e[3])       # Sort by y of the centre
+            for j in range(0, len(temp), m):
+                ch = temp[j:j+m]
+                nodes.append([min(e[0] for e in ch), min(e[1] for e in ch),
+                              max(e[2] for e in ch), max(e[3] for e in ch), leaf, ch])
+        return nodes
+
+
+    def __len__(self):
+        "Return the number of rectangles of the tree."
+        return self.n
+
+
+    def bounds(self):
+        "Return the rectangle which contains all the rectangles of the tree, or None if tree is empty."
+        if self.root is None: return None
+        return tuple(self.root[:4])
+
+
+    def query(self, xymm):
+        """Yield the objects whose rectangles intersect (or touch) rectangle xymm.
+
+        Any of the coordinates of xymm may be None, which means no limit
+        in the corresponding direction."""
+        if self.root is None: return
+        xa, ya, xb, yb = xymm
+        if xa is None: xa = float("-inf")
+        if ya is None: ya = float("-inf")
+        if xb is None: xb = float("inf")
+        if yb is None: yb = float("inf")
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node[0] > xb or node[1] > yb or node[2] < xa or node[3] < ya: continue
+            if node[4]:
+                for e in node[5]:
+                    if e[0] > xb or e[1] > yb or e[2] < xa or e[3] < ya: continue
+                    yield e[4]
+            else:
+                stack.extend(node[5])
+
+
+    def querypoint(self, x, y, r=0.0):
+        "Yield the objects whose rectangles are within distance r (in x or y) of point x, y."
+        return self.query((x-r, y-r, x+r, y+r))
@@ -27,6 +27,7 @@ This module defines functions for line simplification. Methods:
 SV : "Least deviation (Stamos-Vassilaki)"
 RDP: "Max distance (Ramer–Douglas–Peucker)", 
 RV : "First fit (Reumann–Witkam)"
+It also defines a fast radial decimation for the level of detail of dense lines.
 """
 from math import hypot, fabs
 
@@ -148,3 +149,27 @@ def linearise(curve):
         if ze > zermax: zermax = ze
     #if t == (0.0, 1.0): print("max perp distance to", curve[mmax][1:3])
     return er/len(curve), ermax, zermax, mmax
+
+
+def lineDecimate2d(cp, tol):
+    """Return the indices of the vertices of line cp which remain after radial decimation.
+
+    A vertex is omitted if its x and y distances from the previously kept
+    vertex are both less than tol. The first and the last vertices are always
+    kept. This is O(n) and it is meant for the level of detail of the drawing
+    of dense lines, where tol is about one pixel; it does not try to minimise
+    the number of vertices as the algorithms above do.
+    A vertex is a sequence of x, y and optionally any other number of
+    dimensions. Only the first 2 coordinates are taken into account.
+    """
+    n = len(cp)
+    if n < 3: return list(range(n))
+    idx = [0]
+    xa, ya = cp[0][0], cp[0][1]
+    for i in range(1, n-1):
+        x, y = cp[i][0], cp[i][1]
+        if fabs(x-xa) < tol and fabs(y-ya) < tol: continue
+        idx.append(i)
+        xa, ya = x, y
+    idx.append(n-1)
+    return idx
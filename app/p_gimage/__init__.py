@@ -43,6 +43,7 @@ except ImportError:
 
 from .getscandpi import getScanDpi, getScanDpiFake
 from .Imagefake import ThanImageMissing
+from .pyramid import ImagePyramid, pyramidKey, pyramidPrune
 
 
 def imageSetmaxpixels(n=None):   #Thanasis2018_04_05
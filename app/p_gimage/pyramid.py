@@ -0,0 +1,129 @@
+"""\
+This module defines a multiresolution pyramid of a PIL image.
+
+Level 0 is the image itself; level k is the image reduced 2**k times. The
+levels are built lazily, each one from the previous, so that the cost is
+paid only once and only for the levels that are actually needed. If a cache
+directory and a key are given, each level is saved there when it is built,
+and it is read back the next time the same image is opened. The cache
+directory is kept bounded with pyramidPrune().
+"""
+import os, hashlib, itertools
+from PIL.Image import open as imopen, NEAREST, BICUBIC
+
+
+class ImagePyramid:
+    "Power of 2 overviews of a PIL image."
+    minsize = 64                   # The last level is the first which has a dimension < 2*minsize
+    __serial = itertools.count()   # Unique number of each pyramid, for caches outside the pyramid
+
+    def __init__(self, im, cachedir=None, key=None):
+        "Im is level 0; the other levels are computed when needed (and saved in cachedir if key is not None)."
+        self.levels = [im]
+        self.cachedir = cachedir
+        self.key = key
+        self.serial = next(self.__serial)
+        w, h = im.size
+        self.maxlevel = 0
+        while w >= 2*self.minsize and h >= 2*self.minsize:
+            w //= 2; h //= 2
+            self.maxlevel += 1
+
+
+    def level(self, k):
+        "Return level k (limited to the available levels) and the image of the level."
+        k = max(0, min(k, self.maxlevel))
+        while len(self.levels) <= k:
+            self.levels.append(self.__make(len(self.levels)))
+        return k, self.levels[k]
+
+
+    def levelFor(self, reduction):
+        """Return the coarsest level whose pixel is not larger than the target pixel.
+
+        reduction is the number of level 0 pixels per target (screen) pixel."""
+        k = 0
+        while reduction >= 2.0:
+            reduction *= 0.5
+            k += 1
+        return self.level(k)
+
+
+    def __make(self, k):
+        "Read level k from the cache directory, or compute it from level k-1 (and save it)."
+        fn = self.__cachename(k)
+        if fn is not None and os.path.exists(fn):
+            try:
+                im = imopen(fn)
+                im.load()
+                try: os.utime(fn)     # Mark as recently used, so that pyramidPrune() keeps it
+                except OSError: pass
+                return im
+            except (IOError, OSError, ValueError, SyntaxError):
+                pass                  # Corrupted cache file: compute the level again
+        im = half(self.levels[k-1])
+        if fn is not None:
+            try: im.save(fn, format="TIFF")
+            except (IOError, OSError, ValueError, KeyError): pass   # Saving is optional
+        return im
+
+
+    def __cachename(self, k):
+        "Return the file name of level k in the cache directory, or None if the levels are not persisted."
+        if self.cachedir is None or self.key is None: return None
+        return os.path.join(self.cachedir, "%s_%d.tif" % (self.key, k))
+
+
+def half(im):
+    "Return the image reduced to half size; each pixel is the average of 2x2 pixels (if possible)."
+    w, h = im.size
+    size = max(w//2, 1), max(h//2, 1)
+    if im.mode in ("1", "P"): return im.resize(size, NEAREST)   # Averaging is meaningless for palettes
+    try:
+        return im.reduce(2)           # Pillow >= 7.0: fast box filter
+    except (AttributeError, ValueError):
+        return im.resize(size, BICUBIC)
+
+
+def pyramidKey(filnam, *extra):
+    """Return a key which identifies the contents of an image file and its transformations.
+
+    The key changes when the file is modified; extra are any other data (for
+    example transposition and clipping) which change the image. None is
+    returned if the file does not exist."""
+    try:
+        st = os.stat(filnam)
+    except (OSError, TypeError, ValueError):
+        return None
+    t = repr((os.path.abspath(filnam), st.st_size, st.st_mtime) + extra)
+    return hashlib.md5(t.encode("utf-8", "replace")).hexdigest()
+
+
+def pyramidPrune(cachedir, maxbytes):
+    """Delete the least recently used levels in cachedir, so that their total size is at most maxbytes.
+
+    Return the number of bytes which were deleted."""
+    files = []
+    try:
+        names = os.listdir(cachedir)
+    except (OSError, TypeError):
+        return 0
+    for name in names:
+        if not name.endswith(".tif"): continue
+        fn = os.path.join(cachedir, name)
+        try:
+            st = os.stat(fn)
+        except OSError:
+            continue
+        files.append((st.st_mtime, st.st_size, fn))
+    total = sum(size for _, size, _ in files)
+    deleted = 0
+    for _, size, fn in sorted(files):          # Oldest first
+        if total <= maxbytes: break
+        try:
+            os.remove(fn)
+        except OSError:
+            continue
+        total -= size
+        deleted += size
+    return deleted
@@ -1,5 +1,4 @@
 import p_ggen
-from . import marsfrost
 
 UNIT_DPI = "dpi"
 
@@ -21,6 +20,7 @@ class FakeScanner:
         pass
     def scan(self):
         "Scan and return the image as a PIL image."
+        from . import marsfrost        #It is big: import it only when a scan is faked
         return marsfrost.marsfrost()
 
 
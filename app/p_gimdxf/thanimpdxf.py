@@ -1,3 +1,4 @@
+import os
 import p_ggen
 from math import isnan
 from . import thanimpdxfget
@@ -15,9 +16,15 @@ class ThanImportBase:
     which is a receiver class instance.
     """
 
-    def __init__(self, fDxf, dr, defaultLayer="0"):
-        "Creates an instance of the class."
+    def __init__(self, fDxf, dr, defaultLayer="0", progress=None):
+        """Creates an instance of the class.
+
+        If progress is not None, it is called as progress(nread, ntotal) from
+        time to time, where nread is the number of characters read so far and
+        ntotal is the size of the file (or None if unknown). If it returns True,
+        the import is cancelled and ThanImportError is raised."""
         self.thanCancel = 0
+        self.thanProgress = progress
         self._fullBuf = 0
         self._prevline = ""
         self._lindxf = 0
@@ -60,6 +67,14 @@ class ThanImportBase:
         raise p_ggen.ThanImportError(s1)
 
 
+    def thanCheckCancel(self, nread, ntotal):
+        "Report progress and raise ThanImportError if the user cancelled the import."
+        if self.thanProgress is None: return
+        if not self.thanProgress(nread, ntotal): return
+        self.thanCancel = 1
+        self.thanEr2s("Import was cancelled by the user.")
+
+
     def thanEr2s(self, s):
         "Raises import error with message (no lines are reported)."
         self.thanDr.prt(s, "can")
@@ -70,11 +85,14 @@ class ThanImportBase:
 class ThanImportDxf(ThanImportBase, ThanHeader, ThanEntities, ThanTables):
     "A producer class to import a dxf file and send drawing commands to the drawing object dr (self.thanDr)."
 
-    def __init__(self, fDxf, dr, defaultLayer="0"):
+    chunksize = 1<<20      # Number of characters read from the dxf file at once
+
+    def __init__(self, fDxf, dr, defaultLayer="0", progress=None):
         "Creates an instance of the class."
-        ThanImportBase.__init__(self, fDxf, dr, defaultLayer)
+        ThanImportBase.__init__(self, fDxf, dr, defaultLayer, progress)
         self._prevline = -1, ""
         self.thanDxfVer = 12   #If 2000, then TEXT are imported with the insertion point, not left point
+        self.__pairs = self.__iterPairs()
 
 
     def thanGetDxf(self):
@@ -82,23 +100,76 @@ class ThanImportDxf(ThanImportBase, ThanHeader, ThanEntities, ThanTables):
         if self._fullBuf:
             self._fullBuf = 0
         else:
-            s = self.fDxf.readline()
-            if s == "": return -1, ""             # End Of File
             try:
-                icodp = int(s)
-            except ValueError:
-                self.thanEr1s("Dxf code not an integer")
-            s = self.fDxf.readline()
-            if s == "": return -1, ""             # End Of File: incomplete dxf file 
-            if icodp < 10 and icodp != 1:  #Thanasis2013_04_21: If code<10 and not 1 then it is a name
-                s = s.strip().upper()      #Thanasis2013_04_21
-            else:
-                s = s.rstrip()             #Thanasis2011_12_30: Changed from strip() to rstrip() - Happy new year!!
-            self._prevline = icodp, s
+                icodp, s = next(self.__pairs)
+            except StopIteration:
+                return -1, ""                     # End Of File (or incomplete dxf file)
             self._lindxf += 2
+            if icodp is None: self.thanEr1s("Dxf code not an integer")
+            self._prevline = icodp, s
         return self._prevline
 
 
+    def thanGetDxfAtts(self):
+        """Reads the codes and values of an entity up to (but not including) the next code 0.
+
+        It returns a dictionary of the codes and values, and True if the end of
+        file was found. This is equivalent to calling thanGetDxf() repeatedly,
+        but it is much faster."""
+        atts = {}
+        if self._fullBuf:
+            icodp, s = self._prevline
+            if icodp == 0: return atts, False     # Buffered code 0 remains buffered
+            self._fullBuf = 0
+            atts[icodp] = s
+        n = 0
+        for icodp, s in self.__pairs:
+            n += 2
+            if icodp == 0:
+                self._lindxf += n
+                self._prevline = icodp, s
+                self._fullBuf = 1                 # Unget code 0
+                return atts, False
+            if icodp is None:
+                self._lindxf += n
+                self.thanEr1s("Dxf code not an integer")
+            atts[icodp] = s
+        self._lindxf += n
+        return atts, True
+
+
+    def __iterPairs(self):
+        """Read the dxf file in big chunks and yield (code, value) pairs.
+
+        The lines of each chunk are split into codes and values in bulk; an
+        incomplete line or an unpaired code is kept for the next chunk."""
+        try:
+            ntotal = os.fstat(self.fDxf.fileno()).st_size
+        except (AttributeError, OSError, ValueError):
+            ntotal = None                         #For example StringIO
+        nread = 0
+        rest = ""
+        while True:
+            s = self.fDxf.read(self.chunksize)
+            nread += len(s)
+            if s == "":
+                if rest == "": break
+                dlines = rest.split("\n")           # Last line without newline
+                rest = ""
+            else:
+                dlines = (rest + s).split("\n")
+                rest = dlines.pop()                  # Incomplete line (or "")
+            if len(dlines) % 2 == 1:
+                rest = dlines.pop() + "\n" + rest    # Code without value: keep it for the next chunk
+            codes = _codes(dlines[0::2])
+            vals = [v.strip().upper() if c is not None and c < 10 and c != 1 else v.rstrip()   #If code<10 and not 1 then it is a name
+                    for c, v in zip(codes, dlines[1::2])]   #works for python2,3
+            for pair in zip(codes, vals):            #works for python2,3
+                yield pair
+            self.thanCheckCancel(nread, ntotal)
+            if s == "": break                        # rest contained an unpaired code: incomplete dxf file
+
+
     def thanSetDxfVersion(self, iver):
         "Set version of the dxf; currenty 12 or 2000."
         assert iver in (12, 2000), "Version can be 12 or 2000"
@@ -183,9 +254,23 @@ class ThanImportDxf(ThanImportBase, ThanHeader, ThanEntities, ThanTables):
         return 0
 
 
-def thanImportDxf(fDxf, dr, defaultLayer="0"):
+def _codes(dlines):
+    "Convert the codes to int in bulk; a code which is not an integer becomes None."
+    try:
+        return list(map(int, dlines))             #works for python2,3
+    except ValueError:
+        return [_int(s) for s in dlines]
+
+
+def _int(s):
+    "Convert string to int, or None if not possible."
+    try: return int(s)
+    except ValueError: return None
+
+
+def thanImportDxf(fDxf, dr, defaultLayer="0", progress=None):
     "Creates an instance of the class to do the import."
-    ti = ThanImportDxf(fDxf, dr, defaultLayer)
+    ti = ThanImportDxf(fDxf, dr, defaultLayer, progress)
     return ti.thanImport()
 
 
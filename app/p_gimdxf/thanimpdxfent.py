@@ -50,14 +50,9 @@ class ThanEntities:
 
     def __getUnknown(self, name):
         "Reads an unknown enitity from .dxf file."
-        atts = {}
-        while 1:
-            icod, text = self.thanGetDxf()
-            if icod == -1:                # End of unknonwn entity, but try to read current line
-                self.thanWarn("Incomplete entity '{}': end of file.".format(name))
-                break
-            if icod == 0: self.thanUngetDxf(); break           # other element
-            atts[icod] = text
+        atts, eof = self.thanGetDxfAtts()
+        if eof:                # End of unknonwn entity, but try to read current line
+            self.thanWarn("Incomplete entity '{}': end of file.".format(name))
 
         if self.trAtts(atts, str, -8) or self.trAtts(atts, int, -62):
             self.thanWarn("Damaged entity '{}': probably corrupted file.".format(name))
@@ -134,14 +129,9 @@ class ThanEntities:
 
 #-----------Read coordinates of the vertex
 
-            atts = { }
-            while 1:
-                icod, text = self.thanGetDxf()
-                if icod == -1:                # End of file, but try to read current vertex
-                    self.thanWarn("Incomplete polyline vertex: end of file.")
-                    break
-                if icod == 0: self.thanUngetDxf(); break  # Vertex, SEQEND or other element
-                atts[icod] = text
+            atts, eof = self.thanGetDxfAtts()
+            if eof:                # End of file, but try to read current vertex
+                self.thanWarn("Incomplete polyline vertex: end of file.")
 
             if self.trAttsFloat(atts, 10, 20, -30):
                 self.thanWarn("Damaged polyline vertex: probably corrupted file.")
@@ -283,14 +273,9 @@ class ThanEntities:
 
     def __getLinep(self, name):
         "Reads a line from .dxf file."
-        atts = { }
-        while 1:
-            icod, text = self.thanGetDxf()
-            if icod == -1:                # End of file, but try to read current line
-                self.thanWarn("Incomplete line: end of file.")
-                break
-            if icod == 0: self.thanUngetDxf(); break           # other element
-            atts[icod] = text
+        atts, eof = self.thanGetDxfAtts()
+        if eof:                # End of file, but try to read current line
+            self.thanWarn("Incomplete line: end of file.")
 
         if self.trAttsFloat(atts, 10, 20, -30, 11, 21, -31, -210, -220, -230) or \
            self.trAtts(atts, str, -8) or self.trAtts(atts, int, -62, -370):
@@ -321,14 +306,9 @@ class ThanEntities:
 
     def __getPointp(self, name):
         "Reads a point from .dxf file."
-        atts = { }
-        while 1:
-            icod, text = self.thanGetDxf()
-            if icod == -1:                # End of file, but try to read current line
-                self.thanWarn("Incomplete point: end of file.")
-                break
-            if icod == 0: self.thanUngetDxf(); break           # other element
-            atts[icod] = text
+        atts, eof = self.thanGetDxfAtts()
+        if eof:                # End of file, but try to read current line
+            self.thanWarn("Incomplete point: end of file.")
 
         if self.trAttsFloat(atts, 10, 20, -30) or self.trAtts(atts, str, -8) or\
            self.trAtts(atts, int, -62):
@@ -347,14 +327,9 @@ class ThanEntities:
 
     def __getTextp(self, name):
         "Reads a text from .dxf file."
-        atts = { }
-        while 1:
-            icod, text = self.thanGetDxf()
-            if icod == -1:                # End of file, but try to read current line
-                self.thanWarn("Incomplete text: end of file.")
-                break
-            if icod == 0: self.thanUngetDxf(); break           # other element
-            atts[icod] = text
+        atts, eof = self.thanGetDxfAtts()
+        if eof:                # End of file, but try to read current line
+            self.thanWarn("Incomplete text: end of file.")
 
         if self.trAttsFloat(atts, 10, 20, -30, 40, -50) or self.trAtts(atts, str, 1, -8) or\
            self.trAtts(atts, int, -62):
@@ -381,14 +356,9 @@ class ThanEntities:
 
     def __getCirclep(self, name):
         "Reads a circle from .dxf file."
-        atts = { }
-        while 1:
-            icod, text = self.thanGetDxf()
-            if icod == -1:                # End of file, but try to read current line
-                self.thanWarn("Incomplete circle: end of file.")
-                break
-            if icod == 0: self.thanUngetDxf(); break           # other element
-            atts[icod] = text
+        atts, eof = self.thanGetDxfAtts()
+        if eof:                # End of file, but try to read current line
+            self.thanWarn("Incomplete circle: end of file.")
 
         if self.trAttsFloat(atts, 10, 20, -30, 40) or self.trAtts(atts, int, -62):
             self.thanWarn("Damaged circle: probably corrupted file.")
@@ -408,14 +378,9 @@ class ThanEntities:
 
     def __getArcp(self, name):
         "Reads an arc from .dxf file."
-        atts = {}
-        while 1:
-            icod, text = self.thanGetDxf()
-            if icod == -1:                # End of file, but try to read current line
-                self.thanWarn("Incomplete arc: end of file.")
-                break
-            if icod == 0: self.thanUngetDxf(); break           # other element
-            atts[icod] = text
+        atts, eof = self.thanGetDxfAtts()
+        if eof:                # End of file, but try to read current line
+            self.thanWarn("Incomplete arc: end of file.")
 
         if self.trAttsFloat(atts, 10, 20, -30, 40, 50, 51) or self.trAtts(atts, int, -62):
             self.thanWarn("Damaged arc: probably corrupted file.")
@@ -437,14 +402,9 @@ class ThanEntities:
 
     def __getEllipsep(self, name):
         "Reads an elliptic arc from .dxf file."
-        atts = {}
-        while 1:
-            icod, text = self.thanGetDxf()
-            if icod == -1:                # End of file, but try to read current line
-                self.thanWarn("Incomplete arc: end of file.")
-                break
-            if icod == 0: self.thanUngetDxf(); break           # other element
-            atts[icod] = text
+        atts, eof = self.thanGetDxfAtts()
+        if eof:                # End of file, but try to read current line
+            self.thanWarn("Incomplete arc: end of file.")
 
         if self.trAttsFloat(atts, 10, 20, -30, 11, 21, -31, 40, 41, 42) or self.trAtts(atts, int, -62):
             self.thanWarn("Damaged elliptic arc: probably corrupted file.")
@@ -516,14 +476,9 @@ class ThanEntities:
 
 #-----------Read name and value of the attribute
 
-            atts = {}
-            while 1:
-                icod, text = self.thanGetDxf()
-                if icod == -1:                # End of file, but try to read current attribute
-                    self.thanWarn("Incomplete block attribute: end of file.")
-                    break
-                if icod == 0: self.thanUngetDxf(); break  # Vertex, SEQEND or other element
-                atts[icod] = text
+            atts, eof = self.thanGetDxfAtts()
+            if eof:                # End of file, but try to read current attribute
+                self.thanWarn("Incomplete block attribute: end of file.")
 
             if self.trAtts(atts, str, 1, 2):
                 self.thanWarn("Damaged block attribute: probably corrupted file.")
@@ -538,14 +493,9 @@ class ThanEntities:
 
     def __getThanCadImagep(self, name):
         "Reads a ThanCad Image from .dxf file."
-        atts = { }
-        while 1:
-            icod, text = self.thanGetDxf()
-            if icod == -1:                # End of file, but try to read current image
-                self.thanWarn("Incomplete ThanCad image: end of file.")
-                break
-            if icod == 0: self.thanUngetDxf(); break           # other element
-            atts[icod] = text
+        atts, eof = self.thanGetDxfAtts()
+        if eof:                # End of file, but try to read current image
+            self.thanWarn("Incomplete ThanCad image: end of file.")
 
         if self.trAttsFloat(atts, 10, 20, -30, 40, 41, 42, 50) or self.trAtts(atts, str, 1, -8) or\
            self.trAtts(atts, int, -62):
@@ -568,14 +518,9 @@ class ThanEntities:
 
     def __get3dfacep(self, name):
         "Reads a 3dface (triangle or quadrilateral) from .dxf file."
-        atts = { }
-        while 1:
-            icod, text = self.thanGetDxf()
-            if icod == -1:                # End of file, but try to read current line
-                self.thanWarn("Incomplete 3dface: end of file.")
-                break
-            if icod == 0: self.thanUngetDxf(); break           # other element
-            atts[icod] = text
+        atts, eof = self.thanGetDxfAtts()
+        if eof:                # End of file, but try to read current line
+            self.thanWarn("Incomplete 3dface: end of file.")
 
         if self.trAttsFloat(atts, 10, 20, 30, 11, 21, 31, 12, 22, 32, -13, -23, -33) or \
            self.trAtts(atts, int, -62):
@@ -615,14 +560,9 @@ class ThanEntities:
         - This method, if it finds 3 points, then adds 1 with the same
           coodinates as the third, so that it is a valid triangular solid.
         """
-        atts = { }
-        while 1:
-            icod, text = self.thanGetDxf()
-            if icod == -1:                # End of file, but try to read current line
-                self.thanWarn("Incomplete solid: end of file.")
-                break
-            if icod == 0: self.thanUngetDxf(); break           # other element
-            atts[icod] = text
+        atts, eof = self.thanGetDxfAtts()
+        if eof:                # End of file, but try to read current line
+            self.thanWarn("Incomplete solid: end of file.")
 
         if self.trAttsFloat(atts, 10, 20, -30, 11, 21, -31, 12, 22, -32, -13, -23, -33) or \
            self.trAtts(atts, int, -62) or self.trAtts(atts, str, -8, -5):
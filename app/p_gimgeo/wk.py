@@ -1,5 +1,6 @@
 from math import pi
 from xml.sax.saxutils import escape
+import numpy as np
 import p_ggen, p_ggeod
 
 
@@ -96,13 +97,11 @@ class ThanKmlWriter(object):
 
     def writeLinestring(self, aa, cp, layer=dfn, desc=""):
         "Write a line consisitng of 3d points as a linestring to a google Keyhole Markup Language file."
-        temp = []
-        for cpa in cp:
-            al, phi = self.projcur.en2geodetGRS80(cpa[0], cpa[1])
-            al  *= 180.0/pi
-            phi *= 180.0/pi
-            temp.append("%.14f,%.14f,%.14f" % (al, phi, cpa[2]))
-        t = " ".join(temp)
+        cc = np.array([cpa[:3] for cpa in cp], dtype=float).reshape(-1, 3)
+        al, phi = self.projcur.en2geodetGRS80s(cc[:, 0], cc[:, 1])    #All the points at once
+        cc[:, 0] = al * (180.0/pi)
+        cc[:, 1] = phi * (180.0/pi)
+        t = " ".join("%.14f,%.14f,%.14f" % tuple(c1) for c1 in cc.tolist())
         #aa = p_ggen.griso2utf(aa)
         #desc =  p_ggen.griso2utf(desc)
         self.fw.write(self.formLinestring % (escape(aa), escape(desc), escape(layer), t))
@@ -18,6 +18,10 @@ class Transformation(object):
         "Transform the coordinates of a 3d point."
         return array(cp)
 
+    def calcs(self, X, Y, Z):
+        "Transform the coordinates of many 3d points; X, Y, Z are NumPy arrays."
+        return X, Y, Z
+
 
 class TranslationTransformation(Transformation):
     "An object which adds constant displacements to X, Y, Z."
@@ -34,6 +38,10 @@ class TranslationTransformation(Transformation):
         "Transform the coordinates of a 3d point."
         return self.cu + array(cp)
 
+    def calcs(self, X, Y, Z):
+        "Transform the coordinates of many 3d points; X, Y, Z are NumPy arrays."
+        return self.cu[0]+X, self.cu[1]+Y, self.cu[2]+Z
+
 
 class SimilarTransformation(Transformation):
     """Keeps the rotation, translation and scale.
@@ -88,6 +96,14 @@ class SimilarTransformation(Transformation):
         return self.cu + self.am * matrixmultiply(self.rxyz, array(cp))
 
 
+    def calcs(self, X, Y, Z):
+        "Transform the coordinates of many 3d points; X, Y, Z are NumPy arrays."
+        r = self.rxyz; am = self.am; cu = self.cu
+        return (cu[0] + am*(r[0,0]*X + r[0,1]*Y + r[0,2]*Z),
+                cu[1] + am*(r[1,0]*X + r[1,1]*Y + r[1,2]*Z),
+                cu[2] + am*(r[2,0]*X + r[2,1]*Y + r[2,2]*Z))
+
+
     def calc2d(self, cp):
         "Transform the coordinates of a 2d point."
         xr, yr, zr = cp; a = self.a
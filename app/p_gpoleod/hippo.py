@@ -74,9 +74,9 @@ class HippoUrban(object):
         return self.changed == other.changed
 
 
-    def build_cache(self, dtm, prt=p_ggen.prg):
-        "Create road grid every dx, dy, dtheta; cache the results."
-        self.cache.build_cache(dtm, self.hull, prt)
+    def build_cache(self, dtm, prt=p_ggen.prg, nworkers=1, cachedir=None):
+        "Create road grid every dx, dy, dtheta; cache the results (see HippoCache.build_cache())."
+        self.cache.build_cache(dtm, self.hull, prt, nworkers, cachedir)
         self.minmax(dtm, prt)
         self.changed += 1    #Object has been modified
 
@@ -1,40 +1,41 @@
-# -*- coding: iso-8859-7 -*-
 ##############################################################################
-# ThanCad 0.3.0 "Oberpfaffenhofen": n-dimensional CAD with raster support for engineers
-# 
-# Copyright (C) 2001-2015 Thanasis Stamos, January 18, 2015
+# ThanCad 0.9.1 "Students2024": n-dimensional CAD with raster support for engineers
+#
+# Copyright (C) 2001-2025 Thanasis Stamos, May 20, 2025
 # Athens, Greece, Europe
 # URL: http://thancad.sourceforge.net
-# e-mail: cyberthanasis@excite.com
-# 
+# e-mail: cyberthanasis@gmx.net
+#
 # This program is free software; you can redistribute it and/or modify
 # it under the terms of the GNU General Public License as published by
 # the Free Software Foundation; either version 2 of the License, or
 # (at your option) any later version.
-# 
+#
 # This program is distributed in the hope that it will be useful,
 # but WITHOUT ANY WARRANTY; without even the implied warranty of
 # MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
 # GNU General Public License for more details (www.gnu.org/licenses/gpl.html).
-# 
+#
 # You should have received a copy of the GNU General Public License
 # along with this program; if not, write to the Free Software
 # Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
 ##############################################################################
 """\
-ThanCad 0.3.0 "Oberpfaffenhofen": n-dimensional CAD with raster support for engineers
+ThanCad 0.9.1 "Students2024": n-dimensional CAD with raster support for engineers
 
 Package which creates a bioclimatic city plan.
 This module builds a cache for an Hippodamian plan of city layouts.
 """
-
-from __future__ import print_function
 from math import cos, sin, pi, ceil, floor
+import os, hashlib, pickle
 import p_ggen, p_gtri
+from p_ganneal import WorkerPool
 from . import roadut
 
+_CACHEVERSION = 1     #Version of the format of the saved cache files
+
 
-class HippoCache(object):
+class HippoCache:
     "A cache of road energys for an Hippodamus urban plan system."
 
     def __init__(self, dx=1.0, dy=1.0, dtheta=1.0, devdebug=False):
@@ -59,10 +60,25 @@ class HippoCache(object):
         return r
 
 
-    def build_cache(self, dtm, hull, prt=p_ggen.prg):
-        "Create road grid every dx, dy, dtheta; cache the results."
+    def build_cache(self, dtm, hull, prt=p_ggen.prg, nworkers=1, cachedir=None):
+        """Create road grid every dx, dy, dtheta; cache the results.
+
+        The thetas are split into chunks which are computed by nworkers worker
+        processes (0 means the number of CPUs); the DTM is sent once to each
+        worker. If the DTM can not be pickled, the cache is computed serially.
+        Worker processes are forked, so they should not be used from the GUI.
+        If cachedir is not None, the results are saved there, keyed by a hash of
+        the DTM, the hull and dx, dy, dtheta; if they have already been saved,
+        they are read instead of being computed again."""
 #        self.dx = self.dy = 5.0       #Make the routine faster: for debugging
 #        self.dtheta = 30.0            #Make the routine faster: for debugging
+        fn = None
+        if cachedir is not None:
+            key = self.cacheKey(dtm, hull)
+            if key is not None: fn = os.path.join(cachedir, "hippo_%s.cache" % (key,))
+            if fn is not None and self.__load(fn):
+                prt("Cache was read from %s" % (fn,))
+                return
         self.roadenx = {}      #road energy in direction x (angle theta)
         self.roadeny = {}      #road energy in direction y (angle theta-90deg)
         self.pxmin = {}        #xmin of a road where x is the direction of angle theta and also the direction of the road
@@ -70,36 +86,79 @@ class HippoCache(object):
         self.pymin = {}        #ymin of a road where y is the direction of angle theta-90deg and also the direction of the road
         self.pymax = {}        #ymax
         prt("Building cache..")
-        for theta in p_ggen.xfrange(-90.0, 90.0, self.dtheta):
-            prt("theta=%f" % theta)
-            thrad = theta*pi/180.0
-            pymin, pymax = self.build_cache_roads(dtm, hull, self.roadenx, theta, thrad, self.dy, prt)
-            pxmin, pxmax = self.build_cache_roads(dtm, hull, self.roadeny, theta, thrad-pi*0.5, self.dx, prt)
-            self.pymin[theta] = pymin
-            self.pymax[theta] = pymax
-            self.pxmin[theta] = pxmin
-            self.pxmax[theta] = pxmax
-
-
-    def build_cache_roads(self, dtm, hull, roads, theta, thrad, dy, prt):
-        "Create grid; direction theta with respect to x-axis, varied widths,lenths of O.T. varies lengths of roads."
-        t = cos(thrad), sin(thrad)
-        n = -t[1], t[0]
-        py = [n[0]*c[0]+n[1]*c[1] for c in hull]
-        pymin = ceil(min(py)/dy+0.1)*dy     # Avoid py exactly on boundary
-        pymax = floor(max(py)/dy-0.1)*dy    # Avoid py exactly on boundary
-#        prt("pymin=%.3f  -->  %.3f" % (min(py), pymin))
-#        prt("pymax=%.3f  -->  %.3f" % (max(py), pymax))
-
-        for pyaxis in p_ggen.xfrangec(pymin, pymax, dy):
-            c1, c2 = p_gtri.thanPolygonLine(hull, pyaxis, n)
-            assert c1 != None, "There should be 2 intersections!"
-            nc, cprof = dtm.thanLineZ((c1, c2))
-            if nc == -1:
-                roads[theta, pyaxis] = None      # No profile was found
-            else:
-                roads[theta, pyaxis] = roadut.road1energy(cprof)
-        return pymin, pymax
+        thetas = list(p_ggen.frange(-90.0, 90.0, self.dtheta))
+        if nworkers != 1 and not _picklable(dtm):
+            prt("The DTM can not be sent to worker processes: cache is built serially")
+            nworkers = 1
+        with WorkerPool(nworkers, _initWorker, (dtm, hull, self.dx, self.dy)) as pool:
+            n = pool.nworkers
+            if n <= 1: chunks = [[theta] for theta in thetas]     #Progress is reported for every theta
+            else:      chunks = [thetas[i::4*n] for i in range(4*n)] #About 4 chunks per worker, with similar load
+            chunks = [chunk for chunk in chunks if chunk]
+            for i in range(0, len(chunks), n):
+                for chunk in pool.map(_build_cache_thetas, chunks[i:i+n]):
+                    for theta, pymin, pymax, pxmin, pxmax, roadsx, roadsy in chunk:
+                        self.pymin[theta] = pymin
+                        self.pymax[theta] = pymax
+                        self.pxmin[theta] = pxmin
+                        self.pxmax[theta] = pxmax
+                        self.roadenx.update(roadsx)
+                        self.roadeny.update(roadsy)
+                prt("theta=%f" % max(theta for chunk in chunks[i:i+n] for theta in chunk))
+        _worker.clear()                  #Release the DTM if it was computed in this process
+        if fn is not None: self.__save(fn)
+
+
+    def cacheKey(self, dtm, hull):
+        """Return a hash of the DTM, the hull and the sampling distances, or None if the DTM can not be hashed.
+
+        DTMs which are defined by lines (thanLines) are hashed by their lines.
+        DEMs are hashed by the path, the size and the modification time of
+        their file (filnam) or of their directories (path_gd, as in GDEM),
+        and by their projection."""
+        h = hashlib.md5()
+        h.update(repr((type(dtm).__name__, self.dx, self.dy, self.dtheta, [tuple(c) for c in hull])).encode("utf-8"))
+        lines = getattr(dtm, "thanLines", None)
+        if lines is not None:
+            for lin in lines:
+                h.update(repr([tuple(c) for c in lin]).encode("utf-8"))
+            return h.hexdigest()
+        fns = [getattr(dtm, "filnam", "")]
+        fns.extend(getattr(dtm, "path_gd", ()))
+        fns = [str(fn).strip() for fn in fns if fn is not None and str(fn).strip() != ""]
+        if not fns: return None
+        for fn in fns:
+            try: st = os.stat(fn)
+            except OSError: return None
+            h.update(repr((os.path.abspath(fn), st.st_size, st.st_mtime)).encode("utf-8"))
+        proj = getattr(dtm, "projcur", None)
+        if proj is not None:
+            pars = sorted((k, v) for k, v in vars(proj).items() if isinstance(v, (int, float, str)))
+            h.update(repr((type(proj).__name__, pars)).encode("utf-8"))
+        return h.hexdigest()
+
+
+    def __save(self, fn):
+        "Save the cache to file fn; it is not an error if this fails."
+        data = self.dx, self.dy, self.dtheta, self.roadenx, self.roadeny, self.pxmin, self.pxmax, self.pymin, self.pymax
+        try:
+            with open(fn + ".tmp", "wb") as fw:
+                pickle.dump((_CACHEVERSION, data), fw, protocol=2)
+            os.replace(fn + ".tmp", fn)         #Other processes never see a partial file
+        except (IOError, OSError, pickle.PicklingError):
+            pass
+
+
+    def __load(self, fn):
+        "Read the cache from file fn; return False if it does not exist or it is corrupted."
+        try:
+            with open(fn, "rb") as fr:
+                version, data = pickle.load(fr)
+            if version != _CACHEVERSION: return False
+            self.dx, self.dy, self.dtheta, self.roadenx, self.roadeny, self.pxmin, self.pxmax, self.pymin, self.pymax = data
+        except Exception:         #Missing or corrupted file: compute the cache again
+            return False
+        return True
 
 
     def energy(self, s):
@@ -188,3 +247,61 @@ class HippoCache(object):
                 if dline == "$": break
                 key1, key2, val1, val2, val3, val4 = map(float, dline.split())
                 pc[key1, key2] = val1, val2, val3, val4
+
+
+_worker = {}         #The DTM, the hull and dx, dy of the cache which is built by this (worker) process
+
+
+def _initWorker(dtm, hull, dx, dy):
+    "Save the data which are common to all the thetas; it is called once in each worker process."
+    _worker["args"] = dtm, hull, dx, dy
+
+
+def _picklable(obj):
+    "Return True if obj can be sent to a worker process."
+    try:
+        pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:        #Pickling may raise almost anything (TypeError, AttributeError, ..)
+        return False
+    return True
+
+
+def _build_cache_thetas(thetas):
+    """Compute the cached roads for the thetas in directions x and y; it may be called by a worker process.
+
+    For each theta it returns theta, pymin, pymax, pxmin, pxmax and the road
+    energies in directions x and y as dicts."""
+    dtm, hull, dx, dy = _worker["args"]
+    res = []
+    for theta in thetas:
+        thrad = theta*pi/180.0
+        roadsx = {}
+        roadsy = {}
+        pymin, pymax = _build_cache_roads(dtm, hull, roadsx, theta, thrad, dy)
+        pxmin, pxmax = _build_cache_roads(dtm, hull, roadsy, theta, thrad-pi*0.5, dx)
+        res.append((theta, pymin, pymax, pxmin, pxmax, roadsx, roadsy))
+    return res
+
+
+def _build_cache_roads(dtm, hull, roads, theta, thrad, dy):
+    "Create grid; direction theta with respect to x-axis, varied widths,lenths of O.T. varies lengths of roads."
+    t = cos(thrad), sin(thrad)
+    n = -t[1], t[0]
+    py = [n[0]*c[0]+n[1]*c[1] for c in hull]
+    pymin = ceil(min(py)/dy+0.1)*dy     # Avoid py exactly on boundary
+    pymax = floor(max(py)/dy-0.1)*dy    # Avoid py exactly on boundary
+#    prt("pymin=%.3f  -->  %.3f" % (min(py), pymin))
+#    prt("pymax=%.3f  -->  %.3f" % (max(py), pymax))
+
+    pyaxes = list(p_ggen.frangec(pymin, pymax, dy))
+    lines = []
+    for pyaxis in pyaxes:
+        c1, c2 = p_gtri.thanPolygonLine(hull, pyaxis, n)
+        assert c1 is not None, "There should be 2 intersections!"
+        lines.append((c1, c2))
+    for pyaxis, (nc, cprof) in zip(pyaxes, dtm.thanLinesZ(lines)):   #works for python2,3
+        if nc == -1:
+            roads[theta, pyaxis] = None      # No profile was found
+        else:
+            roads[theta, pyaxis] = roadut.road1energy(cprof)
+    return pymin, pymax
@@ -5,10 +5,16 @@ from .thantkutila import thanGudPosition
 
 
 class ProgressWin:
-    "A window which shows one or more progress bars which can be interrupted."
+    """A window which shows one or more progress bars which can be interrupted.
+
+    If master is not a Tk window (e.g. batch mode), no window is shown."""
 
     def __init__(self, master, vmax, tit, width=400, height=None):
         "Create the window."
+        self.stopComputation = False
+        if not isinstance(master, tk.Misc):
+            self.win = None
+            return
         self.win = tk.Toplevel(master)
         thanGudPosition(self.win, master)
         self.win.title(tit)
@@ -17,16 +23,17 @@ class ProgressWin:
         if height is None: height = len(vmax)*70
         self.win.geometry('{}x{}'.format(width, height))
         self.vmax = vmax
-        self.stopComputation = False
         self.makeWidgets()
         self.win.protocol("WM_DELETE_WINDOW", self.cancel)
 
     def setMaximum(self, vmax, i=0):
         "Set the maximum of progressbar u."
+        if self.win is None: return
         self.pro[i].config(maximum=vmax)
 
     def start(self, fun, *args):
         "Start the computation."
+        if self.win is None: return fun(*args)
         self.win.update()
         self.win.grab_set()
         try:
@@ -38,6 +45,7 @@ class ProgressWin:
 
     def update(self, ival, i=0):
         "Set a value to the progress bar."
+        if self.win is None: return
         self.pro[i].config(value=ival)
         self.win.update()
 
@@ -58,6 +66,7 @@ class ProgressWin:
 
     def destroy(self):
         "Break circular references."
+        if self.win is None: return
         del self.pro
         self.win.grab_release()
         self.win.destroy()
@@ -52,6 +52,8 @@ def correctDialogColor(master, font1):
 
 def thanGudGetReadFile(self, ext, tit, initialfile="", initialdir="", multiple=False, font=None):
     "Gets a filename that exists, from user."
+    if not isinstance(self, tkinter.Misc):   #Not a Tk window (e.g. batch mode): it asks the user itself
+        return self.thanGudGetReadFile(ext, tit, initialfile, initialdir, multiple)
     ext1 = thanExtExpand(ext)
     #defext = ext[0][1][1:]    # For Windows?
     defext = ext1[0][1]
@@ -194,6 +196,8 @@ def thanExtExpand(ext):
 
 def thanGudGetSaveFile(self, ext, tit, initialfile="", initialdir="", font=None):
     "Gets a filename that may exists, from user."
+    if not isinstance(self, tkinter.Misc):   #Not a Tk window (e.g. batch mode): it asks the user itself
+        return self.thanGudGetSaveFile(ext, tit, initialfile, initialdir)
     ext = thanExtExpand(ext)
     kw = {}
     if Pyos.Windows: kw["defaultextension"]=ext[0][1]
@@ -239,6 +243,8 @@ def thanGudOpenSaveFile(self, ext, tit, mode="w", initialfile="", initialdir="",
 
 def thanGudGetDir(self, tit, initialdir="", mustexist=False, font=None):
     "Gets a filename that exists, from user."
+    if not isinstance(self, tkinter.Misc):   #Not a Tk window (e.g. batch mode): it asks the user itself
+        return self.thanGudGetDir(tit, initialdir, mustexist)
     if not Pyos.Windows: fra = correctDialogColor(self, font)  #Thanasis2021_09_26
     opendialog = filedialog.Directory(parent=self,   #Thanasis2021_09_26: fra is now the parent
                  title=thanUnicode(tit), initialdir=initialdir, mustexist=mustexist)
@@ -250,11 +256,13 @@ def thanGudGetDir(self, tit, initialdir="", mustexist=False, font=None):
 
 def thanGudAskOkCancel(self, message, title, default="cancel"):
         "Shows message and returns true if user pressed OK; there is no default answer."
+        if not isinstance(self, tkinter.Misc): return self.thanGudAskOkCancel(message, title, default)
         return messagebox.askokcancel(thanUnicode(title), thanUnicode(message),
             default=default, parent=self)
 
 def thanGudAskYesNo(self, message, title, default="yes"):
         "Shows message and returns true if user pressed OK; there is no default answer; returns boolean True or False."
+        if not isinstance(self, tkinter.Misc): return self.thanGudAskYesNo(message, title, default)
         return messagebox.askyesno(thanUnicode(title), thanUnicode(message),
             default=default, parent=self)
 
@@ -266,6 +274,7 @@ def thanGudAskYesNo(self, message, title, default="yes"):
 #WARNING = "warning"
 def thanGudModalMessage(self, message, title, icon=None, **kw):
         "Show a message and wait until user discards it."
+        if not isinstance(self, tkinter.Misc): return self.thanGudModalMessage(message, title, icon)
         messagebox.showinfo(thanUnicode(title), thanUnicode(message), parent=self, icon=icon, **kw)
 
 #===========================================================================
@@ -1,6 +1,6 @@
 from .tri import ThanTri
 from .trilocate import TriLocate
-from .dtmvar import thanPointZ, thanLineZ, thanLineZendpointstoo, ThanDTMDEM, thanPolygonLine
+from .dtmvar import thanPointZ, thanPointsZ, thanLineZ, thanLineZendpointstoo, ThanDTMDEM, thanPolygonLine
 from .ypyka import ThanYpyka
 from .dtmlines import ThanDTMlines
 from .dtminv import ThanDTMinv2
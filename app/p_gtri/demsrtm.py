@@ -1,5 +1,6 @@
 from math import hypot, pi
 from p_gmath import dpt
+import numpy as np
 import p_gnum, p_gvarcom
 from .demusgs import ThanDEMusgs
 
@@ -131,6 +132,15 @@ class ThanDEMsrtm(ThanDEMusgs):
         return z
 
 
+    def thanPointsZ(self, cc, native=False):
+        "Calculate the z coordinates of many points with bilinear interpolation; NaN where z is unknown."
+        if native: return super(ThanDEMsrtm, self).thanPointsZ(cc, native)
+        cc = [self.user2geodetGRS80(cp) for cp in cc]
+        z = super(ThanDEMsrtm, self).thanPointsZ(cc, native)
+        if not self.isorthometric and len(cc) > 0: z -= unduls(cc)   #NaN stays NaN
+        return z
+
+
     def thanPixelCoor(self, cp, native=False):
         "Return the pixel coordinates of the point."
         if not native:
@@ -198,6 +208,17 @@ class ThanDEMsrtm(ThanDEMusgs):
         return ni, cn
 
 
+    def thanLinesZ(self, lines):
+        "Calculate the z coordinates along many lines at once."
+        lines = [[self.user2geodetGRS80(c1) for c1 in cp] for cp in lines]
+        res = []
+        for ni, cn in super(ThanDEMsrtm, self).thanLinesZ(lines):
+            if not self.isorthometric:
+                for cc in cn: cc[2] -= undul(cc)
+            res.append((ni, [self.geodetGRS802User(c) for c in cn]))
+        return res
+
+
 def undul(cp):
     "Compute the undulation at GRS80 geodetic coordinates in radians cp[0], cp[1])"
     from p_gearth import egm08Ndyn
@@ -211,3 +232,15 @@ def undul(cp):
         print("ThanDEMsrtm.undul(): EGM08 did not compute undulation at λ=%f φ=%f. Undulation set to zero." % (alam, phi))
         N = 0.0
     return N
+
+
+def unduls(cc):
+    "Compute the undulations at many GRS80 geodetic coordinates cc[i][0], cc[i][1]; return a NumPy array."
+    from p_gearth import egm08Nmany
+    cc = np.asarray([cp[:2] for cp in cc], dtype=float).reshape(-1, 2)
+    N = egm08Nmany(cc[:, 0], cc[:, 1])
+    bad = N == 999999.0
+    if bad.any():
+        print("ThanDEMsrtm.unduls(): EGM08 did not compute undulation at %d points. Undulation set to zero." % (np.count_nonzero(bad),))
+        N[bad] = 0.0
+    return N
@@ -21,10 +21,15 @@ docusgs = __doc__
 
 from math import hypot, floor, ceil
 from PIL import Image
+try:
+    from PIL.Image import DecompressionBombError
+except ImportError:
+    class DecompressionBombError(Exception): pass    #Support for older versions of PILLOW
+import numpy as np
 from math import fabs
-from p_gmath import thanNear2, thanNearx, linint
+from p_gmath import thanNear2, thanNearx, linint, thanThresholdx
 import p_ggen, p_gbmp, p_gnum, p_gvarcom
-from .dtmvar import ThanDTMDEM
+from .dtmvar import ThanDTMDEM, interpolatez
 from .deciphererdasdem import decipherErdasAscDem
 
 
@@ -40,6 +45,8 @@ class ThanDEMusgs(ThanDTMDEM):
         self.GDAL_NODATA = nodatadef     #Special pixel value that means that the pixel has unknown elevation
         self.filnam = ""                 #Pathname of the tif file.
         self.im = None                   #Tif file which stores the DTM
+        self.__za = None                 #The pixels of self.im as a NumPy array (made when needed)
+        self.__zaim = None               #The image which self.__za was made from
         self.xymma = p_gvarcom.Xymm()    #The coordinates of the lower left and the upper right nodes of the DEM in object coordinates
         self.thanCena = (0.0, 0.0, 0.0)  #Centroid of the DEM in object coordinates
 
@@ -82,7 +89,13 @@ class ThanDEMusgs(ThanDTMDEM):
 
 
     def thanSet(self, filnam, im=None):
-        "Set the tif image which contains the DEM."
+        """Set the tif image which contains the DEM.
+
+        If the tif is not compressed, its pixels are memory mapped and only
+        the parts which are actually used are read from the disk."""
+        za = None
+        if im is None:
+            im, za = _openMapped(filnam)
         if im is None:
             im, terr = p_gbmp.imageOpen(filnam)
             if im is None: return False, terr
@@ -92,6 +105,7 @@ class ThanDEMusgs(ThanDTMDEM):
             return False, why
         self.thanSetFilnam(filnam, force=True)
         self.im = im
+        if za is not None: self.__za = za; self.__zaim = im
         self.xymma[:] = self.X0, self.Y0-self.DY*(self.nyrows-1), self.X0+self.DX*(self.nxcols-1), self.Y0 #WARNING: xymma must be valid node coordinates
         self.thanCentroidCompute()
         return True, ""
@@ -129,14 +143,38 @@ class ThanDEMusgs(ThanDTMDEM):
 
     def getpixel(self, jx, iy):
         "Return the pixel value"
+        if self.__zaim is self.im: return self.__za.item(iy, jx)   #This does not load a memory mapped image
         return self.im.getpixel((jx, iy))
 
 
     def putpixel(self, jx, iy, z):
         "Return the pixel value"
+        if self.__zaim is self.im:                         #Keep the array in sync
+            if not self.__za.flags.writeable: self.__za = np.array(self.__za)   #Memory mapped: make a private copy
+            self.__za[iy, jx] = z
         return self.im.putpixel((jx, iy), z)
 
 
+    def thanArray(self):
+        """Return the pixels of the DEM as a NumPy array of nyrows x nxcols.
+
+        The array is made once, and it is made again only if self.im is replaced.
+        It must not be modified; use putpixel() or thanSetArray()."""
+        if self.__zaim is not self.im:
+            self.__za = None                  #Free memory before making the new array
+            self.__za = _im2array(self.im)
+            self.__zaim = self.im
+        return self.__za
+
+
+    def thanSetArray(self, za):
+        "Replace the pixels of the DEM with the NumPy array za (of the same shape)."
+        za = np.ascontiguousarray(za, dtype=self.thanArray().dtype)
+        self.im = Image.fromarray(za)
+        self.__za = za
+        self.__zaim = self.im
+
+
     def thanCentroidCompute(self):
         "Compute the centroid of all lines."
         self.thanCena = ((self.xymma[0]+self.xymma[2])*0.5,
@@ -160,7 +198,7 @@ class ThanDEMusgs(ThanDTMDEM):
 
     def than2Num(self, native=False, centroidundulation=True):  #The optional arguments are for compatibility with ThanDEMsrtm.than2Num
         "Return the DEM as a numpy array."
-        return p_gnum.im2num(self.im)
+        return self.thanArray().copy()
 
 
     def thanGetSize(self):
@@ -187,14 +225,15 @@ class ThanDEMusgs(ThanDTMDEM):
         iy = int(y)
 #        print "jx, iy=", jx, iy
         if jx < 0 or iy < 0 or jx >= self.nxcols-1 or iy >= self.nyrows-1: return None
-        z00 = self.getpixel(jx, iy)
+        za = self.thanArray()
+        z00 = za.item(iy, jx)
 #        print "z00=", z00
         if z00 == self.GDAL_NODATA: return None
-        z10 = self.getpixel(jx+1, iy)
+        z10 = za.item(iy, jx+1)
         if z10 == self.GDAL_NODATA: return None
-        z01 = self.getpixel(jx, iy+1)
+        z01 = za.item(iy+1, jx)
         if z01 == self.GDAL_NODATA: return None
-        z11 = self.getpixel(jx+1, iy+1)
+        z11 = za.item(iy+1, jx+1)
         if z11 == self.GDAL_NODATA: return None
         x -= jx
         y -= iy
@@ -202,6 +241,100 @@ class ThanDEMusgs(ThanDTMDEM):
         return z
 
 
+    def thanPointsZ(self, cc, native=False):
+        """Calculate the z coordinates of many points with bilinear interpolation.
+
+        cc is a NumPy array (or a sequence) of points x, y, ...; a NumPy array
+        is returned with NaN where z can not be computed (as None of thanPointZ())."""
+        cc = np.asarray(cc, dtype=float)
+        if cc.size == 0: return np.empty(0)
+        x = (cc[:, 0]-self.X0) / self.DX
+        y = (self.Y0-cc[:, 1]) / self.DY
+        jx = np.trunc(x)                  #As int() of thanPointZ()
+        iy = np.trunc(y)
+        inside = (jx >= 0) & (iy >= 0) & (jx < self.nxcols-1) & (iy < self.nyrows-1)
+        z = np.full(len(cc), np.nan)
+        x = x[inside]; y = y[inside]
+        jx = jx[inside].astype(np.intp)
+        iy = iy[inside].astype(np.intp)
+        za = self.thanArray()
+        z00 = za[iy, jx].astype(float)
+        z10 = za[iy, jx+1].astype(float)
+        z01 = za[iy+1, jx].astype(float)
+        z11 = za[iy+1, jx+1].astype(float)
+        x -= jx
+        y -= iy
+        zi = z00*(1-x)*(1-y) + z10*x*(1-y) + z01*(1-x)*y + z11*x*y
+        if self.GDAL_NODATA is not None:
+            nd = self.GDAL_NODATA
+            zi[(z00 == nd) | (z10 == nd) | (z01 == nd) | (z11 == nd)] = np.nan
+        z[inside] = zi
+        return z
+
+
+    def thanLinesZ(self, lines):
+        """Calculate the z coordinates along many lines at once; return a list of (ni, cn) as thanLineZ().
+
+        The intersections of all the lines with the DEM lines are found, and
+        the z of all of them (and of the vertices) is computed in one call of
+        thanPointsZ(). Unlike thanLineZ(), the z of each vertex is the z of the
+        DEM at the vertex (not interpolated from the nearest intersections)."""
+        C0 = self.X0, self.Y0-(self.nyrows-1)*self.DY
+        DC = self.DX, self.DY
+        nmax = self.nxcols, self.nyrows
+        keys = []
+        xys = []
+        for cp in lines:
+            a = np.array([c[:2] for c in cp], dtype=float).reshape(-1, 2)
+            if len(a) < 2:
+                keys.append(np.arange(len(a), dtype=float))
+                xys.append(a)
+                continue
+            ca = a[:-1]
+            d = a[1:] - ca
+            key = [np.arange(len(a), dtype=float)]   #Vertex i has key i; intersection with u of segment i has key i+u
+            xy = [a]
+            for i in range(2):
+                lo = np.clip(np.ceil((np.minimum(ca[:, i], a[1:, i])-C0[i]) / DC[i]), 0, nmax[i]-1)
+                hi = np.clip(np.floor((np.maximum(ca[:, i], a[1:, i])-C0[i]) / DC[i]), 0, nmax[i]-1)
+                n = np.where(d[:, i] != 0.0, np.maximum(hi-lo+1, 0), 0).astype(np.intp)
+                iseg = np.repeat(np.arange(len(ca)), n)
+                k = lo[iseg] + (np.arange(n.sum()) - np.repeat(np.cumsum(n)-n, n))
+                u = (C0[i] + k*DC[i] - ca[iseg, i]) / d[iseg, i]
+                ok = (u > 0.001) & (u < 0.999)           #Avoid points near the vertices
+                iseg = iseg[ok]; u = u[ok]
+                key.append(iseg + u)
+                xy.append(ca[iseg] + d[iseg]*u[:, np.newaxis])
+            key = np.concatenate(key)
+            xy = np.concatenate(xy)
+            isort = np.argsort(key, kind="stable")
+            key = key[isort]
+            xy = xy[isort]
+            d = np.abs(xy[1:]-xy[:-1]).sum(axis=1)           #Double intersections (at DEM nodes), as thanNear2()
+            v = (np.abs(xy[1:])+np.abs(xy[:-1])).sum(axis=1)*0.5
+            dup = np.where(v < thanThresholdx, d < thanThresholdx, d < v*thanThresholdx) & (key[1:] != np.floor(key[1:]))
+            keep = np.concatenate(([True], ~dup))
+            keys.append(key[keep])
+            xys.append(xy[keep])
+        nps = np.cumsum([len(xy) for xy in xys])
+        zs = np.split(self.thanPointsZ(np.concatenate(xys) if xys else np.empty((0, 2)), native=True), nps[:-1])
+
+        res = []
+        for cp, key, xy, z in zip(lines, keys, xys, zs):   #works for python2,3
+            if len(cp) < 1: res.append((-1, [])); continue
+            isvert = key == np.floor(key)
+            keep = isvert | ~np.isnan(z)                 #Intersections out of the DEM are omitted
+            key = key[keep]; z = z[keep]; isvert = isvert[keep]
+            cn = np.column_stack((xy[keep], z)).tolist()
+            for i, k in zip(np.flatnonzero(isvert).tolist(), key[isvert].astype(np.intp).tolist()):   #works for python2,3
+                z1 = cn[i][2]
+                c = cn[i] = list(cp[k])
+                c[2] = None if z1 != z1 else z1          #NaN to None
+            ni = interpolatez(cn)
+            res.append((ni, cn))
+        return res
+
+
     def thanPixelCoor(self, cp, native=False):
         "Return the pixel coordinates of the point."
         x = (cp[0]-self.X0) / self.DX
@@ -242,12 +375,16 @@ class ThanDEMusgs(ThanDTMDEM):
             #print "    ", jx2, iy2
             #print "validnodes, invalidnodes", validnodes, invalidnodes
             #print "GDAL_NODATA=", self.GDAL_NODATA
+        if jx2 <= jx1 or iy2 <= iy1: return
+        za = self.thanArray()
+        xx = (self.X0 + np.arange(jx1, jx2)*self.DX).tolist()
         for iy in range(iy1, iy2):
-            for jx in range(jx1, jx2):
-                h = self.getpixel(jx, iy)      #getpixel:  im.getpixel(xy)
-                x = self.X0 + jx*self.DX
-                y = self.Y0 - iy*self.DY
-                if h == self.GDAL_NODATA:
+            y = self.Y0 - iy*self.DY
+            row = za[iy, jx1:jx2]
+            if self.GDAL_NODATA is None: invalid = np.zeros(len(row), dtype=bool)
+            else:                        invalid = row == self.GDAL_NODATA
+            for x, h, inv in zip(xx, row.tolist(), invalid.tolist()):    #works for python2,3
+                if inv:
                     if invalidnodes: yield x, y, -10000.0
                 else:
                     if validnodes: yield x, y, h
@@ -267,7 +404,7 @@ class ThanDEMusgs(ThanDTMDEM):
             elif form == "l": nodata = -2**31
             else:             nodata = -340282346638528859811704183484516925440.0  #Hopefully none of the data has this value!
         #print "nodata=", nodata
-        dline = struct.pack("=cd", form, nodata)
+        dline = struct.pack("=cd", form.encode("ascii"), nodata)
         #print len(dline)
         fw.write(dline)
         dline = struct.pack("=ll", self.nxcols, self.nyrows)
@@ -276,20 +413,14 @@ class ThanDEMusgs(ThanDTMDEM):
         dline = struct.pack("=dddd", self.X0, self.Y0, self.DX, self.DY)
         #print len(dline)
         fw.write(dline)
-        jx1 = iy1 = 0
-        jx2 = self.nxcols
-        iy2 = self.nyrows
-        f = "="+str(self.nxcols)+form
-        for iy in range(iy1, iy2):
-            dline = [self.getpixel(jx, iy) for jx in range(jx1, jx2)]
-            dline = struct.pack(f, *dline)
-            fw.write(dline)
+        dt = {"h": np.int16, "i": np.int32, "l": np.int32, "f": np.float32, "d": np.float64}[form]  #Sizes of struct "="
+        fw.write(self.thanArray().astype(dt).tobytes())      #Native byte order, row by row
         fw.close()
 
 
     def thanIntersegZ(self, ca, cb, native=False):
         "Compute intersections of segment with DEM lines; don't sort intersections from ca to cb."
-        if thanNear2(ca, cb): return ()
+        if thanNear2(ca, cb): return []
         ca = tuple(ca)
         cb = tuple(cb)
         t = [cb[0]-ca[0], cb[1]-ca[1]]
@@ -305,8 +436,8 @@ class ThanDEMusgs(ThanDTMDEM):
         for i in range(2):
             j = (i+1) % 2
             if ca[i] > cb[i]: ca, cb = cb, ca; rev = not rev
-            if ca[i] >= self.xymma[2+i]: return ()
-            if cb[i] <= self.xymma[0+i]: return ()
+            if ca[i] >= self.xymma[2+i]: return []
+            if cb[i] <= self.xymma[0+i]: return []
             if not thanNearx(ca[i], cb[i]):
                 jx = int((ca[i]-C0[i]) / DC[i])
                 c[i] = max((C0[i] + jx * DC[i], self.xymma[0+i]))
@@ -331,11 +462,7 @@ class ThanDEMusgs(ThanDTMDEM):
         fw.write("DX, DY        :  %f  %f\n" % (self.DX, self.DY))
         fw.write("nxcols, nyrows:  %d  %d\n" % (self.nxcols, self.nyrows))
         fw.write("NODATA        :  %f\n" % (self.GDAL_NODATA,))
-        for iy in range(self.nyrows):
-            for jx in range(self.nxcols):
-                z = self.getpixel(jx, iy)
-                fw.write(" %f" % (z,))
-            fw.write("\n")
+        np.savetxt(fw, self.thanArray(), fmt=" %f", delimiter="")
         if p_ggen.isString(fn): fw.close()
 
 
@@ -470,18 +597,73 @@ class ThanDEMusgs(ThanDTMDEM):
 
     def createFromDem(self, dem, prt=p_ggen.doNothing):
         "Compute the z value of each grid point using another dem."
-        iy1, iy2 = 0, self.nyrows
-        jx1, jx2 = 0, self.nxcols
-        for iy in range(iy1, iy2):
+        iy2 = self.nyrows
+        za = self.thanArray().copy()
+        x = self.X0 + np.arange(self.nxcols)*self.DX
+        cc = np.column_stack((x, np.zeros_like(x), np.zeros_like(x)))
+        for iy in range(iy2):
             prt("%d/%d" % (iy, iy2))
-            for jx in range(jx1, jx2):
-                x = self.X0 + jx*self.DX
-                y = self.Y0 - iy*self.DY
-                hg = dem.thanPointZ((x, y, 0.0))
-                if hg is None:
-                    self.putpixel(jx, iy, self.GDAL_NODATA)
-                else:
-                    self.putpixel(jx, iy, hg)
+            cc[:, 1] = self.Y0 - iy*self.DY
+            hg = dem.thanPointsZ(cc)
+            za[iy] = np.where(np.isnan(hg), self.GDAL_NODATA if self.GDAL_NODATA is not None else np.nan, hg)
+        self.thanSetArray(za)
+
+
+def _im2array(im):
+    "Return the pixels of a PIL image as a (writable) NumPy array of rows x columns."
+    try:
+        return np.array(im)
+    except (TypeError, ValueError):
+        return np.array(p_gnum.im2num(im))
+
+
+_RAWDTYPES = {"L": "u1", "I;16": "<u2", "I;16B": ">u2", "I;16S": "<i2", "I;16BS": ">i2",
+    "I;32": "<u4", "I;32B": ">u4", "I;32S": "<i4", "I;32BS": ">i4",
+    "F;32F": "<f4", "F;32BF": ">f4", "F;64F": "<f8", "F;64BF": ">f8"}
+
+
+def _openMapped(filnam):
+    """Open a tif image without loading it, and memory map its pixels.
+
+    The image and the read only array of rows x columns are returned; if the
+    image can not be memory mapped, None, None is returned."""
+    try:
+        im = Image.open(filnam)
+    except (IOError, ValueError, RuntimeError, DecompressionBombError):
+        return None, None
+    za = _mapRaw(im, filnam)
+    if za is None or im.size[0] < 2 or im.size[1] < 2:
+        im.close()
+        return None, None
+    return im, za
+
+
+def _mapRaw(im, filnam):
+    """Return the pixels of an uncompressed image as a read only memory mapped NumPy array, or None.
+
+    This is possible only if the pixels are stored row by row in a single block
+    (a single or many contiguous strips), which is usual for DEM tifs."""
+    w, h = im.size
+    tiles = getattr(im, "tile", None)
+    if not tiles: return None
+    off0 = tiles[0][2]
+    rawmode = tiles[0][3][0]
+    dt = _RAWDTYPES.get(rawmode)
+    if dt is None: return None
+    rowsize = w * np.dtype(dt).itemsize
+    y = 0
+    for codec, extents, off, args in tiles:
+        if codec != "raw" or args[0] != rawmode: return None
+        if args[1] not in (0, rowsize): return None                      #Padded rows
+        if len(args) > 2 and args[2] != 1: return None                   #Bottom up rows
+        if extents[0] != 0 or extents[2] != w or extents[1] != y: return None
+        if off != off0 + y*rowsize: return None                          #Strips are not contiguous
+        y = extents[3]
+    if y != h: return None
+    try:
+        return np.memmap(filnam, dtype=dt, mode="r", offset=off0, shape=(h, w))
+    except (IOError, OSError, ValueError):
+        return None
 
 
 def prop(im, nodatadef=None):
@@ -1,13 +1,19 @@
 import datetime, pathlib
-from bisect import bisect_left, bisect_right
+from bisect import bisect_left
 from math import hypot, fabs
 from p_ggen import iterby2
 from p_gmath import thanSegSeguw
+from p_ggeom import Rtree
 from .dtmvar import ThanDTMDEM, _uniqint
 
 
 class ThanDTMlines(ThanDTMDEM):
-    "A set of lines which behaves as a Digital Terrain Model."
+    """A set of lines which behaves as a Digital Terrain Model.
+
+    The segments are indexed by an R-tree on their bounding rectangles, so
+    that the segments near a point are found in about O(log n) time, even
+    if many segments span the same x (for example contour lines). The R-tree
+    is built when it is first needed, and it is rebuilt if lines were added."""
 
     def __init__(self, dxmax=None, dext=None):
         "Initialize DEM."
@@ -22,6 +28,7 @@ class ThanDTMlines(ThanDTMDEM):
         self.thanCena = (0.0, 0.0, 0.0)  #Centroid of the area of the dtm
         self.thanNori = 0      #Number of original line segments (just for information)
         self.thanLines = []
+        self.__tree = None     #R-tree of the segments; it is built when it is needed
 
 
     def thanExportToPython(self, dtmname="dtm1", dir="."):
@@ -105,6 +112,17 @@ class ThanDTMlines(ThanDTMDEM):
         cmin[1] = min(c[1] for lin1 in self.thanLines for c in lin1)
         return cmin
 
+    def __index(self):
+        "Return the R-tree of the segments; build it if it does not exist or if segments were added."
+        if self.__tree is None or len(self.__tree) != len(self.thanLines):
+            self.__tree = Rtree(((min(ca[0], cb[0]), min(ca[1], cb[1]), max(ca[0], cb[0]), max(ca[1], cb[1])), (ca, cb))
+                                for ca, cb in self.thanLines)
+        return self.__tree
+
+    def thanBuildIndex(self):
+        "Build the R-tree of the segments now, for example before the DTM is pickled."
+        self.__index()
+
     def thanIntersegZ(self, ca, cb, native=False):
         "Compute intersections of segment with DEM lines; don't sort intersections from ca to cb."
         ca = tuple(ca)
@@ -113,14 +131,9 @@ class ThanDTMlines(ThanDTMDEM):
         rev = False
         if ca[0] > cb[0]: ca, cb = cb, ca; rev=True
 #        print "ca=", ca, "cb=", cb, "rev=", rev
-        i = bisect_left(self.thanLines, ((ca[0]-self.thanDxmax,), (-1.0e30,)))
-        j = bisect_right(self.thanLines, ((cb[0],),(+1.0e30,)))
-        #print("i=", i, "j=", j, "len=", len(self.thanLines))
-        #for ii in range(i, j):
-        #    print("thanlines", ii,":", self.thanLines[ii])
+        xymm = ca[0], min(ca[1], cb[1]), cb[0], max(ca[1], cb[1])
         cint = []
-        for k in range(i, j):
-            c1, c2 = self.thanLines[k]
+        for c1, c2 in self.__index().query(xymm):
             uw = thanSegSeguw(ca, cb, c1, c2)
             if uw is None: continue
             cd = [ca1+(cb1-ca1)*uw[1] for (ca1,cb1) in zip(c1, c2)]
@@ -49,6 +49,21 @@ class ThanDTMDEM(object):
         return ni, cn
 
 
+    def thanPointsZ(self, cc, native=False):
+        """Calculate the z coordinates of many points; return a NumPy array with NaN where z is unknown.
+
+        Subclasses which can, override this with a vectorized computation."""
+        import numpy as np
+        if native: zz = (self.thanPointZ(cp, native) for cp in cc)
+        else:      zz = (self.thanPointZ(cp) for cp in cc)   #Some DEMs (e.g. GDEM) do not accept native
+        return np.fromiter((np.nan if z is None else z for z in zz), dtype=float)
+
+
+    def thanLinesZ(self, lines):
+        "Calculate the z coordinates along many lines; return a list of (ni, cn) as thanLineZ()."
+        return [self.thanLineZ(cp) for cp in lines]
+
+
     def thanCentroidCompute(self):
         "Compute the centroid of all lines."
         self.thanCena = ((self.xymma[0]+self.xymma[2])*0.5,
@@ -177,6 +192,18 @@ def thanPointZ(dtms, cp):
     return z
 
 
+def thanPointsZ(dtms, cc):
+    "Calculate the z coordinates of many points when multiple DTMs/DEMs are available; NaN where z is unknown."
+    import numpy as np
+    cc = np.asarray(cc, dtype=float)
+    z = np.full(len(cc), np.nan)
+    for dtm in dtms:
+        unknown = np.flatnonzero(np.isnan(z))
+        if len(unknown) == 0: break
+        z[unknown] = dtm.thanPointsZ(cc[unknown])
+    return z
+
+
 def thanLineZ(dtms, cp):
         "Calculate the z coordinates along the line cp."
         dtms = tuple(dtms)
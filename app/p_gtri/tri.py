@@ -66,9 +66,26 @@ class ThanTri(object):
         self.clear()
 
 
+    @property
+    def ls(self):
+        "The links of each point; if the triangulation was made by makemesh(), they are built when first needed."
+        if self.mesh is not None:
+            self.__ls = self.mesh.links()
+            self.mesh = None                   # ls may be changed by the caller: the mesh is no longer valid
+        return self.__ls
+
+
+    @ls.setter
+    def ls(self, ls):
+        "Set new links; the array-backed mesh is discarded."
+        self.mesh = None
+        self.__ls = ls
+
+
     def clear(self):
         "Clear all triangles."
-        self.ls = {}
+        self.ls = {}             # This also discards the array-backed mesh (see makemesh())
+        self.brkfailed = []      # Break lines which makemesh() could not insert
         self.aa = {}             # point names; associates coordinates to name; for compatibility with .tri files
         self.xyapeira = set()    # infinite points
         self.ipref = 0           # Counter used to name unnamed points
@@ -109,12 +126,40 @@ class ThanTri(object):
         return True, ""
 
 
+    def makemesh(self, axy, brk=(), infinite=False):
+        """Make the (convex) triangulation with the array-backed engine, and insert the break lines.
+
+        brk is a sequence of segments ca, cb whose points (name, x, y, ...)
+        are in axy; they become edges of the triangulation. The segments which
+        could not be inserted are kept in self.brkfailed, so that the caller
+        can report them. The triangulation is kept in the arrays of the mesh;
+        the links (ls) are built only if some code needs them."""
+        from .trimesh import ThanTriMesh
+        self.clear()
+        self.xy = self.__uniq(axy)
+        if len(self.xy) < 3: return False, "At least 3 noncolinear points are needed"
+        if infinite:   self.apeira()
+        mesh = ThanTriMesh(self.xy, prt=self.prt)
+        del self.xy
+        if not mesh.triangulate(): return False, "At least 3 noncolinear points are needed"
+        for ca, cb in brk:
+            i = mesh.index(ca[1], ca[2])
+            j = mesh.index(cb[1], cb[2])
+            if i is None or j is None or not mesh.insertConstraint(i, j): self.brkfailed.append((ca, cb))
+        mesh.infinite = set(mesh.index(c[0], c[1]) for c in self.xyapeira)
+        mesh.infinite.discard(None)
+        self.mesh = mesh
+        self.namepoints()
+        return True, ""
+
+
     def namepoints(self):
         "Name all unnamed points; for compatibility with other programs and .tri, .trp files."
         pref = "tri"
         n = 10 - len(pref)
         form = "%s%%0%dd" % (pref, n)
-        for c1 in self.ls:
+        points = self.ls if self.mesh is None else self.mesh.vertices()
+        for c1 in points:
             a1 = self.aa.get(c1, None)
             if a1 is not None: continue
             self.ipref += 1
@@ -314,6 +359,9 @@ class ThanTri(object):
 
     def iteredges(self):
         "Iterate through the edges of the triangulation."
+        if self.mesh is not None:
+            for e in self.mesh.iteredges(): yield e
+            return
         a = (frozenset((j,k)) for j,ks in self.ls.items() for k in ks)
         a = frozenset(a)
         for jk in a:
@@ -322,6 +370,9 @@ class ThanTri(object):
 
     def itertriangles(self, apmax=50.0):
         "Iterate through the triangles of the triangulation."
+        if self.mesh is not None:
+            for tri in self.mesh.itertriangles(apmax): yield tri
+            return
         apMaxEn2 = apmax**2
         seen = set()
         for ca, linksa in self.ls.items():
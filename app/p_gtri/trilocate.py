@@ -1,3 +1,4 @@
+from math import sqrt
 from p_ggen import iterby2, doNothing
 from p_ggeom import TriLocal, MesaTri
 
@@ -56,7 +57,15 @@ class TriLocate(object):
 
 
 class GridIndex(object):
-    "An index to the grid."
+    """An index to the grid.
+
+    The size of the cells is computed from the number of triangles, so that
+    each cell holds about tripercell triangles on average, whatever the
+    density of the points (dense LiDAR or national scale DEMs, world or pixel
+    coordinates). The triangle which was found last is tested first, since
+    consecutive points (for example along a profile) usually fall in the same
+    triangle."""
+    tripercell = 2.0
 
     def __init__(self, xyz, tri, ispixel=False):
         "Creates an index grid for faster triangle location."
@@ -70,10 +79,13 @@ class GridIndex(object):
         ymax = max(c)
         dx = xmax - xmin
         dy = ymax - ymin
-        nx = int(dx/100.0)+1
-        ny = int(dy/100.0)+1
-        dx /= nx
-        dy /= ny
+        n = max(len(tri), 1)
+        if dx > 0.0 and dy > 0.0: d = sqrt(dx*dy*self.tripercell/n)
+        else:                     d = max(dx, dy, 1.0)*self.tripercell/n
+        nx = int(dx/d)+1
+        ny = int(dy/d)+1
+        dx = max(dx, d)/nx
+        dy = max(dy, d)/ny
         grind = {}
         for tri1 in tri:
             jss = [int((c[ix]-xmin)/dx) for c in tri1[:3]]
@@ -89,20 +101,90 @@ class GridIndex(object):
         self.xmax = xmax
         self.ymax = ymax
         self.grind = grind
+        self.trilast = None
+        self.__flat = None          #NumPy arrays of the grid, built when triFinds() is first called
 
 
     def triFind(self, x, y):
         "Find the triangle which point x,y belongs to."
         if self.ispixel: ix, iy = 3, 4
         else:            ix, iy = 0, 1
+        tri1 = self.trilast
+        if tri1 is not None:
+            mes  = MesaTri((tri1[0][ix], tri1[0][iy]), (tri1[1][ix], tri1[1][iy]), (tri1[2][ix], tri1[2][iy]))
+            if mes.mesa((x, y)): return tri1
         j = int((x-self.xmin)/self.dx)
         i = int((y-self.ymin)/self.dy)
         for tri1 in self.grind.get((i,j), []):
             mes  = MesaTri((tri1[0][ix], tri1[0][iy]), (tri1[1][ix], tri1[1][iy]), (tri1[2][ix], tri1[2][iy]))
-            if mes.mesa((x, y)): return tri1
+            if mes.mesa((x, y)):
+                self.trilast = tri1
+                return tri1
         return None
 
 
+    def triFinds(self, xy):
+        """Find the triangles which many points (x, y) belong to; None for the points outside the triangles.
+
+        The points are binned into the cells of the grid, and each point is
+        tested against the candidate triangles of its cell, all at once, with
+        the same area test as MesaTri."""
+        import numpy as np
+        xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+        res = [None]*len(xy)
+        k = np.nonzero(np.isfinite(xy).all(axis=1))[0]
+        if len(k) == 0 or len(self.grind) == 0: return res
+        start, celltri, ni, nj, xm, ym, ymin, emp = self.__flatGrid()
+        i = np.trunc((xy[k, 1]-self.ymin)/self.dy).astype(int)     #trunc() as int() in triFind()
+        j = np.trunc((xy[k, 0]-self.xmin)/self.dx).astype(int)
+        ok = (i >= 0) & (i < ni) & (j >= 0) & (j < nj)
+        k, cell = k[ok], i[ok]*nj + j[ok]
+        first = start[cell]
+        ncand = start[cell+1] - first
+        pt = np.repeat(k, ncand)                                    #Pairs of point, candidate triangle
+        ntot = np.cumsum(ncand)
+        t = celltri[np.repeat(first - ntot + ncand, ncand) + np.arange(ncand.sum())]
+        x = xy[pt, 0]
+        y = xy[pt, 1] - ymin[t]
+        xm1, xm2, xm3 = xm[t, 0], xm[t, 1], xm[t, 2]
+        ym1, ym2, ym3 = ym[t, 0], ym[t, 1], ym[t, 2]
+        e  = np.fabs((xm2-x)*(ym2+y) + (xm3-xm2)*(ym3+ym2) + (x-xm3)*(y+ym3))
+        e += np.fabs((x-xm1)*(y+ym1) + (xm3-x)*(ym3+y) + (xm1-xm3)*(ym1+ym3))
+        e += np.fabs((xm2-xm1)*(ym2+ym1) + (x-xm2)*(y+ym2) + (xm1-x)*(ym1+y))
+        inside = (y >= 0.0) & ~(e-emp[t] > 0.001)                  #Same tolerance as MesaTri
+        pt, t = pt[inside], t[inside]
+        first = np.ones(len(pt), dtype=bool)                        #The first candidate triangle of each point, as triFind()
+        first[1:] = pt[1:] != pt[:-1]
+        tri = self.tri
+        for kk, it in zip(pt[first].tolist(), t[first].tolist()): res[kk] = tri[it]
+        return res
+
+
+    def __flatGrid(self):
+        "Return (and build once) the grid and the triangles as NumPy arrays, for triFinds()."
+        if self.__flat is not None: return self.__flat
+        import numpy as np
+        if self.ispixel: ix, iy = 3, 4
+        else:            ix, iy = 0, 1
+        ni = max(i for i, j in self.grind) + 1
+        nj = max(j for i, j in self.grind) + 1
+        itri = dict((id(tri1), it) for it, tri1 in enumerate(self.tri))
+        ncand = np.zeros(ni*nj+1, dtype=int)
+        celltri = []
+        for (i, j), cand in sorted(self.grind.items()):             #Sorted as the linear cell number i*nj+j
+            ncand[i*nj+j+1] = len(cand)
+            celltri.extend(itri[id(tri1)] for tri1 in cand)
+        start = np.cumsum(ncand)
+        v = np.array([[(c[ix], c[iy]) for c in tri1[:3]] for tri1 in self.tri], dtype=float).reshape(-1, 3, 2)
+        ymin = v[:, :, 1].min(axis=1)
+        xm = v[:, :, 0]
+        ym = v[:, :, 1] - ymin[:, None]
+        emp = np.fabs((xm[:, 1]-xm[:, 0])*(ym[:, 1]+ym[:, 0]) + (xm[:, 2]-xm[:, 1])*(ym[:, 2]+ym[:, 1]) +
+                      (xm[:, 0]-xm[:, 2])*(ym[:, 0]+ym[:, 2]))
+        self.__flat = start, np.array(celltri, dtype=int), ni, nj, xm, ym, ymin, emp
+        return self.__flat
+
+
     def triFindBrute(self, x, y):
         "Finds which triangle point x, y belongs to (brute force approach)."
         if self.ispixel: ix, iy = 3, 4
@@ -151,3 +233,45 @@ class GridIndex(object):
         return (tra.interp(tri1[0][0], tri1[1][0], tri1[2][0], l1, l2, l3),
                 tra.interp(tri1[0][1], tri1[1][1], tri1[2][1], l1, l2, l3),
                )
+
+
+    def zs(self, xy, tris=None):
+        "Finds the z of many points (x, y); return a NumPy array with NaN for the points outside the triangles."
+        return self.__interps(xy, tris, (2,))[0]
+
+
+    def pixels(self, xy, tris=None):
+        "Finds the pixel coordinates of many points (x, y); return 2 NumPy arrays with NaN for the points outside the triangles."
+        return self.__interps(xy, tris, (3, 4))
+
+
+    def worlds(self, xy, tris=None):
+        "Finds the world coordinates of many points (x, y); return 2 NumPy arrays with NaN for the points outside the triangles."
+        return self.__interps(xy, tris, (0, 1))
+
+
+    def __interps(self, xy, tris, ias):
+        "Interpolate the values ias of the vertices of the triangles tris (found if None) at many points xy."
+        import numpy as np
+        xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+        if tris is None: tris = self.triFinds(xy)
+        res = [np.full(len(xy), np.nan) for ia in ias]
+        k = np.array([i for i, tri1 in enumerate(tris) if tri1 is not None], dtype=int)
+        if len(k) == 0: return res
+        v = np.array([tris[i] for i in k], dtype=float)     #Shape (n, 3 vertices, 5 values)
+        if self.ispixel: ix, iy = 3, 4
+        else:            ix, iy = 0, 1
+        x1x3 = v[:, 0, ix] - v[:, 2, ix]                    #Same formulas as TriLocal
+        y1y3 = v[:, 0, iy] - v[:, 2, iy]
+        x2x3 = v[:, 1, ix] - v[:, 2, ix]
+        y2y3 = v[:, 1, iy] - v[:, 2, iy]
+        d1 = np.maximum.reduce([np.fabs(x1x3), np.fabs(y1y3), np.fabs(x2x3), np.fabs(y2y3)])
+        dd = (x1x3*y2y3/d1 - y1y3*x2x3/d1) * d1
+        xx3 = xy[k, 0] - v[:, 2, ix]
+        yy3 = xy[k, 1] - v[:, 2, iy]
+        l1 = xx3*y2y3/dd - yy3*x2x3/dd
+        l2 = x1x3*yy3/dd - y1y3*xx3/dd
+        l3 = 1.0 - l1 - l2
+        for r, ia in zip(res, ias):   #works for python2,3
+            r[k] = l1*v[:, 0, ia] + l2*v[:, 1, ia] + l3*v[:, 2, ia]
+        return res
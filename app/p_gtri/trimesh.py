@@ -0,0 +1,669 @@
+"""\
+This module defines an array-backed Delaunay triangulation engine.
+
+The vertices are stored in arrays of floats and the triangles in integer
+arrays of half-edges: half-edge e belongs to triangle e//3, it starts at
+vertex tris[e] and it ends at vertex tris[next(e)]; twin[e] is the opposite
+half-edge of the neighbouring triangle, or -1 if e is on the convex hull.
+This needs a few tens of bytes per point, instead of the dictionaries of
+ThanLinks sets of ThanTri, so that millions of points can be triangulated.
+
+The triangulation is computed with a sweep-hull algorithm (points are sorted
+by distance from a seed circumcentre, the hull is kept in a linked list with
+a hash for fast lookup, and illegal edges are flipped). The orientation and
+incircle tests are robust: a floating point filter is used, and when the
+result is uncertain the test is repeated with exact rational arithmetic.
+
+Constrained edges (break lines) are inserted natively by flipping the edges
+which cross them; if a break line crosses another break line, a new vertex is
+inserted at the intersection, whose coordinates (z etc.) are interpolated
+along the break line being inserted.
+"""
+from array import array
+from collections import deque
+from fractions import Fraction
+from math import sqrt, ceil, atan2
+import numpy as np
+from p_gmath import dpt
+
+_EPS = 2.0**-53
+_CCWERRBOUND = (3.0 + 16.0*_EPS) * _EPS
+_ICCERRBOUND = (10.0 + 96.0*_EPS) * _EPS
+
+
+def orient2d(ax, ay, bx, by, cx, cy):
+    """Return a positive value if a, b, c are counterclockwise, negative if clockwise and 0 if colinear.
+
+    The sign is always correct (exact arithmetic is used if needed)."""
+    detleft = (bx-ax) * (cy-ay)
+    detright = (by-ay) * (cx-ax)
+    det = detleft - detright
+    if abs(det) >= _CCWERRBOUND * (abs(detleft) + abs(detright)): return det
+    ax, ay = Fraction(ax), Fraction(ay)
+    det = (Fraction(bx)-ax) * (Fraction(cy)-ay) - (Fraction(by)-ay) * (Fraction(cx)-ax)
+    return float(det)
+
+
+def incircle(ax, ay, bx, by, cx, cy, dx, dy):
+    """Return a positive value if d is inside the circle through counterclockwise a, b, c; 0 if on it.
+
+    If a, b, c are clockwise, the sign is reversed. The sign is always correct
+    (exact arithmetic is used if needed)."""
+    adx = ax-dx; ady = ay-dy
+    bdx = bx-dx; bdy = by-dy
+    cdx = cx-dx; cdy = cy-dy
+    alift = adx*adx + ady*ady
+    blift = bdx*bdx + bdy*bdy
+    clift = cdx*cdx + cdy*cdy
+    bc = bdx*cdy - cdx*bdy
+    ca = cdx*ady - adx*cdy
+    ab = adx*bdy - bdx*ady
+    det = alift*bc + blift*ca + clift*ab
+    permanent = (abs(bdx*cdy) + abs(cdx*bdy)) * alift + \
+                (abs(cdx*ady) + abs(adx*cdy)) * blift + \
+                (abs(adx*bdy) + abs(bdx*ady)) * clift
+    if abs(det) > _ICCERRBOUND * permanent: return det
+    dx, dy = Fraction(dx), Fraction(dy)
+    adx = Fraction(ax)-dx; ady = Fraction(ay)-dy
+    bdx = Fraction(bx)-dx; bdy = Fraction(by)-dy
+    cdx = Fraction(cx)-dx; cdy = Fraction(cy)-dy
+    det = (adx*adx + ady*ady) * (bdx*cdy - cdx*bdy) + \
+          (bdx*bdx + bdy*bdy) * (cdx*ady - adx*cdy) + \
+          (cdx*cdx + cdy*cdy) * (adx*bdy - bdx*ady)
+    return float(det)
+
+
+def _next(e):
+    "Return the next half-edge of the same triangle."
+    return e - 2 if e % 3 == 2 else e + 1
+
+
+def _prev(e):
+    "Return the previous half-edge of the same triangle."
+    return e + 2 if e % 3 == 0 else e - 1
+
+
+class ThanTriMesh(object):
+    "An array-backed constrained Delaunay triangulation."
+
+    def __init__(self, cc, names=None, prt=None):
+        """Store the points; cc is a sequence (or NumPy array) of x, y, [z, ...] coordinates.
+
+        Points with the same x, y are stored once (the first one is kept).
+        names is an optional sequence of the names of the points."""
+        cc = np.asarray(cc, dtype=float)
+        if cc.ndim != 2 or cc.shape[1] < 2: raise ValueError("At least x, y coordinates are needed")
+        _, iu = np.unique(cc[:, :2], axis=0, return_index=True)
+        iu.sort()
+        cc = cc[iu]
+        self.xs = array("d", cc[:, 0])
+        self.ys = array("d", cc[:, 1])
+        self.rest = [array("d", cc[:, k]) for k in range(2, cc.shape[1])]   # z and higher coordinates
+        self.names = None if names is None else [names[i] for i in iu]
+        self.infinite = set()             # Vertices which are not real points (see ThanTri.apeira())
+        self.tris = array("l")
+        self.twin = array("l")
+        self.vstart = None                # A half-edge which starts at each vertex
+        self.hulltri = None               # Hull structures; used only during triangulation
+        self.constrained = set()          # Constrained edges as (i, j) with i < j
+        self.__index = None
+        self.prt = prt
+
+
+    def __len__(self):
+        "Return the number of vertices."
+        return len(self.xs)
+
+
+    def coords(self, i):
+        "Return the coordinates of vertex i as a tuple."
+        return (self.xs[i], self.ys[i]) + tuple(r[i] for r in self.rest)
+
+
+    def index(self, x, y):
+        "Return the vertex with coordinates x, y, or None."
+        if self.__index is None:
+            self.__index = dict(((x1, y1), i) for i, (x1, y1) in enumerate(zip(self.xs, self.ys)))  #works for python2,3
+        return self.__index.get((x, y))
+
+
+    def ntriangles(self):
+        "Return the number of triangles."
+        return len(self.tris) // 3
+
+#===========================================================================
+
+    def triangulate(self):
+        "Compute the Delaunay triangulation; return False if all points are colinear."
+        xs, ys = self.xs, self.ys
+        n = len(xs)
+        if n < 3: return False
+        axy = np.column_stack((np.frombuffer(xs, dtype=float), np.frombuffer(ys, dtype=float)))
+        cx, cy = (axy.min(axis=0) + axy.max(axis=0)) * 0.5
+
+#-------Seed triangle: point nearest to the centre, its nearest point, and the smallest circumcircle
+
+        d = (axy[:, 0]-cx)**2 + (axy[:, 1]-cy)**2
+        i0 = int(d.argmin())
+        d = (axy[:, 0]-xs[i0])**2 + (axy[:, 1]-ys[i0])**2
+        d[i0] = np.inf
+        i1 = int(d.argmin())
+        r = _circumradius2(xs[i0], ys[i0], xs[i1], ys[i1], axy[:, 0], axy[:, 1])
+        r[i0] = r[i1] = np.inf
+        i2 = int(r.argmin())
+        if not np.isfinite(r[i2]): return False   # All points are colinear
+        if orient2d(xs[i0], ys[i0], xs[i1], ys[i1], xs[i2], ys[i2]) > 0: i1, i2 = i2, i1
+        cx, cy = _circumcentre(xs[i0], ys[i0], xs[i1], ys[i1], xs[i2], ys[i2])
+        ids = np.argsort((axy[:, 0]-cx)**2 + (axy[:, 1]-cy)**2, kind="stable").tolist()
+        del axy, d, r
+
+#-------Hull as a linked list with a hash of the pseudo-angle from the centre
+
+        self.tris = array("l", [0]) * max(2*n-5, 1)*3
+        self.twin = array("l", [-1]) * max(2*n-5, 1)*3
+        self.ntri = 0
+        hashsize = int(ceil(sqrt(n)))
+        def hashkey(x, y):
+            "Return the hash of the pseudo-angle of x, y with respect to the centre."
+            dx = x - cx; dy = y - cy
+            s = abs(dx) + abs(dy)
+            p = dx / s if s > 0.0 else 0.0
+            p = (3.0 - p if dy > 0.0 else 1.0 + p) / 4.0
+            return int(p * hashsize) % hashsize
+        self.hullprev = hprev = array("l", [0]) * n
+        self.hullnext = hnext = array("l", [0]) * n
+        self.hulltri = htri = array("l", [0]) * n
+        hhash = array("l", [-1]) * hashsize
+        self.hullstart = i0
+        hnext[i0] = hprev[i2] = i1
+        hnext[i1] = hprev[i0] = i2
+        hnext[i2] = hprev[i1] = i0
+        htri[i0] = 0; htri[i1] = 1; htri[i2] = 2
+        hhash[hashkey(xs[i0], ys[i0])] = i0
+        hhash[hashkey(xs[i1], ys[i1])] = i1
+        hhash[hashkey(xs[i2], ys[i2])] = i2
+        self.__addTriangle(i0, i1, i2, -1, -1, -1)
+
+        legalize = self.__legalize
+        addtri = self.__addTriangle
+        for i in ids:
+            if i == i0 or i == i1 or i == i2: continue
+            x = xs[i]; y = ys[i]
+
+#-----------Find a visible edge on the hull using the hash
+
+            key = hashkey(x, y)
+            for j in range(hashsize):
+                start = hhash[(key+j) % hashsize]
+                if start != -1 and start != hnext[start]: break
+            start = hprev[start]
+            e = start
+            while True:
+                q = hnext[e]
+                if orient2d(x, y, xs[e], ys[e], xs[q], ys[q]) > 0: break
+                e = q
+                if e == start: e = -1; break
+            if e == -1: continue          # Point inside the hull because of roundoff; it can not be added
+
+#-----------Add the first triangle from the point, and walk forward/backward through the hull
+
+            t = addtri(e, i, hnext[e], -1, -1, htri[e])
+            htri[i] = legalize(t+2)
+            htri[e] = t
+            nn = hnext[e]
+            while True:
+                q = hnext[nn]
+                if orient2d(x, y, xs[nn], ys[nn], xs[q], ys[q]) <= 0: break
+                t = addtri(nn, i, q, htri[i], -1, htri[nn])
+                htri[i] = legalize(t+2)
+                hnext[nn] = nn            # Mark as removed
+                nn = q
+            if e == start:
+                while True:
+                    q = hprev[e]
+                    if orient2d(x, y, xs[q], ys[q], xs[e], ys[e]) <= 0: break
+                    t = addtri(q, i, e, -1, htri[e], htri[q])
+                    legalize(t+2)
+                    htri[q] = t
+                    hnext[e] = e          # Mark as removed
+                    e = q
+
+            self.hullstart = hprev[i] = e
+            hnext[e] = hprev[nn] = i
+            hnext[i] = nn
+            hhash[hashkey(x, y)] = i
+            hhash[hashkey(xs[e], ys[e])] = e
+
+        del self.tris[self.ntri:], self.twin[self.ntri:]
+        self.__makeVstart()
+        return True
+
+
+    def __addTriangle(self, i0, i1, i2, a, b, c):
+        "Add a new triangle with vertices i0, i1, i2 and twins a, b, c of its half-edges."
+        t = self.ntri
+        tris = self.tris
+        if t+3 > len(tris):
+            tris.extend((0, 0, 0))
+            self.twin.extend((-1, -1, -1))
+        tris[t] = i0; tris[t+1] = i1; tris[t+2] = i2
+        self.__link(t, a)
+        self.__link(t+1, b)
+        self.__link(t+2, c)
+        self.ntri = t + 3
+        return t
+
+
+    def __link(self, a, b):
+        "Make half-edges a and b twins."
+        self.twin[a] = b
+        if b != -1: self.twin[b] = a
+
+
+    def __legalize(self, a):
+        "Flip half-edge a and the half-edges which become illegal, recursively; return the last third half-edge."
+        tris, twin, xs, ys = self.tris, self.twin, self.xs, self.ys
+        constrained = self.constrained
+        stack = []
+        while True:
+            b = twin[a]
+            a0 = a - a % 3
+            ar = a0 + (a+2) % 3
+            if b == -1 or (constrained and _key(tris[a], tris[b]) in constrained):
+                if not stack: break
+                a = stack.pop()
+                continue
+            b0 = b - b % 3
+            al = a0 + (a+1) % 3
+            bl = b0 + (b+2) % 3
+            p0 = tris[ar]; pr = tris[a]; pl = tris[al]; p1 = tris[bl]
+            x1 = xs[p1]; y1 = ys[p1]           # Inline filter of incircle(); it is the bottleneck
+            adx = xs[p0]-x1; ady = ys[p0]-y1
+            bdx = xs[pr]-x1; bdy = ys[pr]-y1
+            cdx = xs[pl]-x1; cdy = ys[pl]-y1
+            alift = adx*adx + ady*ady
+            blift = bdx*bdx + bdy*bdy
+            clift = cdx*cdx + cdy*cdy
+            t1 = bdx*cdy; t2 = cdx*bdy; t3 = cdx*ady; t4 = adx*cdy; t5 = adx*bdy; t6 = bdx*ady
+            det = alift*(t1-t2) + blift*(t3-t4) + clift*(t5-t6)
+            if abs(det) <= _ICCERRBOUND * ((abs(t1)+abs(t2))*alift + (abs(t3)+abs(t4))*blift + (abs(t5)+abs(t6))*clift):
+                det = incircle(xs[p0], ys[p0], xs[pr], ys[pr], xs[pl], ys[pl], x1, y1)
+            if det < 0.0:
+                tris[a] = p1                   # Inline __flip()
+                tris[b] = p0
+                hbl = twin[bl]
+                if hbl == -1 and self.hulltri is not None:   # Edge swapped on the hull: fix the hull reference
+                    self.__fixHull(bl, a)
+                twin[a] = hbl
+                if hbl != -1: twin[hbl] = a
+                har = twin[ar]
+                twin[b] = har
+                if har != -1: twin[har] = b
+                twin[ar] = bl
+                twin[bl] = ar
+                vs = self.vstart
+                if vs is not None:
+                    for e in (a0, a0+1, a0+2, b0, b0+1, b0+2): vs[tris[e]] = e
+                stack.append(b0 + (b+1) % 3)
+            else:
+                if not stack: break
+                a = stack.pop()
+        return ar
+
+
+    def __flip(self, a):
+        "Flip the diagonal of the quadrilateral of the triangles of half-edge a and its twin."
+        tris, twin = self.tris, self.twin
+        b = twin[a]
+        a0 = a - a % 3
+        b0 = b - b % 3
+        ar = a0 + (a+2) % 3
+        bl = b0 + (b+2) % 3
+        tris[a] = tris[bl]
+        tris[b] = tris[ar]
+        hbl = twin[bl]
+        if hbl == -1 and self.hulltri is not None:   # Edge swapped on the hull: fix the hull reference
+            self.__fixHull(bl, a)
+        self.__link(a, hbl)
+        self.__link(b, twin[ar])
+        self.__link(ar, bl)
+        vs = self.vstart
+        if vs is not None:
+            for e in (a0, a0+1, a0+2, b0, b0+1, b0+2): vs[tris[e]] = e
+
+
+    def __fixHull(self, eold, enew):
+        "Replace the reference of the hull to half-edge eold with enew."
+        e = self.hullstart
+        while True:
+            if self.hulltri[e] == eold: self.hulltri[e] = enew; break
+            e = self.hullprev[e]
+            if e == self.hullstart: break
+
+
+    def __makeVstart(self):
+        "Find a half-edge which starts at each vertex; hull half-edges are preferred."
+        self.vstart = vs = array("l", [-1]) * len(self.xs)
+        tris, twin = self.tris, self.twin
+        for e in range(len(tris)):
+            if vs[tris[e]] == -1 or twin[_prev(e)] == -1: vs[tris[e]] = e
+        self.hullprev = self.hullnext = self.hulltri = self.__index = None
+
+#===========================================================================
+
+    def outedges(self, v):
+        "Yield the half-edges which start at vertex v."
+        e0 = self.vstart[v]
+        if e0 == -1: return
+        twin = self.twin
+        e = e0
+        while True:
+            yield e
+            e = twin[_prev(e)]
+            if e == -1: break
+            if e == e0: return
+        e = twin[e0]                    # Hull reached: rotate the other way
+        while e != -1:
+            e = _next(e)
+            yield e
+            e = twin[e]
+
+
+    def neighbours(self, v):
+        "Return the vertices linked to vertex v."
+        tris = self.tris
+        res = []
+        for e in self.outedges(v):
+            res.append(tris[_next(e)])
+            if self.twin[_prev(e)] == -1: res.append(tris[_prev(e)])   # Last edge at the hull
+        return res
+
+
+    def findedge(self, u, v):
+        "Return the half-edge from u to v, or -1 if u, v are not linked."
+        tris = self.tris
+        for e in self.outedges(u):
+            if tris[_next(e)] == v: return e
+        return -1
+
+#===========================================================================
+
+    def insertConstraint(self, a, b):
+        """Make a-b an edge of the triangulation that is not flipped afterwards.
+
+        Return False if a-b (or a part of it) could not be inserted; the
+        triangulation is still valid, but a-b is not an edge of it."""
+        ok = True
+        todo = [(a, b)]
+        while todo:
+            a, b = todo.pop()
+            if a == b: continue
+            if self.findedge(a, b) != -1 or self.findedge(b, a) != -1:
+                self.constrained.add(_key(a, b))
+                continue
+            res = self.__crossings(a, b)
+            if res is None: ok = False; continue
+            crossed, v = res
+            if v is not None:           # Vertex v lies on the segment, or splits a crossed constrained edge
+                todo.append((v, b))
+                todo.append((a, v))
+                continue
+            if not self.__removeCrossings(a, b, crossed): ok = False
+        return ok
+
+
+    def __crossings(self, a, b):
+        """Find the edges crossed by segment a-b, as pairs of vertices.
+
+        If the segment passes through a vertex v, or crosses a constrained
+        edge (where a new vertex v is inserted), return the edges crossed up to
+        v and v; else return all the edges crossed and None."""
+        tris, twin, xs, ys = self.tris, self.twin, self.xs, self.ys
+        ax, ay, bx, by = xs[a], ys[a], xs[b], ys[b]
+        for e in self.outedges(a):
+            p = tris[_next(e)]; q = tris[_prev(e)]
+            op = orient2d(ax, ay, bx, by, xs[p], ys[p])
+            oq = orient2d(ax, ay, bx, by, xs[q], ys[q])
+            if op == 0.0 and (xs[p]-ax)*(bx-ax) + (ys[p]-ay)*(by-ay) > 0.0: return [], p
+            if oq == 0.0 and (xs[q]-ax)*(bx-ax) + (ys[q]-ay)*(by-ay) > 0.0: return [], q
+            if not (op < 0.0 < oq or oq < 0.0 < op): continue
+            o1 = orient2d(xs[p], ys[p], xs[q], ys[q], ax, ay)       # The triangle towards b, not away from b
+            o2 = orient2d(xs[p], ys[p], xs[q], ys[q], bx, by)
+            if o1 < 0.0 < o2 or o2 < 0.0 < o1: break
+        else:
+            if self.prt is not None: self.prt("Break line %d-%d is outside of the triangulation." % (a, b))
+            return None
+        crossed = []
+        e = _next(e)                     # Edge p-q opposite to a
+        while True:
+            p = tris[e]; q = tris[_next(e)]
+            if _key(p, q) in self.constrained:
+                return crossed, self.__splitConstrained(e, a, b)
+            crossed.append((p, q))
+            t = twin[e]
+            if t == -1:
+                if self.prt is not None: self.prt("Hit boundary of triangulation.")
+                return None
+            r = tris[_prev(t)]
+            if r == b: return crossed, None
+            orr = orient2d(ax, ay, bx, by, xs[r], ys[r])
+            if orr == 0.0: return crossed, r
+            op = orient2d(ax, ay, bx, by, xs[p], ys[p])
+            if (orr < 0.0) == (op < 0.0): e = _prev(t)   # Crosses r-q
+            else:                         e = _next(t)   # Crosses p-r
+
+
+    def __splitConstrained(self, e, a, b):
+        "Insert a new vertex where segment a-b crosses constrained half-edge e; return the new vertex."
+        tris, xs, ys = self.tris, self.xs, self.ys
+        p = tris[e]; q = tris[_next(e)]
+        oa = orient2d(xs[p], ys[p], xs[q], ys[q], xs[a], ys[a])
+        ob = orient2d(xs[p], ys[p], xs[q], ys[q], xs[b], ys[b])
+        u = oa / (oa-ob)                # a, b are on opposite sides of p-q
+        x = xs[a] + (xs[b]-xs[a])*u
+        y = ys[a] + (ys[b]-ys[a])*u
+        r = tris[_prev(e)]
+        bad = orient2d(x, y, xs[q], ys[q], xs[r], ys[r]) >= 0.0 or orient2d(xs[p], ys[p], x, y, xs[r], ys[r]) >= 0.0
+        if not bad and self.twin[e] != -1:
+            s = tris[_prev(self.twin[e])]
+            bad = orient2d(x, y, xs[p], ys[p], xs[s], ys[s]) >= 0.0 or orient2d(xs[q], ys[q], x, y, xs[s], ys[s]) >= 0.0
+        if bad:                         # The intersection is (numerically) p or q
+            return p if (x-xs[p])**2+(y-ys[p])**2 < (x-xs[q])**2+(y-ys[q])**2 else q
+        v = len(xs)
+        xs.append(x)
+        ys.append(y)
+        for r in self.rest: r.append(r[a] + (r[b]-r[a])*u)
+        if self.names is not None: self.names.append(None)
+        self.vstart.append(-1)
+        self.__index = None
+        self.constrained.discard(_key(p, q))
+        self.__splitEdge(e, v)
+        self.constrained.add(_key(p, v))
+        self.constrained.add(_key(v, q))
+        return v
+
+
+    def __splitEdge(self, e, v):
+        "Split half-edge e (and its twin) at the new vertex v and legalize the new triangles."
+        tris, twin = self.tris, self.twin
+        self.ntri = len(tris)
+        t = twin[e]
+        p = tris[e]; q = tris[_next(e)]; r = tris[_prev(e)]
+        en, ep = _next(e), _prev(e)
+        tris[e] = v                                        # Triangle (v, q, r) replaces (p, q, r)
+        t1 = self.__addTriangle(p, v, r, -1, -1, twin[ep])  # Triangle (p, v, r)
+        self.__link(ep, t1+1)                              # r-v with v-r
+        if t == -1:
+            self.__link(e, -1)
+        else:
+            s = tris[_prev(t)]
+            tn, tp = _next(t), _prev(t)
+            tris[t] = v                                    # Triangle (v, p, s) replaces (q, p, s)
+            t2 = self.__addTriangle(q, v, s, -1, -1, twin[tp])  # Triangle (q, v, s)
+            self.__link(tp, t2+1)
+            self.__link(t1, t)                             # p-v with v-p
+            self.__link(e, t2)                             # v-q with q-v
+        if t == -1: self.__link(t1, -1)
+        vs = self.vstart
+        for k in range(self.ntri-6 if t != -1 else self.ntri-3, self.ntri):
+            vs[tris[k]] = k
+        for k in (e, en, ep) + ((t, tn, tp) if t != -1 else ()): vs[tris[k]] = k
+        for k in (en, t1+2) + ((tn, t2+2) if t != -1 else ()):
+            self.__legalize(k)
+
+
+    def __removeCrossings(self, a, b, crossed):
+        """Flip the crossed edges until a-b is an edge, and restore the Delaunay property of the new edges.
+
+        Return False if a-b could not be made an edge."""
+        xs, ys, tris = self.xs, self.ys, self.tris
+        ax, ay, bx, by = xs[a], ys[a], xs[b], ys[b]
+        crossed = deque(crossed)
+        newedges = []
+        n = 0
+        while crossed:
+            p, q = crossed.popleft()
+            e = self.findedge(p, q)
+            r1 = tris[_prev(e)]
+            r2 = tris[_prev(self.twin[e])]
+            o1 = orient2d(xs[r1], ys[r1], xs[r2], ys[r2], xs[p], ys[p])
+            o2 = orient2d(xs[r1], ys[r1], xs[r2], ys[r2], xs[q], ys[q])
+            if not (o1 < 0.0 < o2 or o2 < 0.0 < o1):   # Non convex quadrilateral: try later
+                crossed.append((p, q))
+                n += 1
+                if n > 2*len(crossed)+10:
+                    if self.prt is not None: self.prt("Break line %d-%d could not be inserted." % (a, b))
+                    self.__restore(newedges + list(crossed))
+                    return False
+                continue
+            n = 0
+            self.__flip(e)
+            o1 = orient2d(ax, ay, bx, by, xs[r1], ys[r1])
+            o2 = orient2d(ax, ay, bx, by, xs[r2], ys[r2])
+            if (o1 < 0.0 < o2 or o2 < 0.0 < o1) and r1 != a and r1 != b and r2 != a and r2 != b:
+                crossed.append((r1, r2))
+            else:
+                newedges.append((r1, r2))
+        self.constrained.add(_key(a, b))
+        self.__restore(newedges)
+        return True
+
+
+    def __restore(self, edges):
+        "Flip the edges (pairs of vertices) which are not locally Delaunay, and the edges which become so."
+        xs, ys, tris, twin = self.xs, self.ys, self.tris, self.twin
+        edges = list(edges)
+        while edges:
+            p, q = edges.pop()
+            if _key(p, q) in self.constrained: continue
+            e = self.findedge(p, q)
+            if e == -1: continue
+            f = twin[e]
+            if f == -1: continue
+            r1 = tris[_prev(e)]
+            r2 = tris[_prev(f)]
+            if incircle(xs[r1], ys[r1], xs[p], ys[p], xs[q], ys[q], xs[r2], ys[r2]) >= 0: continue
+            self.__flip(e)
+            edges.extend(((p, r1), (r1, q), (q, r2), (r2, p)))
+
+#===========================================================================
+
+    def itertriangles(self, apmax=50.0):
+        """Iterate through the triangles as tuples of coordinates, as ThanTri.itertriangles().
+
+        Triangles with an infinite vertex, or with 2 or more edges > apmax, are omitted."""
+        tris, xs, ys = self.tris, self.xs, self.ys
+        inf = self.infinite
+        apmax2 = apmax**2
+        coords = self.coords
+        for t in range(0, len(tris), 3):
+            i, j, k = tris[t], tris[t+1], tris[t+2]
+            if i in inf or j in inf or k in inf: continue
+            nbig = ((xs[i]-xs[j])**2 + (ys[i]-ys[j])**2 > apmax2) + \
+                   ((xs[j]-xs[k])**2 + (ys[j]-ys[k])**2 > apmax2) + \
+                   ((xs[k]-xs[i])**2 + (ys[k]-ys[i])**2 > apmax2)
+            if nbig > 1: continue
+            yield coords(i), coords(j), coords(k)
+
+
+    def vertices(self):
+        "Iterate through the coordinates of the vertices which are triangulated."
+        coords = self.coords
+        for v in range(len(self.xs)):
+            if self.vstart[v] != -1: yield coords(v)
+
+
+    def iteredges(self):
+        "Iterate through the edges as tuples of coordinates."
+        tris, twin = self.tris, self.twin
+        coords = self.coords
+        for e in range(len(tris)):
+            if twin[e] > e: continue                    # Each edge once
+            yield coords(tris[e]), coords(tris[_next(e)])
+
+
+    def sortedlinks(self, v):
+        "Return the vertices linked to v sorted clockwise from north (as ThanTri.sortlinks())."
+        xs, ys = self.xs, self.ys
+        xa, ya = xs[v], ys[v]
+        return sorted(self.neighbours(v), key=lambda j: dpt(atan2(xs[j]-xa, ys[j]-ya)))
+
+
+    def links(self):
+        "Return the triangulation as a dictionary of ThanLinks, as ThanTri.ls."
+        from .tri import ThanLinks
+        ls = {}
+        coords = self.coords
+        for v in range(len(self.xs)):
+            if self.vstart[v] == -1: continue           # Point which could not be triangulated
+            lk = ls[coords(v)] = ThanLinks(coords(j) for j in self.neighbours(v))
+            lk.seq = [coords(j) for j in self.sortedlinks(v)]
+        return ls
+
+
+    def writetri(self, fw, form1="%-10s%15.3f%15.3f%15.3f\n", form2="%10d\n", pref="tri"):
+        "Write the triangulation in a tri file, as ThanTri.writetri(), without building the links."
+        seq = [v for v in range(len(self.xs)) if self.vstart[v] != -1 and v not in self.infinite]
+        seq.extend(v for v in sorted(self.infinite) if self.vstart[v] != -1)
+        iaa = array("l", [0]) * len(self.xs)
+        for i, v in enumerate(seq): iaa[v] = i+1
+        form = "%s%%0%dd" % (pref, 10-len(pref))
+        ipref = 0
+        for v in seq:
+            a = self.names[v] if self.names is not None else None
+            if a is None: ipref += 1; a = form % (ipref,)
+            ca = list(self.coords(v)[:3])
+            while len(ca) < 3: ca.append(0.0)
+            fw.write(form1 % (a, ca[0], ca[1], ca[2]))
+            for j in self.sortedlinks(v):
+                fw.write(form2 % iaa[j])
+            fw.write("$\n")
+
+
+def _key(i, j):
+    "Return the key of undirected edge i-j."
+    return (i, j) if i < j else (j, i)
+
+
+def _circumradius2(ax, ay, bx, by, cx, cy):
+    "Return the squared circumradius of triangles a, b, c; c may be NumPy arrays."
+    dx = bx - ax; dy = by - ay
+    ex = cx - ax; ey = cy - ay
+    bl = dx*dx + dy*dy
+    cl = ex*ex + ey*ey
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d = 0.5 / (dx*ey - dy*ex)
+        x = (ey*bl - dy*cl) * d
+        y = (dx*cl - ex*bl) * d
+        r = x*x + y*y
+    return np.where(np.isfinite(r), r, np.inf)
+
+
+def _circumcentre(ax, ay, bx, by, cx, cy):
+    "Return the circumcentre of triangle a, b, c."
+    dx = bx - ax; dy = by - ay
+    ex = cx - ax; ey = cy - ay
+    bl = dx*dx + dy*dy
+    cl = ex*ex + ey*ey
+    d = 0.5 / (dx*ey - dy*ex)
+    return ax + (ey*bl - dy*cl) * d, ay + (dx*cl - ex*bl) * d
@@ -1,17 +1,21 @@
-from math import hypot, atan2, pi
-from p_ggen import frange, doNothing
-from p_gmath import linint, dpt
+from math import floor
+from collections import deque
+from p_ggen import doNothing
 
 class ThanYpyka(object):
-    "Computes the isocurves from a triangulation."
+    """Computes the isocurves from a triangulation.
+
+    All the levels are computed in a single pass through the triangles: for
+    each triangle the range of levels which cross it is found, and a segment
+    is added to each of these levels. The segments are stitched to chains
+    using the (integer) ids of the edges they cross; a chain is saved as soon as
+    it closes, and the open chains are saved at the end."""
 
     def __init__(self, ls, saveis, prt=doNothing):
         "Inintialize the object with the links of a triangulation."
         self.ls = ls                 #Triangulation links
         self.saveis = saveis         #User supplied function to accept contour lines as they are computed
         self.prt = prt               #User supplied function to print messages
-        self.cis = []                #The coordinates of a contour line
-        self.seen = set()            #Visited edges
         self.dhl = 1.0               #The iso-dimension
         self.apOrioMax = 50.0        #Longer edges than this are considered nonexistent
 
@@ -20,174 +24,126 @@ class ThanYpyka(object):
         "Compute all isocurves."
         if dhl is not None: self.dhl = dhl
         if apmax is not None: self.apOrioMax = apmax
+        dhl = self.dhl
         assert len(self.ls) > 2, "Τουλάχιστον 3 σημεία χρειάζονται στην τριγωνοποίηση"
 
 #-------ΒΡΕΣ ΜΕΓΙΣΤΟ ΚaΙ ΕΛaΧΙΣΤΟ ΥΨΟΜΕΤΡΟ
 
-        for k in self.ls: break
-        hmin = hmax = k[2]
-        for k in self.ls:
-            h1 = k[2]
-            if h1 > hmax: hmax = h1
-            if h1 < hmin: hmin = h1
+        hmin = min(k[2] for k in self.ls)
+        hmax = max(k[2] for k in self.ls)
+        h1 = int(hmin / dhl) * dhl
+        self.prt('ΥΠΟΛΟΓΙΣΜΟΣ ΚΑΜΠΥΛΩΝ %.2f - %.2f' % (h1, hmax))
 
 #-------Υπολόγισε καμπύλες
 
-        h1 = int(hmin / dhl) * dhl
-        for his in frange(h1, hmax, dhl):
-            pr = 1.0
-            if his > (hmin+hmax)*0.5: pr = -1.0
-            self.ypyka1(his, pr)
-
-        self.seen.clear()         # Free memory
-        del self.cis[:]           # Free memory
+        dhis = 0.01*dhl
+        n = len(self.ls)
+        apmax2 = self.apOrioMax**2
+        chains = {}                  #Open chains of each level; edge id -> chain
+        for (ia, ca), (ib, cb), (ic, cc) in self.itertriangles():
+            tri = sorted(((ca[2], ia, ca), (cb[2], ib, cb), (cc[2], ic, cc)))
+            (ha, ia, ca), (hb, ib, cb), (hc, ic, cc) = tri
+            if hc < h1: continue
+            eab = ia*n+ib if ia < ib else ib*n+ia     #Edge ids; long edges (which are not crossed) are -1
+            if (ca[0]-cb[0])**2 + (ca[1]-cb[1])**2 > apmax2: eab = -1
+            eac = ia*n+ic if ia < ic else ic*n+ia
+            if (ca[0]-cc[0])**2 + (ca[1]-cc[1])**2 > apmax2: eac = -1
+            ebc = ib*n+ic if ib < ic else ic*n+ib
+            if (cb[0]-cc[0])**2 + (cb[1]-cc[1])**2 > apmax2: ebc = -1
+            j = max(0, int(floor((ha-h1)/dhl)))
+            while True:
+                his = h1 + j*dhl
+                if his >= hc: break              #A vertex is above the level if h > his
+                if his < ha: pass
+                elif his < hb:
+                    if eab != -1 and eac != -1: self.__addseg(chains, j, his, dhis, eab, ca, cb, eac, ca, cc)
+                else:
+                    if eac != -1 and ebc != -1: self.__addseg(chains, j, his, dhis, eac, ca, cc, ebc, cb, cc)
+                j += 1
+
+#-------Save the open chains
+
+        for j in sorted(chains):
+            seen = set()
+            for c in chains[j].values():
+                if id(c) in seen: continue
+                seen.add(id(c))
+                self.saveis(0, list(c[0]))
+        chains.clear()               # Free memory
 
 #=====================================================================
 
-    def ypyka1(self, his, pr):
-        "Compute all contour lines of elevation his."
-        self.prt('ΥΠΟΛΟΓΙΣΜΟΣ ΚΑΜΠΥΛΗΣ %.2f' % his)
-
-#-------ΒΡΕΣ ΣΗΜΕΙΟ aΠ' ΟΠΟΥ aΡΧΙΖΕΙ Η ΙΣΟΥΨΗΣ his
-
-        dhis = 0.01*self.dhl
-        seen = self.seen
-        seen.clear()
-        for karx, linksarx in self.ls.items():
-            harx = karx[2]
-            if harx == his: harx -= dhis
-            if harx*pr > his*pr: continue
-            for iarx, larx in enumerate(linksarx):
-                if frozenset((karx, larx)) in seen: continue
-                hl = larx[2]
-                if hl == his: hl -= dhis
-                if hl*pr < his*pr: continue
-                if self.orioper(karx, larx): continue
-                icod = self.ypyka2(his, karx, iarx)
-                self.saveis(icod, self.cis)           # Σώσε καμπύλη
-
-#==========================================================================
-
-    def orioper(self, k, l):
-        "Tests if distance is out of bounds."
-        d2 = hypot(l[0]-k[0], l[1]-k[1])
-        return d2 > self.apOrioMax
-
-    def xasma(self, k, l, lp, ibhm):   #Thanasis2012_05_16
-        "Tests if there is gap >= pi between 2 consecutive points."
-        if ibhm < 0: l, lp = lp, l                #If ibhm == -1 then lp, l are counter-clockwise, so we correct them
-        thl = atan2(l[0]-k[0], l[1]-k[1])
-        thlp = atan2(lp[0]-k[0], lp[1]-k[1])
-        dth = dpt(thl-thlp)
-        if dth >= pi: return True                 #There is xasma from previous point
-        return False
-
-#==========================================================================
-
-    def ypyka2(self, his, karx, iarx):
-        "Compute 1 isocurve."
-
-#-------ΔΕΞΙΟ ΜΙΣΟ ΙΣΟΥΨΟΥΣ
-
-        del self.cis[:]
-        icod = self.mishyp(his, karx, iarx, 1)
+    def itertriangles(self):
+        """Iterate through the triangles of the links, as 3 pairs of vertex id and coordinates.
+
+        The 'triangles' through a gap >= pi between consecutive links are omitted."""
+        ls = self.ls
+        vid = dict((c, i) for i, c in enumerate(ls))
+        for ca, linksa in ls.items():
+            ia = vid[ca]
+            nl = len(linksa)
+            if nl < 2: continue
+            for i in range(nl):
+                cb = linksa[i]
+                cc = linksa[(i+1) % nl]
+                ib = vid[cb]
+                ic = vid[cc]
+                if ib < ia or ic < ia: continue          #Each triangle once: from its vertex with the smallest id
+                if cc not in ls[cb]: continue            #End of region
+                dxb = cb[0]-ca[0]; dyb = cb[1]-ca[1]
+                dxc = cc[0]-ca[0]; dyc = cc[1]-ca[1]
+                if dxb*dyc - dyb*dxc >= 0.0: continue    #Links are clockwise: gap >= pi
+                yield (ia, ca), (ib, cb), (ic, cc)
 
-#-------ΚΥΚΛΙΚΗ ΙΣΟΥΨΗΣ
-
-        if icod < 0:
-            if self.cis[0] != self.cis[-1]:
-#                assert 0, "Κυκλική ΙΣΟΥΨΗΣ ΔΕΝ ΕΧΕΙ ΙΔΙΕΣ ΑΡΧΙΚΕΣ ΚΑΙ ΤΕΛΙΚΕΣ ΣΥΝΤΕΤΑΓΜΕΝΕΣ: Πιθανό πρόβλημα στην κατασκευή των τριγώνων."
-                self.prt("Κυκλική ΙΣΟΥΨΗΣ ΔΕΝ ΕΧΕΙ ΙΔΙΕΣ ΑΡΧΙΚΕΣ ΚΑΙ ΤΕΛΙΚΕΣ ΣΥΝΤΕΤΑΓΜΕΝΕΣ: Πιθανό πρόβλημα στην κατασκευή των τριγώνων.")
-                icod = 0
-
-#------ΑΡΙΣΤΕΡΟ ΜΙΣΟ ΙΣΟΥΨΟΥΣ
+#=====================================================================
 
+    def __addseg(self, chains, j, his, dhis, e1, k1, l1, e2, k2, l2):
+        "Add the segment which crosses edges e1 (k1-l1) and e2 (k2-l2) at level his to the chains of level j."
+        ends = chains.get(j)
+        if ends is None: ends = chains[j] = {}
+        c1 = ends.pop(e1, None)
+        c2 = ends.pop(e2, None)
+        if c1 is None and c2 is None:
+            c = [deque((self.tomis(k1, l1, his, dhis), self.tomis(k2, l2, his, dhis))), e1, e2]
+            ends[e1] = ends[e2] = c
+        elif c2 is None:
+            self.__extend(ends, c1, e1, e2, self.tomis(k2, l2, his, dhis))
+        elif c1 is None:
+            self.__extend(ends, c2, e2, e1, self.tomis(k1, l1, his, dhis))
+        elif c1 is c2:                                   #ΚΥΚΛΙΚΗ ΙΣΟΥΨΗΣ
+            cis = list(c1[0])
+            cis.append(list(cis[0]))
+            self.saveis(-1, cis)
+        else:                                            #Join 2 chains
+            if len(c1[0]) < len(c2[0]): c1, c2, e1, e2 = c2, c1, e2, e1
+            if c1[1] == e1: c1[0].reverse(); c1[1], c1[2] = c1[2], c1[1]   #Now e1 is at the end of c1
+            if c2[2] == e2: c2[0].reverse(); c2[1], c2[2] = c2[2], c2[1]   #Now e2 is at the start of c2
+            c1[0].extend(c2[0])
+            c1[2] = c2[2]
+            ends[c1[2]] = c1
+
+
+    @staticmethod
+    def __extend(ends, c, eold, enew, ct):
+        "Add point ct, on edge enew, to the end of chain c which is on edge eold."
+        if c[1] == eold:
+            c[0].appendleft(ct)
+            c[1] = enew
         else:
-            self.cis.reverse()
-            del self.cis[-1]                                         # ΞΑΝΑΒΡΕΣ ΑΡΧΙΚΟ..
-            self.seen.remove(frozenset((karx, self.ls[karx][iarx]))) # ..ΣΗΜΕΙΟ
-            icod = self.mishyp(his, karx, iarx, -1)
-            if icod == -1:
-#                assert 0, "ΙΣΟΥΨΗΣ Κατέληξε σε σημείο του εαυτού της: Πιθανό πρόβλημα στην κατασκευή των τριγώνων."
-                self.prt("ΙΣΟΥΨΗΣ Κατέληξε σε σημείο του εαυτού της: Πιθανό πρόβλημα στην κατασκευή των τριγώνων.")
-                icod = 0
-        return icod
+            c[0].append(ct)
+            c[2] = enew
+        ends[enew] = c
 
-#=====================================================================
+#==========================================================================
 
-    def mishyp (self, his, karx, iarx, ibhm):
-        "Compute half of a isocurve."
-        seen = self.seen
-        dhis = 0.01*self.dhl
-        k = karx
+    @staticmethod
+    def tomis(k, l, his, dhis):
+        "Find intersection of edge k-l with level his."
         hk = k[2]
         if hk == his: hk -= dhis
-        linksk = self.ls[k]
-        i = iarx
-        l = linksk[i]
         hl = l[2]
         if hl == his: hl -= dhis
-        edge = frozenset((k, l))
-
-#-------ΒΡΕΣ ΤΟΜΗ - ΠaΡΕ ΕΠΟΜΕΝΟ ΣΗΜΕΙΟ ΤΟΥ ΚΕΝΤΡΙΚΟΥ ΣΗΜΕΙΟΥ k
-
-        while True:
-            self.tomis(k, hk, l, hl, his)
-            seen.add(edge)
-            lp = l
-#-----------ΕΠΟΜΕΝΗ ΕΝΩΣΗ ΤΟΥ ΣΗΜΕΙΟΥ ksp(k)
-            i = (i + ibhm) % len(linksk)
-            l = linksk[i]
-#-----------ΕΞΕΤΑΣΕ ΤΕΛΟΣ,ΚΥΚΛΟ
-            if self.xasma(k, l, lp, ibhm): return 0 # Υπάρχει χάσμα >=pi μεταξύ lp και l: τέλος περιοχής  #Thanasis2012_05_16
-            hl = l[2]
-            if hl == his: hl -= dhis
-            if lp not in self.ls[l]: return 0    # ΤΕΛΟΣ ΠΕΡΙΟΧΗΣ
-            edge = frozenset((k, l))
-            if edge in seen:                     # ΕΧΕΙ ΗΔΗ ΒΡΕΘΕΙ (ΚΥΚΛΟΣ);
-                assert (hk-his) * (his-hl) >= 0.0, "Προηγουμένως είχε βρεθεί τομή. Τώρα όχι!"
-                self.tomis(k, hk, l, hl, his)
-                return -1
-            if (hk-his) * (his-hl) >= 0.0:
-                if self.orioper(k, l): return 0       # Οριο περιοχής
-                continue
-
-#-----------aΛΛaΓΗ ΚΕΝΤΡΙΚΟΥ ΣΗΜΕΙΟΥ Κ
-
-            k = l
-            hk = k[2]
-            if hk == his: hk -= dhis
-            linksk = self.ls[k]
-            for i, l in enumerate(linksk):
-                if l == lp: break
-            else:
-                assert 0, "Τέλος περιοχής: έπρεπε να είχε βρεθεί προηγουμένως!"
-            hl = l[2]
-            if hl == his: hl -= dhis
-            edge = frozenset((k, l))
-            if edge in seen:                     # ΕΧΕΙ ΗΔΗ ΒΡΕΘΕΙ (ΚΥΚΛΟΣ);
-                self.tomis(k, hk, l, hl, his)
-                return -1
-            assert (hk-his) * (his-hl) >= 0.0, "Έπρεπε να υπάρχει τομή!"
-            if self.orioper(k, l): return 0           # Οριο περιοχής
-
-#==========================================================================
-
-    def tomis(self, k, hk, l, hl, his):
-        "Find intersection and save it."
-
-#-------ΒΡΕΣ ΤΟΜΗ
-
-        dh = hl - hk
-        assert dh != 0.0, "Αφού αφαιρείται 0.01*dhl, πώς βγήκαν ίδια;"
-        ca = list(k)
-        ca[2] = hk
-        cb = list(l)
-        cb[2] = hl
-        if dh == 0.0:
-            ct = [(a+b)*0.5 for a,b in zip(ca, cb)]
-        else:
-            ct = [linint(hk, a, hl, b, his) for a,b in zip(ca, cb)]
-#-------ΣΩΣΕ ΤΟΜΗ
-
-        self.cis.append(ct)
+        u = (his-hk) / (hl-hk)
+        ct = [a+(b-a)*u for a,b in zip(k, l)]
+        ct[2] = his
+        return ct
@@ -0,0 +1,17 @@
+import io
+import thantkgui, thancom
+import thandwg
+from thanbatch.thanbatchwin import ThanBatchWin
+from thanvar import thanfiles
+
+
+def test_batch_commands_do_not_keep_dirty_elements():
+    win = ThanBatchWin(fout=io.StringIO())
+    dr = thandwg.ThanDrawing()
+    win.setDrawing(thanfiles.tempname(), dr)
+    script = ["line", "0,0", "10,10", "20,0", "", "erase", "all", "", "regen"]
+    assert win.thanBatchDo(script) == 0
+    assert len(dr.thanDirty) == 0
+    dr.thanDirty.add(object())
+    win.thanRegen()
+    assert len(dr.thanDirty) == 0
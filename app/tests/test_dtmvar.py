@@ -0,0 +1,24 @@
+import math
+import numpy as np
+import p_gtri
+
+
+class GdemLike(p_gtri.ThanDTMDEM):
+    "A DEM which, like GDEM and ThanDTMinv2, defines thanPointZ() without the native argument."
+
+    def thanPointZ(self, cp):
+        if cp[0] < 0.0: return None
+        return cp[0] + 2.0*cp[1]
+
+
+def test_thanPointsZ_fallback_without_native():
+    dem = GdemLike()
+    z = dem.thanPointsZ([(1.0, 2.0, 0.0), (-1.0, 0.0, 0.0), (3.0, 0.5, 0.0)])
+    assert z[0] == 5.0
+    assert math.isnan(z[1])
+    assert z[2] == 4.0
+
+
+def test_module_thanPointsZ_with_gdem_like():
+    z = p_gtri.thanPointsZ([GdemLike()], [(1.0, 1.0, 0.0), (-2.0, 1.0, 0.0)])
+    assert z[0] == 3.0 and np.isnan(z[1])
@@ -0,0 +1,34 @@
+import thantkgui, thancom          # Initialise ThanCad's packages in the right order
+from thandwg import ThanDrawing
+from thandr import ThanLine, ThanCircle, ThanPoint
+
+
+def recorded(e):
+    "Return the points that thanTransform() passes to the transformation function."
+    cc = []
+    def record(c):
+        c = list(c[:3])
+        cc.append(c)
+        return c
+    e.thanClone().thanTransform(record)
+    return cc
+
+
+def test_gather_does_not_change_the_elements(monkeypatch):
+    dr = ThanDrawing()
+    line = ThanLine()
+    line.thanSet([[0.0, 0.0, 1.0], [10.0, 5.0, 2.0], [20.0, 0.0, 3.0]])
+    circ = ThanCircle()
+    circ.thanSet([5.0, 5.0, 0.0], 2.0)
+    pnt = ThanPoint()
+    pnt.thanSet([1.0, 2.0, 3.0])
+    elems = [line, circ, pnt]
+    for e in elems: dr.thanElementAdd(e)
+    expected = [c for e in elems for c in recorded(e)]
+
+    def noset(self, *args, **kw): raise AssertionError("thanSet() was called")
+    monkeypatch.setattr(ThanLine, "thanSet", noset)    # The nodes are read directly
+    cc, elemscc = dr.thanGatherCoords(elems)
+    assert elemscc == elems
+    assert cc.tolist() == expected
+    assert circ.cc[:3] == [5.0, 5.0, 0.0] and circ.r == 2.0   # Only a clone of the circle was transformed
@@ -0,0 +1,34 @@
+import pickle
+import p_gtri
+from p_gearth.nge_behs import hgme
+
+
+def loadFrom(tmp_path, monkeypatch, content):
+    fn = str(tmp_path / "hgme.bin")
+    with open(fn, "wb") as fw:
+        pickle.dump(content, fw)
+    monkeypatch.setattr(hgme, "_binaryName", lambda: fn)
+    dtm = hgme._loadHgme()
+    with open(fn, "rb") as fr:
+        saved = pickle.load(fr)
+    return dtm, saved
+
+
+def test_stale_class_is_rebuilt(tmp_path, monkeypatch):
+    stale = p_gtri.ThanDTMlines()
+    stale.__dict__.clear()                    # As if unpickled from an older version of the class
+    dtm, saved = loadFrom(tmp_path, monkeypatch, (hgme._BINVERSION, stale))
+    assert abs(dtm.thanPointZ(hgme._PROBE) - 38.6056) < 0.001
+    assert saved[0] == hgme._BINVERSION and saved[1].thanPointZ(hgme._PROBE) is not None
+
+
+def test_old_version_is_rebuilt(tmp_path, monkeypatch):
+    parsed = []
+    monkeypatch.setattr(hgme, "_parseHgme", lambda: parsed.append(1) or p_gtri.ThanDTMlines())   # The tables can be parsed once per process
+    dtm, saved = loadFrom(tmp_path, monkeypatch, (hgme._BINVERSION-1, "old format"))
+    assert parsed == [1] and isinstance(dtm, p_gtri.ThanDTMlines)
+    assert saved[0] == hgme._BINVERSION
+
+
+def test_name_depends_on_class_modules():
+    assert hgme._binaryName() is not None
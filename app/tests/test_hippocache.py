@@ -0,0 +1,68 @@
+import os
+import p_gtri
+from p_gpoleod.hippocache import HippoCache
+
+HULL = [(0.0, 0.0), (50.0, 0.0), (50.0, 40.0), (0.0, 40.0), (0.0, 0.0)]
+
+
+class PlaneDem(p_gtri.ThanDTMDEM):
+    "A DEM of an inclined plane stored in a file."
+
+    def __init__(self, filnam=""):
+        self.filnam = filnam
+
+    def thanLineZ(self, cp):
+        (xa, ya), (xb, yb) = cp[0][:2], cp[1][:2]
+        cn = [[xa+(xb-xa)*i/10.0, ya+(yb-ya)*i/10.0] for i in range(11)]
+        for c in cn: c.append(0.15*c[0] + 0.05*c[1]*c[1]/40.0)
+        return 0, cn
+
+
+class UnpicklableDem(PlaneDem):
+    "A DEM which holds a lambda, so it can not be sent to worker processes."
+
+    def __init__(self, filnam=""):
+        PlaneDem.__init__(self, filnam)
+        self.f = lambda x: x
+
+
+def build(dtm, **kw):
+    c = HippoCache(dx=10.0, dy=10.0, dtheta=30.0)
+    mes = []
+    c.build_cache(dtm, HULL, prt=mes.append, **kw)
+    return c, mes
+
+
+def same(a, b):
+    return (a.roadenx, a.roadeny, a.pxmin, a.pxmax, a.pymin, a.pymax) == \
+           (b.roadenx, b.roadeny, b.pxmin, b.pxmax, b.pymin, b.pymax)
+
+
+def test_workers_equal_serial():
+    serial, _ = build(PlaneDem())
+    parallel, _ = build(PlaneDem(), nworkers=2)
+    assert serial.roadenx and same(serial, parallel)
+
+
+def test_unpicklable_falls_back_to_serial():
+    serial, _ = build(PlaneDem())
+    c, mes = build(UnpicklableDem(), nworkers=2)
+    assert any("serially" in m for m in mes)
+    assert same(serial, c)
+
+
+def test_dem_keyed_on_file(tmp_path):
+    fn = tmp_path / "dem.tif"
+    fn.write_bytes(b"x")
+    dem = PlaneDem(str(fn))
+    c = HippoCache(dx=10.0, dy=10.0, dtheta=30.0)
+    key = c.cacheKey(dem, HULL)
+    assert key is not None and key == c.cacheKey(PlaneDem(str(fn)), HULL)
+    os.utime(fn, (1000, 1000))
+    assert c.cacheKey(dem, HULL) != key
+    assert c.cacheKey(PlaneDem(), HULL) is None
+
+    first, mes = build(dem, cachedir=str(tmp_path))
+    second, mes = build(dem, cachedir=str(tmp_path))
+    assert any("Cache was read" in m for m in mes)
+    assert same(first, second)
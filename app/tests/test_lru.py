@@ -0,0 +1,40 @@
+from p_ggen import LruCache
+
+
+def test_weight_limits_total():
+    discarded = []
+    c = LruCache(100, ondiscard=lambda k, v: discarded.append(k), weight=len)
+    c["a"] = "x"*40
+    c["b"] = "x"*40
+    c.get("a")                     # b becomes least recently used
+    c["c"] = "x"*40
+    assert discarded == ["b"]
+    assert "a" in c and "c" in c
+    assert c.total == 80
+
+
+def test_item_heavier_than_maxsize_is_kept():
+    c = LruCache(10, weight=len)
+    c["a"] = "x"*5
+    c["b"] = "x"*50
+    assert "a" not in c and "b" in c
+    del c["b"]
+    assert c.total == 0 and len(c) == 0
+
+
+def test_count_without_weight():
+    c = LruCache(2)
+    for i in range(5): c[i] = i
+    assert len(c) == 2 and c.total == 2
+
+
+def test_resize_discards_least_recently_used():
+    discarded = []
+    c = LruCache(5, ondiscard=lambda k, v: discarded.append(k))
+    for i in range(5): c[i] = i
+    c.get(0)                       # 1 becomes least recently used
+    c.resize(2)
+    assert discarded == [1, 2, 3]
+    assert c.maxsize == 2 and len(c) == 2 and 0 in c and 4 in c
+    c.resize(10)
+    assert len(c) == 2
@@ -0,0 +1,12 @@
+import os
+from p_gimage import pyramidPrune
+
+
+def test_prune_deletes_oldest(tmp_path):
+    for i in range(4):
+        fn = tmp_path / ("k_%d.tif" % i)
+        fn.write_bytes(b"x"*100)
+        os.utime(fn, (1000+i, 1000+i))
+    (tmp_path / "other.txt").write_bytes(b"x"*1000)
+    assert pyramidPrune(str(tmp_path), 250) == 200
+    assert sorted(os.listdir(tmp_path)) == ["k_2.tif", "k_3.tif", "other.txt"]
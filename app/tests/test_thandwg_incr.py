@@ -0,0 +1,99 @@
+import thantkgui, thancom          # Initialise ThanCad's packages in the right order
+import p_ggen
+from p_gmath import ThanRectCoorTransf
+import thanfonts
+from thandwg import ThanDrawing
+from thandr import ThanLine
+
+
+class FakeCanvas:
+    "A canvas which only keeps the tags of its items."
+
+    def __init__(self):
+        self.items = {}
+        self.n = 0
+        self.ncalls = {}
+
+    def __create(self, *args, **kw):
+        self.n += 1
+        tags = kw.get("tags", ())
+        if isinstance(tags, str): tags = (tags,)
+        self.items[self.n] = tuple(tags)
+        return self.n
+
+    create_line = create_polygon = create_oval = create_text = create_rectangle = _FakeCanvas__create
+
+    def find_withtag(self, tag):
+        self.ncalls["find_withtag"] = self.ncalls.get("find_withtag", 0) + 1
+        return tuple(i for i, tags in self.items.items() if tag in tags)
+
+    def delete(self, *tags):
+        self.ncalls["delete"] = self.ncalls.get("delete", 0) + 1
+        for i, tags1 in list(self.items.items()):
+            if set(tags) & set(tags1): del self.items[i]
+
+    def __getattr__(self, name):
+        return lambda *args, **kw: ()
+
+
+def makeThan(dr):
+    than = p_ggen.Struct()
+    than.dc = FakeCanvas()
+    than.ct = ThanRectCoorTransf()
+    than.ct.set((0.0, 0.0, 100.0, 100.0), (0, 100, 100, 0))
+    than.viewPort = dr.viewPort
+    than.thanPoints = thanfonts.thanPoints
+    than.thanFonts = thanfonts.thanFonts
+    than.imageFrameOn = dr.thanVar["imageframe"]
+    than.stereo = None
+    than.markselected = set()
+    than.thanTstyles = dr.thanTstyles
+    than.thanLtypes = dr.thanLtypes
+    than.thanDimstyles = dr.thanDimstyles
+    than.thanImages = set()
+    than.fillModeOn = dr.thanVar["fillmode"]
+    than.draftTextOn = False
+    than.thanGudGetDt = lambda dpix=1.0: dpix
+    than.pixpermm = 96.0/25.4
+    than.dash = []
+    return than
+
+
+def test_pan_away_and_back_does_not_duplicate_items():
+    dr = ThanDrawing()
+    for i in range(100):
+        e = ThanLine()
+        e.thanSet([[i*10.0, 0.0, 0.0], [i*10.0+5.0, 5.0, 0.0]])
+        dr.thanElementAdd(e)
+    than = makeThan(dr)
+    dr.viewPort[:] = 0.0, 0.0, 10.0, 10.0
+    dr.thanTkDraw(than)
+    nitems = len(than.dc.items)
+    for x in (300.0, 0.0, 300.0, 0.0):       # Pan away and back, twice
+        dr.viewPort[:] = x, 0.0, x+10.0, 10.0
+        assert dr.thanTkDrawIncr(than) is not None
+    counts = {}
+    for tags in than.dc.items.values(): counts[tags[0]] = counts.get(tags[0], 0) + 1
+    assert max(counts.values()) == 1             # Each element has exactly one item
+    assert len(than.dc.items) == nitems          # The items which scrolled out of view were deleted
+
+
+def test_items_out_of_view_are_deleted_in_one_call():
+    dr = ThanDrawing()
+    elems = []
+    for i in range(100):
+        e = ThanLine()
+        e.thanSet([[i*10.0, 0.0, 0.0], [i*10.0+5.0, 5.0, 0.0]])
+        dr.thanElementAdd(e)
+        elems.append(e)
+    than = makeThan(dr)
+    dr.viewPort[:] = 0.0, 0.0, 10.0, 10.0
+    dr.thanTkDraw(than)
+    dr.viewPort[:] = 500.0, 0.0, 510.0, 10.0
+    than.dc.ncalls.clear()
+    assert dr.thanTkDrawIncr(than) > 0
+    assert than.dc.ncalls == {"delete": 1}       # No find_withtag() and one delete() for all the items
+    xymm = dr.thanExtViewPort()
+    drawn = set(tags[0] for tags in than.dc.items.values())
+    inside = set(e.thanTags[0] for e in elems if e.thanInbox(xymm))
+    assert drawn == inside
@@ -0,0 +1,37 @@
+import thantkgui, thancom
+from p_ggen import Struct
+from thandr import ThanLine
+
+
+class FakeCt:
+    def __init__(self, pix):
+        self.pix = pix
+
+    def local2GlobalRel(self, dx, dy):
+        return dx*self.pix, dy*self.pix
+
+
+def makeLine():
+    e = ThanLine()
+    e.thanSet([[float(i), 0.0 if i % 10 else 5.0, 0.0] for i in range(200)])
+    return e
+
+
+def test_clone_does_not_reuse_stale_lod():
+    than = Struct(ct=FakeCt(4.0))
+    e = makeLine()
+    cp1 = e.thanLodCp(than)
+    assert len(cp1) < len(e.cp)
+    en = e.thanClone()
+    assert en.thanLod is None
+    en.cp[3][1] = 5.0                  # In place edit, as thanpedit does; count, bbox and first vertex are unchanged
+    assert en.cp[3] in en.thanLodCp(than)
+    assert e.cp[3] not in cp1
+
+
+def test_move_resets_lod():
+    than = Struct(ct=FakeCt(4.0))
+    e = makeLine()
+    e.thanLodCp(than)
+    e.thanMove([1.0, 1.0, 0.0])
+    assert e.thanLod is None
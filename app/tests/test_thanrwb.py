@@ -0,0 +1,49 @@
+import io, struct
+import pytest
+import thantkgui, thancom
+from thancom import thanrwb
+from p_ggen import Struct
+
+
+def makeProj():
+    return (None, Struct(thanVar={"elevation": [0.0, 0.0, 0.0]}), None)
+
+
+def writeBin(nodes):
+    fb = io.BytesIO()
+    fw = thanrwb.ThanWBinfile(fb, makeProj(), "test.thcx")
+    fw.writeBeg("ELEMENTS")
+    fw.writeLayerBeg("0")
+    fw.writeNodes(nodes)
+    fw.writeLayerEnd("0", 1, [0.0, 0.0, 1.0, 1.0])
+    fw.writeEnd("ELEMENTS")
+    fw.thanFlush()
+    return fb
+
+
+def test_roundtrip():
+    nodes = [[0.0, 1.0, 2.0], [3.0, 4.0, 5.0]]
+    fb = writeBin(nodes)
+    fb.seek(0)
+    fr = thanrwb.ThanRBinfile(fb, makeProj(), "test.thcx")
+    fr.readBeg("ELEMENTS")
+    assert fr.readNodes() == nodes
+    fr.readEnd("ELEMENTS")
+
+
+def test_unknown_major_rejected():
+    fb = writeBin([[0.0, 0.0, 0.0]])
+    fb.seek(0)
+    fb.write(struct.pack("<8sHH", thanrwb.MAGIC, thanrwb.FORMAT[0]+1, 0))
+    fb.seek(0)
+    with pytest.raises(ValueError):
+        thanrwb.ThanRBinfile(fb, makeProj(), "test.thcx")
+
+
+def test_format_mismatch_rejected():
+    fb = writeBin([[0.0, 0.0, 0.0]])
+    fb.seek(len(thanrwb.MAGIC)+2)
+    fb.write(struct.pack("<H", thanrwb.FORMAT[1]+1))     # Header and table of contents disagree
+    fb.seek(0)
+    with pytest.raises(ValueError):
+        thanrwb.ThanRBinfile(fb, makeProj(), "test.thcx")
@@ -0,0 +1,25 @@
+import io
+import thantkgui, thancom
+import thandwg, thanopt
+from p_ggen import path
+from thanbatch.thanbatchwin import ThanBatchWin
+from thanvar import thanfiles
+from thancom import thancomfile, thanrwb
+
+
+def test_thcxformat_selects_binary_save(tmp_path, monkeypatch):
+    monkeypatch.setattr(thanopt.thancadconf, "thanSaveBinary", False)
+    monkeypatch.setattr(thancomfile, "__saveHouse", lambda proj, fn: None)   #No menus and titles in batch mode
+    win = ThanBatchWin(fout=io.StringIO())
+    win.setDrawing(thanfiles.tempname(), thandwg.ThanDrawing())
+    assert win.thanBatchDo(["line", "0,0", "10,10", "", "thcxformat", "b"]) == 0
+    assert thanopt.thancadconf.thanSaveBinary
+    fn = path(str(tmp_path / "a.thcx"))
+    assert thancomfile.thanFileSavePath(win.thanProj, fn) > 0
+    assert thanrwb.isThcBin(fn)
+
+    assert win.thanBatchDo(["thcxformat", "t"]) == 0
+    assert not thanopt.thancadconf.thanSaveBinary
+    fn = path(str(tmp_path / "b.thcx"))
+    assert thancomfile.thanFileSavePath(win.thanProj, fn) > 0
+    assert not thanrwb.isThcBin(fn)
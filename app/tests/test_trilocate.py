@@ -0,0 +1,32 @@
+import random
+from p_gtri.trilocate import GridIndex
+
+
+def grid(n=10):
+    "Return the vertices and the triangles of a regular n x n grid, with fake pixel coordinates."
+    xyz = [(float(j), float(i), float(i+j), 2.0*j, 2.0*i) for i in range(n+1) for j in range(n+1)]
+    tri = []
+    for i in range(n):
+        for j in range(n):
+            a, b, c, d = i*(n+1)+j, i*(n+1)+j+1, (i+1)*(n+1)+j+1, (i+1)*(n+1)+j
+            tri.append((xyz[a], xyz[b], xyz[c]))
+            tri.append((xyz[a], xyz[c], xyz[d]))
+    return xyz, tri
+
+
+def test_trifinds_agrees_with_trifind():
+    xyz, tri = grid()
+    r = random.Random(2)
+    xy = [(r.uniform(-2.0, 12.0), r.uniform(-2.0, 12.0)) for _ in range(500)]
+    xy += [(5.0, 5.0), (0.0, 0.0), (10.0, 10.0), (3.5, 3.5)]
+    for ispixel in (False, True):
+        g = GridIndex(xyz, tri, ispixel)
+        if ispixel: xy = [(2.0*x, 2.0*y) for x, y in xy]
+        expected = []
+        for x, y in xy:
+            g.trilast = None
+            expected.append(g.triFind(x, y))
+        assert g.triFinds(xy) == expected
+        assert g.triFinds([(float("nan"), 1.0)]) == [None]
+    assert any(t is None for t in expected) and any(t is not None for t in expected)
+    assert g.triFinds([]) == []
@@ -0,0 +1,54 @@
+import random
+import p_gtri
+
+
+def points(n=300, seed=1):
+    r = random.Random(seed)
+    return [(None, r.uniform(0, 100), r.uniform(0, 100), r.uniform(0, 10)) for _ in range(n)]
+
+
+def triset(tris):
+    return set(frozenset(t) for t in tris)
+
+
+def test_links_are_built_lazily_and_agree():
+    tri = p_gtri.ThanTri()
+    ok, ter = tri.makemesh(points())
+    assert ok, ter
+    assert tri.mesh is not None
+    for apmax in (1.0e100, 12.0):
+        fast = triset(tri.mesh.itertriangles(apmax))
+        assert triset(tri.itertriangles(apmax)) == fast
+        tri2 = p_gtri.ThanTri()
+        tri2.makemesh(points())
+        tri2.ls                              # Build the links; the legacy code is used from now on
+        assert tri2.mesh is None
+        assert triset(tri2.itertriangles(apmax)) == fast
+    assert len(tri.aa) >= len(list(tri.mesh.vertices()))
+
+
+def test_infinite_points_are_marked():
+    tri = p_gtri.ThanTri()
+    ok, ter = tri.makemesh(points(50), infinite=True)
+    assert ok, ter
+    assert len(tri.mesh.infinite) == 4
+    for t in tri.itertriangles(1.0e100):
+        assert not any(c in tri.xyapeira for c in t)
+    assert any(c in tri.xyapeira for e in tri.iteredges() for c in e)
+
+
+def test_break_lines_are_inserted_or_reported(monkeypatch):
+    cp = points(100, seed=3)
+    brk = [(cp[i], cp[i+1]) for i in range(0, 40, 2)]
+    tri = p_gtri.ThanTri()
+    ok, ter = tri.makemesh(cp, brk)
+    assert ok, ter
+    assert tri.brkfailed == []
+    assert len(tri.mesh.constrained) >= len(brk)
+
+    from p_gtri.trimesh import ThanTriMesh
+    monkeypatch.setattr(ThanTriMesh, "insertConstraint", lambda self, a, b: False)
+    tri = p_gtri.ThanTri()
+    ok, ter = tri.makemesh(cp, brk[:3])
+    assert ok, ter
+    assert tri.brkfailed == brk[:3]
@@ -0,0 +1,88 @@
+##############################################################################
+# ThanCad 0.9.1 "Students2024": n-dimensional CAD with raster support for engineers
+#
+# Copyright (C) 2001-2025 Thanasis Stamos, May 20, 2025
+# Athens, Greece, Europe
+# URL: http://thancad.sourceforge.net
+# e-mail: cyberthanasis@gmx.net
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details (www.gnu.org/licenses/gpl.html).
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+##############################################################################
+"""\
+ThanCad 0.9.1 "Students2024": n-dimensional CAD with raster support for engineers
+
+This module implements the command line entry point of the batch mode:
+
+    thancad.py --batch script.scr [drawing]
+"""
+
+import sys
+from p_ggen import path
+import thandwg
+from thanvar import thanfiles
+from thantrans import T
+from .thanbatchwin import ThanBatchWin, ThanNull
+
+
+def thanBatchRun(args):
+    """Runs a script of ThanCad commands against a drawing without GUI; it returns the exit status.
+
+    args are the command line arguments after --batch: the script file and,
+    optionally, the drawing (.thcx or any format which ThanCad imports). If
+    the drawing is not given, a new drawing is created. The outputs are
+    written by the commands of the script (e.g. save, saveas); the drawing
+    is not saved automatically.
+    The status is 0 if all the commands succeeded, 1 if a command failed
+    and 2 if the script or the drawing could not be read."""
+    from thancom.thancomfile import thanFileReadPath
+    from thancom.thancomview import thanZoomExt1
+    if len(args) not in (1, 2):
+        sys.stderr.write("Usage: thancad.py --batch script.scr [drawing]\n")
+        return 2
+    fscr = path(args[0])
+    try:
+        fr = open(fscr)
+    except IOError as why:
+        sys.stderr.write("%s: %s\n" % (fscr, why))
+        return 2
+
+    win = ThanBatchWin()
+    proj = win.thanProj
+    if len(args) > 1:
+        fn = path(args[1]).abspath()
+        dr, mes, zoomext = thanFileReadPath(proj, fn)
+        if dr is None:
+            fr.close()
+            return 2
+    else:
+        fn = thanfiles.tempname()
+        dr = thandwg.ThanDrawing()
+        mes = T["New drawing has been created."]
+        zoomext = False
+    win.setDrawing(fn, dr)
+    thanfiles.addOpened((path("ThanCad"), None, ThanNull()))   #The first project is ThanCad itself; it has no window
+    thanfiles.addOpened(proj)
+    if zoomext: thanZoomExt1(proj)
+    dr.thanResetModified()
+    win.thanPrt(mes, "info")
+
+    try:
+        ret = win.thanBatchDo(fr)
+    finally:
+        fr.close()
+    win.thanCom.thanAppend("\n")
+    if ret == 0 and dr.thanIsModified():
+        win.thanPrter(T["Warning: the drawing was modified, but it was not saved."])
+    return ret
@@ -0,0 +1,440 @@
+##############################################################################
+# ThanCad 0.9.1 "Students2024": n-dimensional CAD with raster support for engineers
+#
+# Copyright (C) 2001-2025 Thanasis Stamos, May 20, 2025
+# Athens, Greece, Europe
+# URL: http://thancad.sourceforge.net
+# e-mail: cyberthanasis@gmx.net
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details (www.gnu.org/licenses/gpl.html).
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+##############################################################################
+"""\
+ThanCad 0.9.1 "Students2024": n-dimensional CAD with raster support for engineers
+
+This module defines a window which shows a ThanCad drawing without GUI. It
+reuses the high level getting and selection mixins of the Tk window, but
+it reads the input of the user from the lines of a script.
+"""
+
+import sys
+from collections import deque
+from math import cos, sin, hypot
+import p_ggen, p_gtkwid
+from p_gmath import ThanRectCoorTransf, thanRoundCenter, thanNear2
+import thancom, thanvar, thanfonts
+from thanvers import tcver
+from thanopt import thancadconf
+from thantrans import T
+from thantkgui.thantkguihighget import ThanTkGuiHighGet
+from thantkgui.thantkguihighdraw import ThanTkGuiHighDraw
+from thantkgui.thantkguilowget.thantkconst import THAN_STATE
+
+Canc = thanvar.Canc
+
+
+class ThanNull:
+    "An object which accepts any method call and attribute, and does nothing; it replaces the canvas, menus etc."
+
+    def __getattr__(self, name):
+        "Any attribute is a null object."
+        return self
+
+    def __call__(self, *args, **kw):
+        "Any method call returns an empty tuple (e.g. no canvas items were found)."
+        return ()
+
+
+class ThanBatchCmd:
+    "A command line which prints to a text file (stdout) and takes its input from the lines of a script."
+
+    def __init__(self, proj, fout=sys.stdout):
+        "Initialise the command line."
+        self.__proj = proj                    # A reference to ThanCad project
+        self.__fout = fout
+        self.thanPending = deque()            # Lines which were entered by the program (see thanEnter())
+        self.thanPrevCom = ""
+        self.thanMes = thanvar.DEFMES
+        self.thanCleanup()
+
+
+    def setProj(self):
+        "A new drawing is inserted to the current project; do some preprocessing."
+        self.thanCleanup()
+        self.thanPrevCom = ""
+
+
+    def thanAppend(self, mes, tags=()):
+        "Print a message."
+        self.__fout.write(mes)
+
+
+    def thanPrompt(self, mes=thanvar.DEFMES):
+        "Shows a prompt for the user to enter something."
+        self.thanMes = mes
+        self.thanAppend(mes)
+
+
+    def thanEnter(self, com, tags=()):
+        "Simulate keyboard: com is read before the next line of the script."
+        self.thanPending.append(com)
+
+
+    def thanPrepare(self, state, cc1=None, cc2=None, r1=None, t1=None):
+        "Sets the appropriate state and prepares for user input."
+        self.thanState = state
+        if state == THAN_STATE.POINT1: self.thanState = THAN_STATE.POINT
+        self.thanWaitingInput = True
+
+
+    def thanCleanup(self, message="", mesmode="info1"):
+        "User cancelled or gave the results in other way."
+        if message != "": self.thanAppend("%s\n" % message, mesmode)
+        self.thanState = THAN_STATE.NONE
+        self.thanLastResult = Canc
+        self.thanWaitingInput = True
+
+
+    def thanBeginCommandNest(self, t):
+        "The user entered a nested command; launch it."
+        c, fun = thancom.thanComFun(t)
+        if fun is not None:
+            if t != c: self.thanAppend("%s\n" % c, "com")
+            fun(self.__proj)
+        else:
+            self.thanAppend(T["Unrecognized command\n"], "can")
+
+
+    def thanClear(self): pass
+
+
+    def destroy(self):
+        "Deletes circular references."
+        del self.__proj
+
+
+class ThanBatchWin(ThanTkGuiHighGet, ThanTkGuiHighDraw):
+    """A window which contains one drawing, but it does not show it.
+
+    The coordinate transformation is computed for a virtual canvas with the
+    dimensions of thancadconf.thanCanvasdim, so that the commands which
+    depend on the size of a pixel (see thanGudGetDt()) work as in the Tk window."""
+
+    PNTSTATES = frozenset((THAN_STATE.POINT, THAN_STATE.POINT1, THAN_STATE.LINE, THAN_STATE.LINE2,
+        THAN_STATE.RECTANGLE, THAN_STATE.MOVE, THAN_STATE.ROADP, THAN_STATE.SPLINEP,
+        THAN_STATE.POLAR, THAN_STATE.AZIMUTH,
+        THAN_STATE.CIRCLE, THAN_STATE.CIRCLE2, THAN_STATE.CIRCLE3, THAN_STATE.ARC, THAN_STATE.ELLIPSEB))
+
+    def __init__(self, fout=sys.stdout):
+        "Initialise mixins and then this class."
+        ThanTkGuiHighGet.__init__(self)
+        ThanTkGuiHighDraw.__init__(self)
+        self.thanScheduler = thanvar.ThanScheduler()
+        self.thanProj = ["", None, self]
+        self.thanCanvas = ThanNull()
+        self.thanCanvas.thanState = THAN_STATE.NONE
+        self.thanMenu = ThanNull()
+        self.thanStatusBar = ThanNull()
+        self.thanCom = ThanBatchCmd(self.thanProj, fout)
+        self.thanScriptComs = ()
+        self.__lines = iter(())           # The lines of the script
+        self.__ncan = 0                   # Number of cancelled commands
+        self.__eof = False                # True if the script ended while a command waited for input
+
+
+    def setDrawing(self, fn, dr):
+        "Associate a ThanCad drawing with this drawing window."
+        self.thanProj[:2] = fn, dr
+        self.thanTitle = tcver.name + " - " + self.thanProj[0].name
+        self.thanSelectLayButton = False                 # NOT in selection mode
+        w, h = thancadconf.thanCanvasdim
+        self.__pixPort = (0, h, w, 0)
+        self.thanCt = ThanRectCoorTransf()
+        v = dr.viewPort
+        if thanNear2(v[:2], v[2:]): v[:] = 0.0, 0.0, float(w), float(h)
+        v[:] = self.thanGudZoomWin(v)
+
+        self.than = p_ggen.Struct("ThanCad batch methods and options container")
+        self.than.dc = self.thanCanvas
+        self.than.thanInfoPush = self.thanStatusBar.thanInfoPush
+        self.than.thanInfoPop = self.thanStatusBar.thanInfoPop
+        self.than.viewPort = dr.viewPort                     # Just a reference
+        self.than.thanPoints = thanfonts.thanPoints
+        self.than.thanFonts = thanfonts.thanFonts
+        self.than.imageFrameOn = dr.thanVar["imageframe"]
+        self.than.stereo = None
+        self.than.imageBrightness = 1.0
+        self.than.strang = dr.thanUnits.strang
+        self.than.strdir = dr.thanUnits.strdir
+        self.than.strdis = dr.thanUnits.strdis
+        self.than.strcoo = dr.thanUnits.strcoo
+        self.than.markselected = set()
+        self.than.ct = self.thanCt                            # Just a reference
+        self.than.thanTstyles = dr.thanTstyles                # Just a reference
+        self.than.thanLtypes  = dr.thanLtypes                 # Just a reference
+        self.than.thanDimstyles  = dr.thanDimstyles           # Just a reference
+        self.than.thanImages = self.thanImages = set()
+        self.than.fillModeOn = dr.thanVar["fillmode"]
+        self.than.draftTextOn = False
+        self.than.thanGudGetDt = self.thanGudGetDt
+        self.than.pixpermm = 96.0/25.4                        # A typical monitor
+        self.than.dash = []
+
+        self.thanImageCur = None
+        self.thanLineRecentTag = None
+        dr.thanLayerTree.thanCur.thanTkSet(self.than)
+        self.thanCom.setProj()
+        self.thanRegen()
+        return self.thanProj
+
+#===========================================================================
+
+    def thanBatchDo(self, lines):
+        """Runs the commands of the script lines; it returns the number of commands which failed.
+
+        The answers to the questions of the commands are the next lines of
+        the script. A blank line at the command prompt is ignored. The
+        script stops at the first command which is unknown, or it raises an
+        exception, or it is cancelled (including when the script ends
+        before the command finishes)."""
+        self.__lines = iter(lines)
+        cmd = self.thanCom
+        cmd.thanPrompt()
+        while True:
+            com1 = self.__nextLine()
+            if com1 is None: break
+            cmd.thanAppend("%s\n" % com1, "com")
+            com1 = com1.strip().lower()
+            if com1 == "":
+                cmd.thanPrompt()
+                continue
+            c, fun = thancom.thanComFun(com1)
+            if fun is None:
+                cmd.thanAppend(T["Unrecognized command\n"], "can")
+                return 1
+            if com1 != c: cmd.thanAppend("%s\n" % c, "com")   #Show the full name of the command
+            cmd.thanPrevCom = c
+            self.__ncan = 0
+            try:
+                fun(self.thanProj)
+            except Exception:
+                import traceback
+                traceback.print_exc()
+                return 1
+            finally:
+                self.thanProj[1].thanDirty.clear()   #Nothing is drawn: do not keep the changed (or erased) elements alive
+            if self.__ncan > 0 or self.__eof: return 1
+        return 0
+
+
+    def __nextLine(self):
+        "Returns the next line entered by the program or the next line of the script, or None at the end of the script."
+        cmd = self.thanCom
+        if cmd.thanPending: return cmd.thanPending.popleft()
+        for dline in self.__lines:
+            dline = dline.rstrip("\r\n")
+            if dline.lstrip()[:1] == "#": continue
+            return dline
+        return None
+
+
+    def thanWaitFor(self, mes, state, cc1=None, cc2=None, cc3=None, rr1=None, tt1=None, tt2=None):
+        "Reads the answer of the user from the next line of the script."
+        cmd = self.thanCom
+        while True:
+            cmd.thanPrompt(mes)
+            cmd.thanPrepare(state, cc1, cc2, rr1, tt1)
+            t = self.__nextLine()
+            if t is None:
+                cmd.thanCleanup("\n%s" % T["Script ended while a command was waiting for input."], "can")
+                self.__eof = True
+                return Canc, None
+            cmd.thanAppend("%s\n" % t, "com")
+            if state != THAN_STATE.TEXTRAW: t = t.strip()
+            if t[:1] == "'":
+                if self.thanNest:
+                    cmd.thanAppend("A nested command is currently being executed.\n"\
+                        "Please exit this nested command in order to begin a new one\n", "can")
+                    continue
+                self.thanNest = True
+                cmd.thanAppend("Beginning nested command..\n", "mes")
+                cmd.thanBeginCommandNest(t[1:])
+                cmd.thanAppend("Resuming original command\n", "mes")
+                self.thanNest = False
+                continue
+            res = self.__processEntry(t, state, cc1, tt1)
+            if res is not None: break
+        cmd.thanCleanup()
+        return res, None
+
+
+    def __processEntry(self, t, state, cc1, tt1):
+        "Transforms the text of the script to the result which state expects; None if the text is not valid."
+        dr = self.thanProj[1]
+        if state in self.PNTSTATES:
+            try:
+                nd   = dr.thanVar["dimensionality"]
+                elev = dr.thanVar["elevation"]
+                if t[0] == "@":            #relative coordinates
+                    if len(t) == 1:        #If relative coordinates are missing, then [0,0] are assumed
+                        cc = [0.0] * nd
+                    else:
+                        cc = self.__getCartOrPolar(t[1:], nd, elev)
+                    crel = dr.thanGetLastPoint()
+                    for i in range(nd): cc[i] += crel[i]
+                else:
+                    cc = self.__getCartOrPolar(t, nd, elev)
+            except (IndexError,ValueError):
+                return t
+            dr.thanSetLastPoint(cc)
+            return cc
+        elif state == THAN_STATE.RECTRATIO:
+            try: r = float(t)
+            except (IndexError,ValueError):
+                self.thanCom.thanAppend(T["Invalid real number. Try again.\n"], "can")
+                return None
+            cc = list(cc1)
+            cc[0] += r
+            cc[1] += r*tt1
+            return cc
+        elif state == THAN_STATE.ZOOMDYNAMIC or state == THAN_STATE.PANDYNAMIC:
+            return Canc       # no keyboard entry by definition
+        return t
+
+
+    def __getCartOrPolar(self, t, nd, elev):
+        "Get cartesian or polar coordinates; tansform polar to cartesian."
+        if "<" in t:
+            cc = [float(c1) for c1 in t.split("<")]
+            if len(cc) > 2: raise ValueError("Too many dimensions in polar coordinates")
+            if len(cc) < 2:  raise ValueError("Too few dimensions")
+            r, phi = cc
+            phi = self.thanProj[1].thanUnits.unit2rad(phi)   #Tranform angle from user units to rads
+            cc[0] = r*cos(phi)
+            cc[1] = r*sin(phi)
+        else:
+            cc = [float(c1) for c1 in t.split(",")]
+            if len(cc) > nd: raise ValueError("Too many dimensions")
+            if len(cc) < 2:  raise ValueError("Too few dimensions")
+        cc.extend(elev[len(cc):])
+        return cc
+
+
+    def thanGudCommandCan(self, mes=None, mestype="can"):
+        "Print (at least default) cancel message and reprompt; the script fails."
+        self.__ncan += 1
+        ThanTkGuiHighGet.thanGudCommandCan(self, mes, mestype)
+
+#===========================================================================
+
+    def thanGudGetReadFile(self, ext, tit, initialfile="", initialdir="", multiple=False):
+        "Gets a filename that exists, from the script."
+        while True:
+            fn = self.thanGudGetText("%s: " % tit, strict=False)
+            if fn == Canc or fn.strip() == "": return None
+            fn = p_gtkwid.thanAbsrelPath(fn.strip())
+            if fn.exists(): break
+            self.thanPrter(T["File %s does not exist. Try again."] % (fn,))
+        if multiple: return [fn]
+        return fn
+
+
+    def thanGudGetSaveFile(self, ext, tit, initialfile="", initialdir=""):
+        "Gets a filename that may exists, from the script."
+        fn = self.thanGudGetText("%s: " % tit, strict=False)
+        if fn == Canc or fn.strip() == "": return None
+        return p_gtkwid.thanAbsrelPath(fn.strip())
+
+
+    def thanGudGetDir(self, tit, initialdir="", mustexist=False):
+        "Gets a directory from the script."
+        fn = self.thanGudGetText("%s: " % tit, strict=False)
+        if fn == Canc or fn.strip() == "": return None
+        return p_gtkwid.thanAbsrelPath(fn.strip())
+
+
+    def thanGudAskOkCancel(self, message, title, default="cancel"):
+        "Shows message and returns true if the script answered yes."
+        a = self.thanGudGetYesno("%s: %s (yes/no): " % (title, message))
+        return a is True
+
+
+    def thanGudAskYesNo(self, message, title, default="yes"):
+        "Shows message and returns true if the script answered yes."
+        a = self.thanGudGetYesno("%s: %s (yes/no): " % (title, message))
+        return a is True
+
+
+    def thanGudModalMessage(self, message, title, icon=None):
+        "Show a message; it does not wait."
+        if icon == p_gtkwid.ERROR: self.thanPrter("%s: %s" % (title, message))
+        else:                      self.thanPrt("%s: %s" % (title, message), "info")
+
+#===========================================================================
+
+    def thanGudZoomWin(self, worPortn):
+        "Computes the viewport and the coordinate transformation; CALLER MUST ALTER proj[1].viewPort accordingly."
+        if thanNear2(worPortn[:2], worPortn[2:]):
+            self.thanPrter("Can not zoom/pan to window %s" % (worPortn,))
+            return tuple(self.thanProj[1].viewPort)
+        worPortn = thanRoundCenter(worPortn, self.__pixPort, per=6)
+        self.thanCt.set(worPortn, self.__pixPort)
+        return tuple(worPortn)
+
+
+    def thanGudGetDt(self, dpix=20):
+        "Returns length in units of length equal to dpix pixels."
+        dx, dy = self.thanCt.global2LocalRel(1.0, 1.0)
+        return hypot(1.0, 1.0)/hypot(dx, dy)*dpix    #This means that dt is about dpix pixels
+
+
+    def thanRegen(self):
+        "Nothing is drawn; only the extents of the active elements are computed."
+        self.thanProj[1].thanActUpdate()
+
+    def thanRegenIncr(self):
+        "Nothing is drawn; only the extents of the active elements are computed."
+        self.thanRegen()
+        return 0
+
+    def thanAutoRegen(self, regenImages=False):
+        "Nothing is drawn; only the extents of the active elements are computed."
+        self.thanRegen()
+
+    def thanCleanupRegen(self):
+        "There is no regen to abort."
+        return False
+
+    def thanRedraw(self): pass
+    def thanUpdateLayerButton(self, selected=False): pass
+    def thanTkSetFocus(self): pass
+    def focus_set(self): pass
+    def title(self, tit): pass
+    def lift(self): pass
+    def update(self): pass
+
+
+    def thanTkSet(self, elem=None):
+        "Sets the attributes of the layer that contains elem, or the current layer."
+        dr = self.thanProj[1]
+        if elem is None: lay = dr.thanLayerTree.thanCur
+        else:            lay = dr.thanLayerTree.dilay[elem.thanTags[1]]
+        lay.thanTkSet(self.than)
+
+
+    def destroy(self):
+        "Deletes circular references."
+        self.thanCom.destroy()
+        del self.thanScheduler, self.thanProj, self.thanCom
+        self.__dict__.pop("than", None)
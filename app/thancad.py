@@ -27,13 +27,29 @@ ThanCad 0.9.1 "Students2024": n-dimensional CAD with raster support for engineer
 """
 import sys
 print(__doc__)
-import thaninittest
-thaninittest.thanInitTest()  # This runs a test for the needed modules
-import thanopt
-thanopt.thanInitPregui()
-import thantkgui
-thanCad = thantkgui.ThanTkGuiWinMain()
-thanopt.thanInitPostgui()
+import thanstartprof
+prof = thanstartprof.thanStartProfile()  # Profile the startup if THANCAD_STARTPROF is set
+if sys.argv[1:2] == ["--batch"]:     # Run a script of commands without GUI, and exit
+    with prof.phase("thanopt.thanInitPregui"):
+        import thanopt
+        thanopt.thanInitPregui()
+    with prof.phase("import thanbatch"):
+        import thanbatch
+    prof.end()
+    sys.exit(thanbatch.thanBatchRun(sys.argv[2:]))
+with prof.phase("thaninittest.thanInitTest"):
+    import thaninittest
+    thaninittest.thanInitTest()  # This runs a test for the needed modules
+with prof.phase("thanopt.thanInitPregui"):
+    import thanopt
+    thanopt.thanInitPregui()
+with prof.phase("import thantkgui"):
+    import thantkgui
+with prof.phase("thantkgui.ThanTkGuiWinMain"):
+    thanCad = thantkgui.ThanTkGuiWinMain()
+with prof.phase("thanopt.thanInitPostgui"):
+    thanopt.thanInitPostgui()
+prof.end()
 if __name__ == "__main__":
     thanCad.mainloop()
     thanopt.thanInitEndgui()
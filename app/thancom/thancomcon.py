@@ -99,6 +99,7 @@ coms = \
   ("ddedit",      thancommod.thanModDDedit),
   ("ddlmodes",    thancomvar.thanFormLay),
   ("draworder",   thancomvar.thanDrawOrder),
+  ("drafttext",   thancomvar.thanVarDraftText),
   ("layer",       thancomvar.thanFormLay),
   ("decurve",     thancomdraw.thanDecurve),
   ("dem",         thancomeng.thanEngDem),
@@ -233,6 +234,7 @@ coms = \
   ("regen",       thancomview.thanRegen),
   ("rectangle",   thancomdraw.thanTkDrawRect),
   ("redo",        thancomedit.thanModRedo),
+  ("reproject",   thancomeng.thanEngReproject),
   ("reverse",     thancommod.thanModReverse),
   ("road",        lambda w, cl=thandr.ThanRoad,dr=dr: dr(w, cl)),
   ("rotate",      thancommod.thanModRotate),
@@ -250,6 +252,7 @@ coms = \
   ("synout",      lambda w: thancomfile.thanFileSaveas(w, ".syn")),
   ("tests",       thancomtest.thanTestLine1),
   ("thancad",     thancomvar.thanHelpVer),
+  ("thcxformat",  thancomfile.thanFileThcxFormat),
   ("tocurve",     thancomdraw.thanToCurve),
   ("topolygon",   thancomdraw.thanToPolygon),
   ("tospline",    thancomdraw.thanToSpline),
@@ -26,6 +26,7 @@ ThanCad 0.9.1 "Students2024": n-dimensional CAD with raster support for engineer
 Package which processes commands entered by the user.
 This module processes commands for educational/research purposes.
 """
+from p_ggen import configFile
 import thandr, thanobj
 from thanvar import Canc
 from thantrans import T, Tarch
@@ -115,7 +116,7 @@ def thanEdubiocityplan(proj):
         if len(dtmobjs) == 0: return proj[2].thanGudCommandCan(T["Can't preprocess: No DTM has been defined!"])
         dtm = dtmobjs[0].dtm
         proj[2].thanPrt(Tarch["Please wait, preprocessing may take several minutes.."])
-        bcp.pc.pol.build_cache(dtm, proj[2].thanPrt)
+        bcp.pc.pol.build_cache(dtm, proj[2].thanPrt, cachedir=_hippoCacheDir())   #Serial: do not fork the GUI
         bcp.pc.repairState()
         fn = proj[0].parent / proj[0].namebase + ".cache"
         proj[2].thanPrt("%s %s  ..." % (Tarch["Saving preprocessing results to"], fn))
@@ -132,3 +133,14 @@ def thanEdubiocityplan(proj):
             bcp.tkDraw(proj, bcp.pc.state)     #thanTouch is implicitly called
             bcp.wrState(proj)
         return proj[2].thanGudCommandEnd()
+
+
+def _hippoCacheDir():
+    "Return the directory where the preprocessing results of city plans are saved, or None if it can not be created."
+    d, terr = configFile("hippocache", "thancad")
+    if d is None: return None
+    try:
+        d.makedirs1()
+    except OSError:
+        return None
+    return d
@@ -282,7 +282,7 @@ def __demdrawbou(proj, demobjs):
     newport = None
     for demobj in demobjs:
         if isinstance(demobj.dtm, p_gearth.GDEM):
-            dems = demobj.dtm.cgiarDem.values()   #works for python2,3
+            dems = demobj.dtm.iterLoaded()        #All frames read so far, not only the cached ones
             nameprefix = demobj.dtm.name
         else:
             dems = [demobj.dtm]
@@ -646,6 +646,11 @@ def thanPointZ(proj, cp):
     return p_gtri.thanPointZ((obj.dtm for obj in iterDtmdems(proj)), cp)
 
 
+def thanPointsZ(proj, cc):
+    "Calculate the z coordinates of many points when multiple DTMs/DEMs are available; NaN where z is unknown."
+    return p_gtri.thanPointsZ((obj.dtm for obj in iterDtmdems(proj)), cc)
+
+
 def thanLineZ(proj, cp):
     "Calculate the z coordinates along the line cp when multiple DTMs/DEMs are available."
     return p_gtri.thanLineZ((obj.dtm for obj in iterDtmdems(proj)), cp)
@@ -704,9 +709,10 @@ def thanEngDtmpoints(proj):
     if res == Canc: return thanModCanc(proj)    # DTM lines was cancelled
     prt = proj[2].thanPrter1
     nlin = 0
-    for e in proj[2].thanSelall:
-        z = thanPointZ(proj, e.cc)
-        if z is None:
+    elems = list(proj[2].thanSelall)
+    zz = thanPointsZ(proj, [e.cc[:3] for e in elems])   #All the points at once
+    for e, z in zip(elems, zz.tolist()):                  #works for python2,3
+        if z != z:                                        #NaN: z is unknown
             prt(T["Can't compute z: No DTM lines are near the selected point."])
         else:
             e.cc[2] = z
@@ -850,27 +856,26 @@ def thanEngTrimake(proj):
     if res == Canc: return thanModCanc(proj)     # Create triangulation was cancelled
 
     cp = []
+    brk = []
     for e in proj[2].thanSelall:
         if isinstance(e, ThanLine):
             for cc in e.cp:
                 cp.append((None, cc[0], cc[1], cc[2]))
+            for ca, cb in p_ggen.iterby2(e.cp):
+                brk.append(((None, ca[0], ca[1], ca[2]), (None, cb[0], cb[1], cb[2])))
         elif isinstance(e, ThanPointNamed):
             cp.append((e.name, e.cc[0], e.cc[1], e.cc[2]))
         elif isinstance(e, ThanPoint):
             cp.append((None, e.cc[0], e.cc[1], e.cc[2]))
     tri = thanobj.ThanTri()
 #    ok, ter = tri.make(cp, convex=False, infinite=False)
-    ok, ter = tri.make(cp, convex=True, infinite=False)
+#    ok, ter = tri.make(cp, convex=True, infinite=False)   #Old engine; break lines with tri.brkapply()
+    ok, ter = tri.makemesh(cp, brk, infinite=False)      #Break lines are inserted natively
     if not ok: return thanModCanc(proj, T["Error creating triangulation: %s"]%ter)
-    tri.sortlinks()
-
-    proj[2].thanCom.thanAppend("Applying break lines..\n")
-    for e in proj[2].thanSelall:
-        if isinstance(e, ThanLine):
-            for ca, cb in p_ggen.iterby2(e.cp):
-                ca = (None, ca[0], ca[1], ca[2])
-                cb = (None, cb[0], cb[1], cb[2])
-                tri.brkapply(ca, cb)
+    if len(tri.brkfailed) > 0:
+        proj[2].thanPrt(T["Warning: %d break line segments could not be inserted into the triangulation:"] % len(tri.brkfailed), "can")
+        for ca, cb in tri.brkfailed:
+            proj[2].thanPrt("    (%.3f, %.3f) - (%.3f, %.3f)" % (ca[1], ca[2], cb[1], cb[2]), "can1")
 
     n = 0
     for _ in tri.itertriangles(1.0e100): n += 1     #Find all triangles regardless their dimenions
@@ -923,47 +928,122 @@ def thanEngGeodp(proj):
     Please update thandwg.thanExpKml code when adding/modifying geodetic projections to ThanCad."""
     proj[2].thanPrts(T["Current geodetic projection is "], "info1")
     proj[2].thanPrt(proj[1].geodp.pname, "info")
+    Lgeodpnew = getGeodp(proj)
+    if Lgeodpnew is Canc: return proj[2].thanGudCommandCan()     # Geod operation was cancelled
+    __setGeodp(proj, Lgeodpnew)
+
+    proj[2].thanPrts(T["Current geodetic projection is "], "info1")
+    proj[2].thanPrt(proj[1].geodp.pname, "info")
+
+    proj[1].thanTouch()
+    return proj[2].thanGudCommandEnd()
+
+
+def getGeodp(proj):
+    "Prompt the user to select a geodetic projection and return its parameters."
     mes = T["Select geodetic projection: Utm/transverse Mercator/Egsa87/Htrs07 or\nLambert conformal conic/ePsg3294/Identity (enter=E): "]
     res = proj[2].thanGudGetOpts(mes, default="E", options=("Utm", "Mercator", "Egsa87", "Htrs07", "Lambert", "P", "Identity"))
-    if res is Canc: return proj[2].thanGudCommandCan()     # Geod operation was cancelled
+    if res is Canc: return Canc                                      # Geod operation was cancelled
     if res == "u":
         zone = proj[2].thanGudGetInt2(T["UTM zone (1-60) (enter=34): "], default=34, limits=(1, 60), statonce="", strict=True)
-        if zone is Canc: return proj[2].thanGudCommandCan()     # Geod operation was cancelled
+        if zone is Canc: return Canc                                 # Geod operation was cancelled
         res = proj[2].thanGudGetOpts(T["North/South (enter=N): "], default="N", options=("North", "South"))
-        if res is Canc: return proj[2].thanGudCommandCan()     # Geod operation was cancelled
+        if res is Canc: return Canc                                  # Geod operation was cancelled
         north = res == "n"
         icodEOID = selEllips(proj)
-        if icodEOID is Canc: return proj[2].thanGudCommandCan()     # Geod operation was cancelled
-        Lgeodpnew = p_ggeod.params.fromUTM(icodEOID, zone, north)
+        if icodEOID is Canc: return Canc                             # Geod operation was cancelled
+        return p_ggeod.params.fromUTM(icodEOID, zone, north)
     elif res == "m":
-        return proj[2].thanGudCommandCan("Not yet implemented :(")
+        proj[2].thanPrter("Not yet implemented :(")
+        return Canc
     elif res == "e":
-        Lgeodpnew = p_ggeod.params.fromEgsa87()
+        return p_ggeod.params.fromEgsa87()
     elif res == "h":
-        Lgeodpnew = p_ggeod.params.fromHtrs07()
+        return p_ggeod.params.fromHtrs07()
     elif res == "l":
-        return proj[2].thanGudCommandCan("Not yet implemented :(")
+        proj[2].thanPrter("Not yet implemented :(")
+        return Canc
     elif res == "p":
-        Lgeodpnew = p_ggeod.params.fromEpsg3294()
+        return p_ggeod.params.fromEpsg3294()
     else:
         icodEOID = selEllips(proj)
-        if icodEOID is Canc: return proj[2].thanGudCommandCan()     # Geod operation was cancelled
-        Lgeodpnew = p_ggeod.params.fromGeodetic(icodEOID, angleunit=1)  #Decimal degrees)
-    geodpnew = p_ggeod.params.toProj(Lgeodpnew)
-    proj[1].Lgeodp = Lgeodpnew
-    proj[1].geodp = geodpnew
+        if icodEOID is Canc: return Canc                             # Geod operation was cancelled
+        return p_ggeod.params.fromGeodetic(icodEOID, angleunit=1)   #Decimal degrees)
+
 
+def __setGeodp(proj, Lgeodpnew):
+    "Set the geodetic projection of the drawing and of its DTMs/DEMs."
+    proj[1].Lgeodp = Lgeodpnew
+    proj[1].geodp = p_ggeod.params.toProj(Lgeodpnew)
     for obj in iterDtmdems(proj):
         if hasattr(obj.dtm, "thanSetProjection"):
             obj.dtm.thanSetProjection(proj[1].geodp)
 
+
+def thanEngReproject(proj):
+    """Transform all the elements of the drawing to another geodetic projection.
+
+    The coordinates of all the elements are gathered into one array, they
+    are transformed in a single batch (current projection -> GRS80 geodetic
+    -> new projection), and they are written back to the elements. The undo
+    record keeps the old and the new coordinates, so that undo/redo are exact."""
+    import numpy as np
     proj[2].thanPrts(T["Current geodetic projection is "], "info1")
     proj[2].thanPrt(proj[1].geodp.pname, "info")
+    Lgeodpnew = getGeodp(proj)
+    if Lgeodpnew is Canc: return proj[2].thanGudCommandCan()     # Reproject was cancelled
+    Lgeodpold = list(proj[1].Lgeodp)
+    if Lgeodpnew == Lgeodpold:
+        return proj[2].thanGudCommandCan(T["The drawing is already in this geodetic projection."])
+    geodpold = proj[1].geodp
+    geodpnew = p_ggeod.params.toProj(Lgeodpnew)
 
-    proj[1].thanTouch()
+    elems = [e for lay in proj[1].thanLayerTree.dilay.values() for e in lay.thanQuad   #works for python2,3
+             if isinstance(e, thandr.ThanElement)]
+    pw = p_gtkwid.ProgressWin(proj[2], 1000, T["Reprojecting.."])  # (Gu)i (d)ependent
+    def progress(i, n):
+        "Show progress and return True if the user cancelled."
+        if n: pw.update(min(1000, i*1000//n))
+        return pw.stopComputation
+    try:
+        ccold, elems = pw.start(proj[1].thanGatherCoords, elems, progress)
+    finally:
+        pw.destroy()
+    if ccold is None: return proj[2].thanGudCommandCan(T["Reproject was cancelled by the user."])
+    if len(ccold) == 0: return proj[2].thanGudCommandCan(T["No elements to reproject."])
+
+    lam, phi = geodpold.en2geodetGRS80s(ccold[:, 0], ccold[:, 1])
+    x, y = geodpnew.geodetGRS802ens(lam, phi)
+    ccnew = ccold.copy()
+    ccnew[:, 0] = x
+    ccnew[:, 1] = y
+    nbad = int((~np.isfinite(ccnew[:, :2])).any(axis=1).sum())
+    if nbad > 0:
+        return proj[2].thanGudCommandCan(T["%d points can not be transformed to the new geodetic projection."] % (nbad,))
+
+    __reprojectDo(proj, elems, ccnew, Lgeodpnew)
+    proj[1].thanDoundo.thanAdd("reproject", __reprojectDo, (elems, ccnew, Lgeodpnew),
+                                            __reprojectDo, (elems, ccold, Lgeodpold))
+    proj[2].thanPrt(T["%d elements (%d points) were reprojected."] % (len(elems), len(ccnew)), "info1")
     return proj[2].thanGudCommandEnd()
 
 
+def __reprojectDo(proj, elems, cc, Lgeodp):
+    "Write coordinates cc to the elements and set the geodetic projection; it actually does the job."
+    pw = p_gtkwid.ProgressWin(proj[2], 1000, T["Reprojecting.."])  # (Gu)i (d)ependent
+    def progress(i, n):
+        "Show progress."
+        if n: pw.update(min(1000, i*1000//n))
+    try:
+        pw.start(proj[1].thanScatterCoords, elems, cc, progress)
+    finally:
+        pw.destroy()
+    __setGeodp(proj, Lgeodp)
+    proj[2].thanPrts(T["Current geodetic projection is "], "info1")
+    proj[2].thanPrt(proj[1].geodp.pname, "info")
+    thancomview.thanZoomExt1(proj)
+
+
 def selEllips(proj):
     "Prompt the user to select geodetic ellipsoid."
     res = proj[2].thanGudGetOpts(T["Select ellipsoid: g=GRS80/w=WGS84/r=Greek87/n=NAD83 (enter=g): "], default="g", options=("g", "w", "r", "n"))
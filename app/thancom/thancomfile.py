@@ -37,7 +37,7 @@ import thandwg, thanimp, thanexp, thantkdia, thanvers, thandr
 import thanopt, thanlayer
 from thantrans import T
 from thanvar import Canc, thanfiles
-from . import thancomview, thanrwf, thancomsel, thanundo
+from . import thancomview, thanrwf, thanrwb, thancomsel, thanundo
 from .thancommod import thanModCanc, thanModEnd
 
 mm = p_gtkwid.thanGudModalMessage
@@ -201,15 +201,8 @@ def thanFileOpenPaths(proj, fns, impClass=_importClass, forceunload=False):
     for fn in fns:
             index1 = proj[2].thanCom.index(tkinter.END+"-1c")  #TkGui dependent: get end position of command window
             fn = path(fn)
-            if fn.ext in impClass:
-                dr, zoomext = impFile(proj, fn, impClass[fn.ext][1])
-                success = "%s: %s" % (fn.name, T["file has been successfully imported."])
-            else:
-                dr = openThcx(proj, fn, forceunload)
-                success = T["Existing drawing has been opened."]
-                zoomext = False
+            dr, success, zoomext = thanFileReadPath(proj, fn, impClass, forceunload)
             if dr is not None:
-                dr.thanRepair()       # Try to rectify older versions of .thcx files
                 nopened += 1
                 replace = proj[1]     #in case proj is ThanCad and not another drawing. If proj is ThanCad then proj[1] is None
                 replace = replace and (not proj[1].thanIsModified())
@@ -219,6 +212,23 @@ def thanFileOpenPaths(proj, fns, impClass=_importClass, forceunload=False):
     return nopened
 
 
+def thanFileReadPath(proj, fn, impClass=_importClass, forceunload=False):
+    """Reads (opens or imports) a drawing from a file with known path, without creating a window.
+
+    It returns the drawing (or None if it failed), the success message and
+    True if the drawing should be zoomed to its extents."""
+    if fn.ext in impClass:
+        dr, zoomext = impFile(proj, fn, impClass[fn.ext][1])
+        success = "%s: %s" % (fn.name, T["file has been successfully imported."])
+    else:
+        dr = openThcx(proj, fn, forceunload)
+        success = T["Existing drawing has been opened."]
+        zoomext = False
+    if dr is not None:
+        dr.thanRepair()       # Try to rectify older versions of .thcx files
+    return dr, success, zoomext
+
+
 
 def __openBZ2(proj, fn, dr, encoding):
     "Open thcx file stored as either BZ2 compessed or text, with encoding."
@@ -234,16 +244,30 @@ def __openBZ2(proj, fn, dr, encoding):
     return frf
 
 
+def __openBin(proj, fn, dr):
+    "Open thcx file stored as binary chunks."
+    projtemp = (fn, dr, proj[2])      #Make a temporary project for ThanRfile
+    fb = open(fn, "rb")
+    try:
+        return thanrwb.ThanRBinfile(fb, projtemp, fn)
+    except:
+        fb.close()
+        raise
+
+
 def openThcx(proj, fn, forceunload):
     "Opens a thancad xml like file."
     dr = thandwg.ThanDrawing()
     try:
         try:
-            frf = __openBZ2(proj, fn, dr, "utf_8")      #Open temporarily to read version
-            version = dr.thanReadVersion(frf)   #May raise ValueError if invalid version
-            frf.thanDestroy()
-            if version < (0,4,0): frf = __openBZ2(proj, fn, dr, "iso8859_7") #reopen with old encoding
-            else:                 frf = __openBZ2(proj, fn, dr, "utf_8")     #reopen with UTF8
+            if thanrwb.isThcBin(fn):
+                frf = __openBin(proj, fn, dr)          #Binary chunks are always utf_8
+            else:
+                frf = __openBZ2(proj, fn, dr, "utf_8")      #Open temporarily to read version
+                version = dr.thanReadVersion(frf)   #May raise ValueError if invalid version
+                frf.thanDestroy()
+                if version < (0,4,0): frf = __openBZ2(proj, fn, dr, "iso8859_7") #reopen with old encoding
+                else:                 frf = __openBZ2(proj, fn, dr, "utf_8")     #reopen with UTF8
             dr.thanImpThc(frf, forceunload, prt=proj[2].thanPrt) #may raise ValueError and other exceptions
         except StopIteration as why:
             raise IOError("Incomplete file: end of file encountered")
@@ -288,13 +312,25 @@ def impFile(proj, fn, ImportClass, defaultLayer="0", defaultLgeodp=None):
         dr.geodp = p_ggeod.params.toProj(proj[1].Lgeodp)
 #---import
     ts = thanimp.ThanCadDrSave(dr, proj[2].thanPrt)
-    imp = ImportClass(finp, ts, defaultLayer)
+    pw = p_gtkwid.ProgressWin(proj[2], 1000, "%s: %s" % (fn.name, T["importing.."]))  # (Gu)i (d)ependent
+    def progress(nread, ntotal):
+        "Show progress and return True if the user cancelled the import."
+        if ntotal: pw.update(min(1000, nread*1000//ntotal))
+        return pw.stopComputation
+    imp = ImportClass(finp, ts, defaultLayer, progress)
     try:
-        imp.thanImport()
+        try:
+            pw.start(imp.thanImport)
+        finally:
+            pw.destroy()
     except ThanImportError as e:
+        cancelled = imp.thanCancel
         del imp
         finp.close()
         dr.thanDestroy()
+        if cancelled:
+            proj[2].thanGudCommandEnd(T["Import was cancelled by the user."], "can")
+            return None, None
         print("impFile: type of exception:", type(e))
         mm(proj[2], str(e), "%s: %s" % (fn.name, fail), p_gtkwid.ERROR)            # (Gu)i (d)ependent
         proj[2].thanGudCommandEnd(fail, "can")
@@ -565,6 +601,21 @@ def thanFileSaveas(proj, suf1=None):
         if nopened > 0: return                             # OK
 
 
+def thanFileThcxFormat(proj):
+    """Chooses the format of the saved .thcx drawings: bz2 xml text or binary chunks.
+
+    Binary .thcx files are decompressed in parallel when they are opened, but
+    older ThanCad versions can not read them. The choice is kept in thancad.conf."""
+    cur = "B" if thanopt.thancadconf.thanSaveBinary else "T"
+    mes = T["Save .thcx drawings as Text/Binary (enter=%s): "] % (cur,)
+    res = proj[2].thanGudGetOpts(mes, default=cur, options=("Text", "Binary"))
+    if res == Canc: return proj[2].thanGudCommandCan()     # Format selection was cancelled
+    thanopt.thancadconf.thanSaveBinary = res == "b"
+    if res == "b": mes = T["Drawings will be saved as binary .thcx (faster to open; older ThanCad versions can not read them)."]
+    else:          mes = T["Drawings will be saved as text .thcx."]
+    proj[2].thanGudCommandEnd(mes, "info")
+
+
 def thanFileExportSpreadx(proj, eltype):
     "Export user selected points or lines to an .xlsx/.xls file."
     try:
@@ -689,9 +740,14 @@ def thanFileSavePath(proj, fn):
     else:
         try:
             #fw = bz2.BZ2File(fn, "w", 0, 1)
-            fw = bz2.open(fn, "wt", compresslevel=1, encoding="utf_8", errors="surrogateescape")
-            fwf = thanrwf.ThanWfile(fw, proj, fn)
+            if thanopt.thancadconf.thanSaveBinary:       #Binary chunks are opt-in
+                fw = open(fn, "wb")
+                fwf = thanrwb.ThanWBinfile(fw, proj, fn)
+            else:
+                fw = bz2.open(fn, "wt", compresslevel=1, encoding="utf_8", errors="surrogateescape")
+                fwf = thanrwf.ThanWfile(fw, proj, fn)
             proj[1].thanExpThc(fwf)
+            fwf.thanFlush()
             fwf.thanDestroy()
             fw.close()
             success = T["Drawing saved in %s."] % fn
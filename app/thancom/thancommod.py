@@ -1176,6 +1176,7 @@ def __purgeobjects(proj):
 
 def thanModPurgelay(proj):
     "Purges unused declarations; for the moment unused layer declarations (but not the current and its parents)."
+    import thanlayer
     lt = proj[1].thanLayerTree
     cl, newRoot = thanundo.thanLtClone(proj)
 
@@ -1198,7 +1199,7 @@ def thanModPurgelay(proj):
         chlay.thanUnlink()        # remove chlay and hierarchy from parent's children
         chlay.thanDestroy()       # Delete chlay and hierarchy
         if len(lay.thanChildren) == 0:  # This is leaf layer now; it can hold elements
-            lay.thanQuad = set()
+            lay.thanQuad = thanlayer.ThanQuad()
             lay.thanTag = lay.lt.thanIdLay.new()  # In order to exploit TK mechanism
     cl.thanQuad.remove(None)
     oldCl = lt.thanCur
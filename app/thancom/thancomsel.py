@@ -39,8 +39,8 @@ def thanSelectOr(proj, standalone=True, filter=None, optionname="", optiontext="
     "Select objects or general select command."
     proj[2].thanGudSetSelSave()                              # Save old selection
     selmodified = False
-    stat = T["Select an element (w=window/c=crossing/l=layers/f=layer of/p=previous/%s): "] % optiontext
-    opts = "", "window", "crossing", "layers", "f", "previous", optionname
+    stat = T["Select an element (w=window/c=crossing/fence/wpolygon/cpolygon/l=layers/f=layer of/p=previous/%s): "] % optiontext
+    opts = "", "window", "crossing", "layers", "f", "previous", "fence", "wpolygon", "cpolygon", optionname
     proj[2].thanSel1coor = None
     proj[2].thanCanvas.thanChs.thanPush(-2)                  # Save previous croshair; set rectangle croshair
     proj[2].thanGudSetSelExternalFilter(filter)
@@ -68,6 +68,11 @@ def thanSelectOr(proj, standalone=True, filter=None, optionname="", optiontext="
             res = __corner2(proj, c1, com)
             if res == Canc: continue
             proj[2].thanSel1coor = None                      # This is the first point in the 'break' command
+        elif com in ("fence", "wpolygon", "cpolygon"):     # Select fence/polygon
+            proj[2].thanCanvas.thanChs.thanSet(0)            # Set big croshair
+            res = __fence(proj, com)
+            if res == Canc: continue
+            proj[2].thanSel1coor = None                      # This is the first point in the 'break' command
         elif com == "l":                                     # Select layer(s)
             proj[2].thanCanvas.thanChs.thanSet(0)            # Set big croshair
             res = proj[2].thanGudGetLayerleafs(T["Select layer(s)"])
@@ -109,8 +114,8 @@ def thanSelectOr(proj, standalone=True, filter=None, optionname="", optiontext="
         if first and com == "": assert enter != 0; break    #A special meaning was given to enter; it was processed; end now
         if first:
             first = False
-            stat = T["Select an element (w=window/c=crossing/l=layers/f=layer of/p=previous): "]
-            opts = "", "window", "crossing", "layers", "f", "previous"
+            stat = T["Select an element (w=window/c=crossing/fence/wpolygon/cpolygon/l=layers/f=layer of/p=previous): "]
+            opts = "", "window", "crossing", "layers", "f", "previous", "fence", "wpolygon", "cpolygon"
 
     proj[2].thanCanvas.thanChs.thanPop()                     # Restore previous croshair
     proj[2].thanGudSetSelcurClear()                          # Clears current selection (which is already inside selall)
@@ -128,8 +133,8 @@ def thanSelectGen(proj, standalone=True, filter=None):
     "General select command."
     proj[2].thanGudSetSelSave()                              # Save old selection
     selmodified = False
-    stat = T["Select an element (w=window/c=crossing/l=layers/f=layer of/p=previous): "]
-    opts = "", "window", "crossing", "layers", "f", "previous"
+    stat = T["Select an element (w=window/c=crossing/fence/wpolygon/cpolygon/l=layers/f=layer of/p=previous): "]
+    opts = "", "window", "crossing", "layers", "f", "previous", "fence", "wpolygon", "cpolygon"
     proj[2].thanSel1coor = None
     proj[2].thanCanvas.thanChs.thanPush(-2)                  # Save previous croshair; set rectangle croshair
     proj[2].thanGudSetSelExternalFilter(filter)
@@ -149,6 +154,11 @@ def thanSelectGen(proj, standalone=True, filter=None):
             res = __corner2(proj, c1, com)
             if res == Canc: continue
             proj[2].thanSel1coor = None                      # This is the first point in the 'break' command
+        elif com in ("fence", "wpolygon", "cpolygon"):     # Select fence/polygon
+            proj[2].thanCanvas.thanChs.thanSet(0)            # Set big croshair
+            res = __fence(proj, com)
+            if res == Canc: continue
+            proj[2].thanSel1coor = None                      # This is the first point in the 'break' command
         elif com == "l":                                     # Select layer(s)
             proj[2].thanCanvas.thanChs.thanSet(0)            # Set big croshair
             res = proj[2].thanGudGetLayerleafs(T["Select layer(s)"])
@@ -223,6 +233,21 @@ def __corner2(proj, c1, com):
     return res
 
 
+def __fence(proj, com):
+    "Get the points of a fence or a window/crossing polygon and select."
+    c1 = proj[2].thanGudGetPoint(T["First point: "])
+    if c1 == Canc: return c1                                        # Selection cancelled
+    cf = [c1]
+    while True:
+        c2 = proj[2].thanGudGetLine(cf[-1], T["Next point (enter=end): "], options=("",))
+        if c2 == Canc: return c2                                    # Selection cancelled
+        if c2 == "": break
+        cf.append(c2)
+    if com == "fence":
+        return proj[2].thanGudGetSelFence(cf)                       # Select fence
+    return proj[2].thanGudGetSelPolygon(cf, crossing=com=="cpolygon")  # Select window/crossing polygon
+
+
 def thanSelect1Gen(proj, stat, filter=None, options=()):
     """Selects 1 (breakable) element (of a certain class).
 
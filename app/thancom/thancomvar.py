@@ -143,6 +143,28 @@ def __regensolidshatches(proj, fimo):
     proj[1].thanTouch()
 
 
+def thanVarDraftText(proj):
+    "Set draft text mode on or off."
+    proj[2].thanPrt(T["In draft text mode, horizontal texts are drawn with canvas fonts: fast, but not accurate."])
+    prev = bool(proj[2].than.draftTextOn)
+    defa = ("OFF", "ON")[prev]
+    mes = T["Enter mode [ON/OFF] <%s>: "] % (defa, )
+    drte = proj[2].thanGudGetOnoff(mes, default=defa)
+    if drte == Canc: return proj[2].thanGudCommandCan()
+    __setdrafttext(proj, drte)
+    proj[1].thanDoundo.thanAdd("drafttext", __setdrafttext, (drte,),
+                                            __setdrafttext, (prev,))
+    proj[2].thanGudCommandEnd()
+
+
+def __setdrafttext(proj, drte):
+    "Set draft text mode and regenerate the drawing if the mode changed."
+    drte = bool(drte)
+    if drte == proj[2].than.draftTextOn: return
+    proj[2].than.draftTextOn = drte
+    proj[2].thanRegen()                         #All kinds of elements may contain text
+
+
 def thanVarOrtho(proj):
     "Set ortho mode on or off."
     prev = proj[2].thanCanvas.thanOrtho.toggle()   #Toggle
@@ -0,0 +1,248 @@
+##############################################################################
+# ThanCad 0.9.1 "Students2024": n-dimensional CAD with raster support for engineers
+#
+# Copyright (C) 2001-2025 Thanasis Stamos, May 20, 2025
+# Athens, Greece, Europe
+# URL: http://thancad.sourceforge.net
+# e-mail: cyberthanasis@gmx.net
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details (www.gnu.org/licenses/gpl.html).
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+##############################################################################
+"""\
+ThanCad 0.9.1 "Students2024": n-dimensional CAD with raster support for engineers
+
+This module implements the binary chunked container of .thcx files.
+
+The container holds the same thc text as the bz2 format, but the elements
+of each layer are stored in a separate chunk, and the coordinates of the
+nodes of the elements are stored as packed float64 arrays instead of text.
+All chunks are compressed with zlib. A table of contents at the end of the
+file gives the offset, the size, the number of elements and the bounding
+rectangle of each layer chunk, so that the chunks can be decompressed in
+parallel (zlib releases the GIL). The container is written only if the
+option thanSaveBinary is set; bz2 text remains the default .thcx format.
+
+Layout:   MAGIC major minor tocoffset | head | layer chunks | tail | toc
+"""
+
+import sys, struct, zlib, json, io
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from .thanrwf import ThanRfile, ThanWfile
+
+MAGIC = b"THCXBIN\0"
+FORMAT = (1, 0)                       # Version of the container (not of the thc text)
+_HEADER = struct.Struct("<8sHHQ")     # magic, major, minor, offset of table of contents
+_ENCODING = "utf_8"
+_MAXTHREADS = 4
+_SWAP = sys.byteorder != "little"
+
+
+def isThcBin(fn):
+    "Return True if file fn is a binary chunked .thcx file."
+    try:
+        with open(fn, "rb") as fb:
+            return fb.read(len(MAGIC)) == MAGIC
+    except (IOError, OSError):
+        return False
+
+
+class ThanWBinfile(ThanWfile):
+    "A wrapper of a binary file which writes thc text and packed coordinates in chunks."
+
+    def __init__(self, fw, proj, name=None, complevel=1):
+        "Initialize buffers; fw must be a binary file opened for writing."
+        ThanWfile.__init__(self, fw, proj, name)
+        self.complevel = complevel
+        self.head = []           # Text before the elements (and after them: see self.isplit)
+        self.isplit = None       # Position in self.head where the layer chunks are inserted
+        self.chunks = []         # (layname, text, coords, n, xymm) for each layer
+        self.out = self.head
+        self.coords = None       # Packed coordinates of the current layer chunk
+
+    def writeb(self, s):
+        "Buffer the string to the current chunk."
+        self.out.append(s)
+
+    def writeLayerBeg(self, layname):
+        "Begin the chunk of the elements of a layer."
+        if self.isplit is None: self.isplit = len(self.head)
+        self.out = []
+        self.coords = array("d")
+
+    def writeLayerEnd(self, layname, n, xymm):
+        "End the chunk of the elements of a layer; n elements within rectangle xymm were written."
+        self.chunks.append((layname, self.out, self.coords, n, xymm))
+        self.out = self.head
+        self.coords = None
+
+    def writeNode(self, cc):
+        "Write node as packed coordinates if inside a layer chunk."
+        if self.coords is None: return ThanWfile.writeNode(self, cc)
+        self.writeb("%s<NODEB %d />\n" % (self.ind, len(cc)))
+        self.coords.extend(cc)
+
+    def writeNodes(self, cs):    #may accept an iterator of nodes
+        "Write many nodes as packed coordinates if inside a layer chunk and all nodes have the same dimensions."
+        cs = list(cs)
+        nd = len(cs[0]) if len(cs) > 0 else 2
+        if self.coords is None or any(len(cc) != nd for cc in cs):
+            return ThanWfile.writeNodes(self, cs)
+        self.writeb("%s<NODESB %d %d />\n" % (self.ind, len(cs), nd))
+        co = self.coords
+        for cc in cs: co.extend(cc)
+
+    def __encode(self, out):
+        "Join buffered strings and encode them."
+        return "".join(out).encode(_ENCODING, "surrogateescape")
+
+    def thanFlush(self):
+        "Compress the chunks (in parallel) and write them to the file with the table of contents."
+        if self.isplit is None: self.isplit = len(self.head)
+        raws = [self.__encode(self.head[:self.isplit])]
+        for layname, out, coords, n, xymm in self.chunks:
+            raws.append(self.__encode(out))
+            if _SWAP: coords.byteswap()            #Always little endian
+            raws.append(coords.tobytes())
+        raws.append(self.__encode(self.head[self.isplit:]))
+        with ThreadPoolExecutor(_MAXTHREADS) as ex:
+            zs = list(ex.map(lambda b: zlib.compress(b, self.complevel), raws))
+
+        fw = self.fw
+        fw.write(_HEADER.pack(MAGIC, FORMAT[0], FORMAT[1], 0))
+        offs = []
+        for z in zs:
+            offs.append([fw.tell(), len(z)])
+            fw.write(z)
+        toc = {"format": FORMAT, "head": offs[0], "tail": offs[-1], "layers": []}
+        for i, (layname, _, coords, n, xymm) in enumerate(self.chunks):
+            toc["layers"].append({"name": layname, "n": n, "xymm": xymm,
+                "text": offs[1+2*i], "coords": offs[2+2*i]})
+        itoc = fw.tell()
+        fw.write(zlib.compress(json.dumps(toc).encode(_ENCODING), self.complevel))
+        fw.seek(0)
+        fw.write(_HEADER.pack(MAGIC, FORMAT[0], FORMAT[1], itoc))
+        fw.seek(0, 2)
+
+
+class ThanRBinfile(ThanRfile):
+    "A wrapper of a binary chunked file, which reads thc text and packed coordinates."
+
+    def __init__(self, fb, proj, name=None):
+        "Read the table of contents; fb must be a binary file opened for reading."
+        self.fb = fb
+        try:
+            magic, major, minor, itoc = _HEADER.unpack(fb.read(_HEADER.size))
+        except struct.error:
+            raise ValueError("Incomplete binary .thcx file")
+        if magic != MAGIC: raise ValueError("Not a binary .thcx file")
+        if major != FORMAT[0]: raise ValueError("Unknown binary .thcx format: %d.%d" % (major, minor))
+        if itoc < _HEADER.size: raise ValueError("Incomplete binary .thcx file: table of contents is missing")
+        fb.seek(itoc)
+        try:
+            toc = json.loads(_unzip(fb.read()).decode(_ENCODING))
+            ok = tuple(toc["format"]) == (major, minor) and "head" in toc and "tail" in toc and \
+                 all("text" in t and "coords" in t for t in toc["layers"])
+        except (ValueError, KeyError, TypeError, UnicodeError):
+            ok = False
+        if not ok: raise ValueError("Corrupted binary .thcx file: invalid table of contents")
+        self.toc = toc
+        self.coords = None
+        self.icoord = 0
+        ThanRfile.__init__(self, self.__iterLines(), proj, name)
+        if name is None: self.filnam = getattr(fb, "name", "<Unknown>")
+
+    def thanDestroy(self):
+        "Break circular references and close the file."
+        self.fb.close()
+        del self.fb, self.coords
+        ThanRfile.thanDestroy(self)
+
+    def __readRaw(self, offlen):
+        "Read a compressed chunk at known offset and length."
+        self.fb.seek(offlen[0])
+        return self.fb.read(offlen[1])
+
+    def __iterLines(self):
+        "Yield the lines of the head, of all layer chunks and of the tail; chunks are decompressed in parallel."
+        toc = self.toc
+        for dline in _textLines(_unzip(self.__readRaw(toc["head"]))): yield dline
+        with ThreadPoolExecutor(_MAXTHREADS) as ex:
+            futs = [ex.submit(_decompress, self.__readRaw(t["text"]), self.__readRaw(t["coords"]))
+                    for t in toc["layers"]]
+            for fut in futs:
+                text, self.coords = fut.result()
+                self.icoord = 0
+                for dline in _textLines(text): yield dline
+        self.coords = None
+        for dline in _textLines(_unzip(self.__readRaw(toc["tail"]))): yield dline
+
+    def __take(self, n):
+        "Return the next n packed coordinates."
+        i = self.icoord
+        if self.coords is None or i+n > len(self.coords): raise ValueError("Packed coordinates are missing")
+        self.icoord = i+n
+        return self.coords[i:i+n].tolist()
+
+    def readNode(self):
+        "Read a node as packed coordinates or as text."
+        dl = next(self).split()
+        if dl[0] != "<NODEB":                      #May raise IndexError
+            self.unread()
+            return ThanRfile.readNode(self)
+        nt = int(dl[1])                            #May raise ValueError, IndexError
+        if nt < 2: raise ValueError("At least 2 coordinates were expected")
+        cc = self.__take(nt)
+        if nt >= self.nelev: return cc[:self.nelev]
+        return cc + self.elev[nt:]
+
+    def readNodes(self):
+        "Read many nodes as packed coordinates or as text."
+        dl = next(self).split()
+        if dl[0] != "<NODESB":                      #May raise IndexError
+            self.unread()
+            return ThanRfile.readNodes(self)
+        n, nt = int(dl[1]), int(dl[2])             #May raise ValueError, IndexError
+        if nt < 2: raise ValueError("At least 2 coordinates were expected")
+        vals = self.__take(n*nt)
+        if nt >= self.nelev: return [vals[j:j+nt] for j in range(0, n*nt, nt)]
+        el = self.elev[nt:]
+        return [vals[j:j+nt]+el for j in range(0, n*nt, nt)]
+
+    def iterNodes(self):
+        "Read many nodes and return 1 by 1."
+        return iter(self.readNodes())
+
+
+def _decompress(text, coords):
+    "Decompress the text and the coordinates of a layer chunk."
+    coo = array("d")
+    coo.frombytes(_unzip(coords))
+    if _SWAP: coo.byteswap()
+    return _unzip(text).decode(_ENCODING, "surrogateescape"), coo
+
+
+def _unzip(b):
+    "Decompress a chunk; raise ValueError if it is corrupted."
+    try:
+        return zlib.decompress(b)
+    except zlib.error as why:
+        raise ValueError("Corrupted binary .thcx file: %s" % (why,))
+
+
+def _textLines(b):
+    "Iterate over the lines of a chunk of text (bytes or str)."
+    if isinstance(b, bytes): b = b.decode(_ENCODING, "surrogateescape")
+    return io.StringIO(b, newline="")
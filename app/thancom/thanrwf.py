@@ -257,6 +257,18 @@ class ThanWfile(object):
         #    self.fw.write(s)
         self.fw.write(s)
 
+    def writeLayerBeg(self, layname):
+        "Begin the elements of a layer; the text format does not need it."
+        pass
+
+    def writeLayerEnd(self, layname, n, xymm):
+        "End the elements of a layer; the text format does not need it."
+        pass
+
+    def thanFlush(self):
+        "Write any buffered data; the text format writes directly to the file."
+        pass
+
     def writeEnd(self, s):
         "Write end of element."
         self.writeb("%s</%s>\n" % (self.ind, s))
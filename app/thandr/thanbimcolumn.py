@@ -325,6 +325,9 @@ class ThanBimColumn(ThanLine):
         ds = [by2, bx2, 0, 0, 0, 0]
         self.thanSet(self.itype, self.name, cc, ds, theta, spin=self.spin, cargo=None)
 
+
+    thanCoords = ThanElement.thanCoords     #Derived points (not only nodes) are transformed
+
     #def thanTkDraw(self, than):   #Inherited
     #def thanClone(self):          #Inherited
     #def thanUntag(self):          #Inherited
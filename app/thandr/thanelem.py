@@ -43,6 +43,7 @@ class ThanElement:
     """
     thanTkCompound = 1         # The number of Tkinter objects that make the element. 1=No compound object
     thanElementName = "GENERIC"    # Name of the element's class
+    thanSnapTypes = frozenset()    # Osnap types which are found by thanSnapPoints() (see thanlayer.ThanQuad)
 
     def __init__ (self):
         "Make the elements with invalid thanTags invalid handle."
@@ -121,6 +122,15 @@ class ThanElement:
         return None
 
 
+    def thanSnapPoints(self):
+        """Return the osnap points, of the types in thanSnapTypes, as a list of (type, coordinates).
+
+        These are the osnap points which do not depend on the position of the
+        cursor (for example the endpoints of a line), and thus they can be
+        kept in a spatial index. thanOsnap() should still find these types."""
+        return ()
+
+
     def thanPntNearest(self, ccu):
         "Finds the nearest point of this line to a point."
         return None
@@ -241,6 +251,23 @@ class ThanElement:
         it shape. Otherwise the best fit."""
         pass
 
+
+    def thanCoords(self):
+        """Return the points which thanTransform() passes to the transformation function, in the same order.
+
+        The element is not changed. By default the points are recorded while
+        a clone of the element is transformed; elements which simply transform
+        their nodes return the nodes directly."""
+        if type(self).thanTransform is ThanElement.thanTransform: return []   #No coordinates
+        cc = []
+        def record(c):
+            "Keep the point and return it unchanged."
+            c = list(c[:3])
+            cc.append(c)
+            return c
+        self.thanClone().thanTransform(record)
+        return cc
+
 #---Reasonable default behavior of elements
 
 
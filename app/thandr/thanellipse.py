@@ -39,6 +39,7 @@ from .thanpoint import ThanPoint
 class ThanEllipse(ThanCurve):
     """An ellipse represented by a polygon."""
     thanElementName = "ELLIPSE"    # Name of the element's class
+    thanSnapTypes = frozenset()    # The osnap points are found by thanOsnap() only
 
     def thanSet (self, cc, a, b, theta1, theta2, phi, full, spin=1):
         "Sets the attributes of the ellipse."
@@ -464,6 +465,9 @@ class ThanEllipse(ThanCurve):
         self.thanSet(cc, a, b, ths[0], ths[1], phi, self.full, self.spin)
 
 
+    thanCoords = ThanElement.thanCoords     #Derived points (not only nodes) are transformed
+
+
     def thanList(self, than):
         "Shows information about the arc element."
         than.writecom("%s: %s" % (T["Element"], self.thanElementName))
@@ -318,6 +318,11 @@ class ThanFace3d(ThanElement):
         self.thanSet(cp)
 
 
+    def thanCoords(self):
+        "Return the points which thanTransform() passes to the transformation function, in the same order."
+        return [list(cc[:3]) for cc in self.cp]
+
+
 #===========================================================================
 
     def thanOsnap(self, proj, otypes, ccu, eother, cori):
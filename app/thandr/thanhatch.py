@@ -313,6 +313,11 @@ class ThanHatch(ThanElement):
         self.thanSet(cp, self.itype, self.dise, self.thetae)
 
 
+    def thanCoords(self):
+        "Return the points which thanTransform() passes to the transformation function, in the same order."
+        return [list(cc[:3]) for cc in self.cp]
+
+
 #    def __del__(self):
 #        print("ThanHatch", self, "is deleted")
 
@@ -27,10 +27,10 @@ This module defines the raster image element, based on Python Image Library.
 """
 
 import os
-from math import fabs, cos, sin, atan2
+from math import fabs, cos, sin, atan2, floor, ceil
 import p_gimage, p_gtkwid, p_gbmp, p_gtri
 from p_gmath import PI2, thanNearx
-from p_ggen import iterby2, path, thanUnicode, thanUnunicode, isString
+from p_ggen import iterby2, path, thanUnicode, thanUnunicode, isString, configFile, LruCache
 from p_gfil import Datlin
 from thanvar import Canc, thanfiles
 from thandefs import imageOpen
@@ -131,6 +131,7 @@ class ThanImage(ThanElement):
         del odict["image"]           # Do not save the image in the file
         del odict["imageori"]        # Do not save the image in the file
         del odict["imagez"]
+        odict.pop("pyramid", None)   # The overviews are rebuilt (or read from the cache) when needed
         odict["filnam"] = thanUnicode(self.filnam).split(os.sep)  # If not in unicode it transforms it to unicode..
         return odict                                #..p_ggen should have been notified about the local language encoding
 
@@ -174,9 +175,11 @@ class ThanImage(ThanElement):
         so it is sure that no memory is wasted.
         """
         im = self.image
+        pyr = self.__dict__.pop("pyramid", None)
         self.image = None
         el = ThanElement.thanClone(self)
         self.image = el.image = im
+        if pyr is not None: self.pyramid = el.pyramid = pyr   # The overviews do not waste memory either
         return el
 
 
@@ -720,33 +723,59 @@ compute the corber points.
         than.thanInfoPush(T["Regenerating %s.."] % (self.filnam,))
         wx = xb - xa + 1; wy = yb - ya + 1
         assert wx>=0 and wy>=0, "Something wrong with coordinates systems!!!"
-        if wx*wy > 4000000:            # If less than 4Mpixels render the entire image
-            self.view[0] = xn1 = max(self.c1[0], xymm[0])
-            self.view[1] = yn1 = max(self.c1[1], xymm[1])
-            self.view[2] = xn2 = min(self.c2[0], xymm[2])
-            self.view[3] = yn2 = min(self.c2[1], xymm[3])
-            for i,v in enumerate((self.c1[0], self.c1[1], self.c2[0], self.c2[1])):
-                if self.view[i] == v: self.view[i] = None
-
-            xp1, yp2 = self.thanGetPixCoor((xn1, yn1))
-            xp2, yp1 = self.thanGetPixCoor((xn2, yn2))
-            ca = self.__getWorldLowlef(xp1, yp2)
-            cb = self.__getWorldLowlef(xp2, yp1)
-            xa, yb = than.ct.global2Locali(ca[0], ca[1])
-            xb, ya = than.ct.global2Locali(cb[0], cb[1])
-            wx = xb - xa + 1
-            wy = yb - ya + 1
-            assert wx>=0 and wy>=0, "Something wrong with coordinates systems!!!"
-            assert wx*wy <= 4000000, "Reduced (!!!) image too big: %.0f x %.0f" % (wx,wy) #This test may wrong if resolution is higher than 2000x2000
-            self.imagez = self.image.crop((xp1, yp1, xp2, yp2))    # This is a lazy operation (i.e. very fast)
-            self.imagez = _phresize(self.imagez, wx, wy, than.imageBrightness)
-        else:
-            if self.theta == 0.0: self.imagez = _phresize(self.image, wx, wy, than.imageBrightness)
-            else:                 self.imagez = _phresize(self.image, wx, wy, than.imageBrightness)
-            self.view = [None, None, None, None]
+        pyr = self.thanPyramid()
+        k, im = pyr.levelFor(self.size[0]/float(max(wx, 1)))    # Nearest level with pixel <= screen pixel
+        wl, hl = im.size
+        fx = wx/float(wl)                                       # Screen pixels per level pixel
+        fy = wy/float(hl)
+
+#-------Find the part of the level which is visible (in level pixels)
+
+        vxa, vyb = than.ct.global2Locali(xymm[0], xymm[1])
+        vxb, vya = than.ct.global2Locali(xymm[2], xymm[3])
+        jv1 = max(int(floor((vxa-xa)/fx)), 0); jv2 = min(int(ceil((vxb-xa)/fx))+1, wl)
+        iv1 = max(int(floor((vya-ya)/fy)), 0); iv2 = min(int(ceil((vyb-ya)/fy))+1, hl)
+        tj1 = jv1 // _TILE; tj2 = (max(jv2, jv1+1)-1) // _TILE
+        ti1 = iv1 // _TILE; ti2 = (max(iv2, iv1+1)-1) // _TILE
+        clip = fx > 1.0 or fy > 1.0    # Magnified tiles are cropped to the screen, so that they do not get huge
+
+#-------Compose the image from the visible tiles; reuse the tiles of previous renderings
+
+        brfact = than.imageBrightness
+        rendering = thanGetRendering()
+        self.imagez = []
+        jr1, jr2, ir1, ir2 = wl, 0, hl, 0          # The part of the level which was rendered
+        for ti in range(ti1, ti2+1):
+            il1 = ti*_TILE; il2 = min(il1+_TILE, hl)
+            if clip: il1 = max(il1, iv1); il2 = min(il2, iv2)
+            if il2 <= il1: continue
+            y1 = ya + int(round(il1*fy)); y2 = ya + int(round(il2*fy))
+            for tj in range(tj1, tj2+1):
+                jl1 = tj*_TILE; jl2 = min(jl1+_TILE, wl)
+                if clip: jl1 = max(jl1, jv1); jl2 = min(jl2, jv2)
+                if jl2 <= jl1: continue
+                x1 = xa + int(round(jl1*fx)); x2 = xa + int(round(jl2*fx))
+                w1 = max(x2-x1, 1); h1 = max(y2-y1, 1)
+                key = (pyr.serial, k, il1, jl1, il2, jl2, w1, h1, brfact, rendering)
+                ph = _tiles.get(key)
+                if ph is None:
+                    ph = _phresize(im.crop((jl1, il1, jl2, il2)), w1, h1, brfact)
+                    _tiles[key] = ph
+                self.imagez.append(ph)    # Keep a reference, so that tkinter does not discard the tile
+                than.dc.create_image(x1, y1, image=ph, anchor="nw", tags=self.thanTags)
+                jr1 = min(jr1, jl1); jr2 = max(jr2, jl2); ir1 = min(ir1, il1); ir2 = max(ir2, il2)
+
+#-------Save the part of the image which was rendered (None means up to the edge of the image)
+
+        if jr2 <= jr1 or ir2 <= ir1: jr1, jr2, ir1, ir2 = jv1, jv1, iv1, iv1
+        dx = (self.c2[0]-self.c1[0])/wl
+        dy = (self.c2[1]-self.c1[1])/hl
+        self.view = [self.c1[0]+jr1*dx, self.c2[1]-ir2*dy, self.c1[0]+jr2*dx, self.c2[1]-ir1*dy]
+        if jr1 <= 0: self.view[0] = None
+        if ir2 >= hl: self.view[1] = None
+        if jr2 >= wl: self.view[2] = None
+        if ir1 <= 0: self.view[3] = None
 
-#        item2 = than.dc.create_image(xa, yb+1, image=self.imagez, anchor="sw", tags=self.thanTags)  #Thanasis2010_02_27:"sw" has a bug so that we put yb+1
-        item2 = than.dc.create_image(xa, ya, image=self.imagez, anchor="nw", tags=self.thanTags)
         if than.imageFrameOn:
             w = than.tkThick
             item1 = than.dc.create_rectangle(xa, yb, xb, ya, outline=than.outline, dash=than.dash, tags=self.thanTags, width=w)     # Frame around image
@@ -755,6 +784,23 @@ compute the corber points.
 
 #===========================================================================
 
+    def thanPyramid(self):
+        """Return the power of 2 overviews of the raster.
+
+        The overviews are computed from the (possibly transposed or clipped)
+        raster when they are first needed. If the raster is read from a file
+        (and it is not clipped), they are also saved in the user's cache
+        directory, so that they are not computed again the next time the same
+        file is loaded."""
+        pyr = self.__dict__.get("pyramid")
+        if pyr is None or pyr.levels[0] is not self.image:
+            key = None
+            if not self.embedded and not self.clipped:
+                key = p_gimage.pyramidKey(self.filnam, self.transpose)
+            pyr = self.pyramid = p_gimage.ImagePyramid(self.image, _pyramidDir(), key)
+        return pyr
+
+
     def thanExpDxf(self, fDxf, level=12):
         "Exports the image to dxf file."
         if level == 12:
@@ -894,6 +940,13 @@ compute the corber points.
                 transpose=self.transpose, clip=None, loaded=self.loaded)
 
 
+    def thanCoords(self):
+        "Return the points which thanTransform() passes to the transformation function, in the same order."
+        if self.clipped: cp = [self.c1ori, self.c2ori, self.c1, self.c2]
+        else:            cp = [self.c1, self.c2]
+        return [list(cc[:3]) for cc in cp]
+
+
     def thanList(self, than):
         "Shows information about the image element."
         than.writecom("%s: %s" % (T["Element"], self.thanElementName))
@@ -1036,6 +1089,29 @@ compute the corber points.
         return cw
 
 
+_TILE = 256                 # Size of the tiles in pixels of the pyramid level
+_TILEPIXELS = 40000000      # Maximum number of pixels of the cached tiles (about 160MB of memory)
+_PYRBYTES = 2000000000      # Maximum size of the saved overviews of all the images in bytes
+_tiles = LruCache(_TILEPIXELS, weight=lambda ph: ph.width()*ph.height())  # Recently rendered tiles (Tk PhotoImages) of all the images
+_pyrdir = False             # Directory where the overviews of the images are saved; False=not yet known
+
+
+def _pyramidDir():
+    "Return the directory where the overviews of the images are saved, or None if it can not be created."
+    global _pyrdir
+    if _pyrdir is False:
+        _pyrdir = None
+        d, terr = configFile("pyramid", "thancad")
+        if d is not None:
+            try:
+                d.makedirs1()
+                _pyrdir = d
+                p_gimage.pyramidPrune(d, _PYRBYTES)   # Delete the least recently used overviews
+            except OSError:
+                pass
+    return _pyrdir
+
+
 def _phresize(im, wx, wy, brfact):
     "Resizes image using the appropriate filter, brightens/darkens and converts to Tkinter image."
     b, h = im.size
@@ -26,7 +26,7 @@ ThanCad 0.9.1 "Students2024": n-dimensional CAD with raster support for engineer
 This module defines the polyline element.
 """
 from itertools import islice
-from math import fabs, hypot, pi, atan2
+from math import fabs, hypot, pi, atan2, log, floor
 import bisect
 from p_ggen import iterby2, thanUnicode
 from p_gmath import dpt, PI2, thanNearx, thanNear2, thanNear3, fsign, thanintersect, linint
@@ -46,6 +46,9 @@ except ImportError: pass
 class ThanLine(ThanElement):
     "A Basic simple 2d line."
     thanElementName = "LINE"    # Name of the element's class
+    thanSnapTypes = frozenset(("end", "mid"))  # Osnap types which are found by thanSnapPoints()
+    thanLodMin = 64                            # Lines with fewer vertices are drawn without level of detail
+    thanLod = None                             # Cached vertex indices of the level of detail (not saved)
 
     def thanSet (self, cp):
         """Sets the attributes of the line.
@@ -55,6 +58,7 @@ class ThanLine(ThanElement):
         before attempting any of the above functions.
         """
         self.cp = thanCleanLine3(cp)        #FIXME: thanCleanLine3 cleans 3dimensional degenerate segments;..
+        self.thanLod = None
         if len(self.cp) > 0:                #..Thus 2d algorithms may fail if deltax==deltay==0 CHECK ALL THE OPERATIONS..
             xp = [c1[0] for c1 in self.cp]  #..Is thanCleanLine still necessary (it is used in ThanRoad only)???..
             yp = [c1[1] for c1 in self.cp]  #..It's used when matching 3D FFLFs
@@ -62,6 +66,13 @@ class ThanLine(ThanElement):
 #        self.thanTags = ()            # thanTags is initialised in ThanElement
 
 
+    def __getstate__(self):
+        "Do not copy the level of detail; clones (deepcopy) are often edited in place (see thanpedit)."
+        odict = self.__dict__.copy() # Note that this is a cheap operation
+        odict.pop("thanLod", None)
+        return odict
+
+
     def thanIsNormal(self):
         """Returns False if the line is degenerate (it has only one point).
 
@@ -89,6 +100,7 @@ class ThanLine(ThanElement):
     def thanRotate(self):
         "Rotates the element within XY-plane with predefined angle and rotation angle."
         self.thanRotateXyn(self.cp)
+        self.thanLod = None
         xp = [c1[0] for c1 in self.cp]
         yp = [c1[1] for c1 in self.cp]
         self.setBoundBox([min(xp), min(yp), max(xp), max(yp)])
@@ -97,6 +109,7 @@ class ThanLine(ThanElement):
     def thanMirror(self):
         "Mirrors the element within XY-plane with predefined point and unit vector."
         self.thanMirrorXyn(self.cp)
+        self.thanLod = None
         xp = [c1[0] for c1 in self.cp]
         yp = [c1[1] for c1 in self.cp]
         self.setBoundBox([min(xp), min(yp), max(xp), max(yp)])
@@ -105,6 +118,7 @@ class ThanLine(ThanElement):
     def thanPointMir(self):
         "Mirrors the element within XY-plane with respect to predefined point."
         self.thanPointMirXyn(self.cp)
+        self.thanLod = None
         xp = [c1[0] for c1 in self.cp]
         yp = [c1[1] for c1 in self.cp]
         self.setBoundBox([min(xp), min(yp), max(xp), max(yp)])
@@ -114,6 +128,7 @@ class ThanLine(ThanElement):
         "Scales the element in n-space with defined scale and center of scale."
         for cc in self.cp:
             cc[:] = [cs1+(cc1-cs1)*scale for (cc1,cs1) in zip(cc, cs)]  #works for python2,3
+        self.thanLod = None
         cscs = [cs[0], cs[1], cs[0], cs[1]]
         self.thanXymm[:] = [cs1+(cc1-cs1)*scale for (cc1,cs1) in zip(self.thanXymm, cscs)]  #works for python2,3
 
@@ -122,6 +137,7 @@ class ThanLine(ThanElement):
         "Moves the element with defined n-dimensional distance."
         for cc in self.cp:
             cc[:] = [cc1+dd1 for (cc1,dd1) in zip(cc, dc)]  #works for python2,3
+        self.thanLod = None
         dcdc = [dc[0], dc[1], dc[0], dc[1]]
         self.thanXymm[:] = [cc1+dd1 for (cc1,dd1) in zip(self.thanXymm, dcdc)]  #works for python2,3
 
@@ -129,6 +145,7 @@ class ThanLine(ThanElement):
     def thanReverse(self):
         "Reverse the sequence of the nodes."
         self.cp.reverse()
+        self.thanLod = None
 
 
     def thanOsnap(self, proj, otypes, ccu, eother, cori):
@@ -155,6 +172,14 @@ class ThanLine(ThanElement):
         return min(ps)
 
 
+    def thanSnapPoints(self):
+        "Return the endpoints and midpoints of the line segments, as a list of (type, coordinates)."
+        ps = [("end", c) for c in self.cp]
+        for ca, cb in iterby2(self.cp):
+            ps.append(("mid", [(ca1+cb1)*0.5 for (ca1,cb1) in zip(ca, cb)]))  #works for python2,3
+        return ps
+
+
     def thanPntNearest(self, ccu):
         "Finds the nearest point of this line to a point."
         return thanPntNearest2(self.cp, ccu)[0]
@@ -395,7 +420,7 @@ class ThanLine(ThanElement):
         "Draws the line to a Tk Canvas."
         g2l = than.ct.global2Local
         w = than.tkThick
-        xy1 = [g2l(c1[0], c1[1]) for c1 in self.cp]
+        xy1 = [g2l(c1[0], c1[1]) for c1 in self.thanLodCp(than)]
         if thanNear2(self.cp[0], self.cp[-1]):   # Even if fill="", which means no fill
 #            temp = than.dc.create_polygon(xy1, outline=than.outline, fill=than.fill, tags=self.thanTags, width=w)
             temp = than.dc.create_line(   xy1, fill=than.outline, dash=than.dash, tags=self.thanTags, width=w)
@@ -403,18 +428,42 @@ class ThanLine(ThanElement):
             temp = than.dc.create_line(   xy1, fill=than.outline, dash=than.dash, tags=self.thanTags, width=w)
 
 
+    def thanLodCp(self, than):
+        """Return the vertices of the line which are visible at the current scale (level of detail).
+
+        At small scales, many vertices of a dense line (contours, breaklines)
+        fall onto the same pixel; these vertices are omitted. The pixel size is
+        rounded down to a power of 2 (zoom bucket), and the indices of the
+        remaining vertices are cached for this bucket, so that a redraw at
+        similar scale does not need to decimate again. The methods which change
+        the geometry reset the cache, and clones do not copy it; as a last
+        resort, it is also invalidated if the number of vertices, the bounding
+        box or the first vertex change.
+        """
+        cp = self.cp
+        n = len(cp)
+        if n < self.thanLodMin: return cp
+        pix = fabs(than.ct.local2GlobalRel(1.0, 0.0)[0])
+        if pix <= 0.0: return cp
+        k = int(floor(log(pix, 2.0)))
+        key = (k, n, tuple(self.thanXymm), cp[0][0], cp[0][1])
+        if self.thanLod is None or self.thanLod[0] != key:
+            self.thanLod = key, p_ggeom.lineDecimate2d(cp, 2.0**k)
+        idx = self.thanLod[1]
+        if len(idx) == n: return cp
+        return [cp[i] for i in idx]
+
+
     def thanExpDxf(self, fDxf):
         "Exports the line to dxf file."
         #FIXME: report width of polyline
-        xp = [c1[0] for c1 in self.cp]
-        yp = [c1[1] for c1 in self.cp]
-        zp = [c1[2] for c1 in self.cp]
-        z1 = zp[0]          #optimization
+        cp = self.cp
+        z1 = cp[0][2]       #optimization
         nearx = thanNearx   #optimization
-        if any(not nearx(z1, temp) for temp in zp):
-            fDxf.thanDxfPlotPolyline3(xp, yp, zp)
+        if any(not nearx(z1, c1[2]) for c1 in cp):
+            fDxf.thanDxfPlotPolyline3Cp(cp)
         else:
-            fDxf.thanDxfPlotPolyline(xp, yp, z1)
+            fDxf.thanDxfPlotPolylineCp(cp, z1)
 
 
     def thanExpSyk(self, than):
@@ -547,6 +596,11 @@ class ThanLine(ThanElement):
         for cc in cp: cc[:3] = fun(cc[:3])
         self.thanSet(cp)
 
+
+    def thanCoords(self):
+        "Return the points which thanTransform() passes to the transformation function, in the same order."
+        return [list(cc[:3]) for cc in self.cp]
+
     #def thanTkDraw(self, than):   #Inherited
     #def thanClone(self):          #Inherited
     #def thanUntag(self):          #Inherited
@@ -831,6 +885,12 @@ class ThanCurve(ThanLine):
         return min(ps)
 
 
+    def thanSnapPoints(self):
+        "Return the endpoints and the midpoint of the curve, as a list of (type, coordinates)."
+        if len(self.cp) < 2: return ()
+        return [("end", self.cp[0]), ("end", self.cp[-1]), ("mid", self.thanMidPoint())]
+
+
     def thanMidPoint(self):
         "Finds the midpoint of the curve."
         alm = self.thanLength()*0.5
@@ -930,6 +990,7 @@ class ThanSpline(ThanCurve):
         "Rotates the element within XY-plane with predefined angle and rotation angle."
         self.thanRotateXyn(self.cpori)
         self.thanRotateXyn(self.cp)
+        self.thanLod = None
         xp = [c1[0] for c1 in self.cp]
         yp = [c1[1] for c1 in self.cp]
         self.setBoundBox([min(xp), min(yp), max(xp), max(yp)])
@@ -939,6 +1000,7 @@ class ThanSpline(ThanCurve):
         "Mirrors the element within XY-plane with predefined point and unit vector."
         self.thanMirrorXyn(self.cpori)
         self.thanMirrorXyn(self.cp)
+        self.thanLod = None
         xp = [c1[0] for c1 in self.cp]
         yp = [c1[1] for c1 in self.cp]
         self.setBoundBox([min(xp), min(yp), max(xp), max(yp)])
@@ -948,6 +1010,7 @@ class ThanSpline(ThanCurve):
         "Mirrors the element within XY-plane with respect to predefined point."
         self.thanPointMirXyn(self.cpori)
         self.thanPointMirXyn(self.cp)
+        self.thanLod = None
         xp = [c1[0] for c1 in self.cp]
         yp = [c1[1] for c1 in self.cp]
         self.setBoundBox([min(xp), min(yp), max(xp), max(yp)])
@@ -959,6 +1022,7 @@ class ThanSpline(ThanCurve):
             cc[:] = [cs1+(cc1-cs1)*scale for (cc1,cs1) in zip(cc, cs)]  #works for python2,3
         for cc in self.cp:
             cc[:] = [cs1+(cc1-cs1)*scale for (cc1,cs1) in zip(cc, cs)]  #works for python2,3
+        self.thanLod = None
         cscs = [cs[0], cs[1], cs[0], cs[1]]
         self.thanXymm[:] = [cs1+(cc1-cs1)*scale for (cc1,cs1) in zip(self.thanXymm, cscs)]  #works for python2,3
 
@@ -969,6 +1033,7 @@ class ThanSpline(ThanCurve):
             cc[:] = [cc1+dd1 for (cc1,dd1) in zip(cc, dc)]  #works for python2,3
         for cc in self.cp:
             cc[:] = [cc1+dd1 for (cc1,dd1) in zip(cc, dc)]  #works for python2,3
+        self.thanLod = None
         dcdc = [dc[0], dc[1], dc[0], dc[1]]
         self.thanXymm[:] = [cc1+dd1 for (cc1,dd1) in zip(self.thanXymm, dcdc)]  #works for python2,3
 
@@ -1101,3 +1166,8 @@ class ThanSpline(ThanCurve):
         cp = [list(cc) for cc in self.cpori]
         for cc in cp: cc[:3] = fun(cc[:3])
         self.thanSet(cp)
+
+
+    def thanCoords(self):
+        "Return the points which thanTransform() passes to the transformation function, in the same order."
+        return [list(cc[:3]) for cc in self.cpori]
@@ -212,6 +212,11 @@ class ThanPoint(ThanElement):
         self._setbbox()
 
 
+    def thanCoords(self):
+        "Return the points which thanTransform() passes to the transformation function, in the same order."
+        return [list(self.cc[:3])]
+
+
     def thanList(self, than):
         "Shows information about the point element."
         than.writecom("%s: %s" % (T["Element"], self.thanElementName))
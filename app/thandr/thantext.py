@@ -209,7 +209,7 @@ class ThanText(ThanElement):
                        (x1 - h*sint, y1 + h*cost),
                      ]
             than.dc.create_polygon(wpList, outline=than.outline, fill="", tags=tags)
-        elif self.theta == 0.0 and False:                                #Use canvas fonts for speed
+        elif self.theta == 0.0 and than.draftTextOn:                     #Use canvas fonts for speed (draft text)
             #bounds = than.dc.bbox(id)  # returns a tuple like (x1, y1, x2, y2)
             #width = bounds[2] - bounds[0]
             #height = bounds[3] - bounds[1]
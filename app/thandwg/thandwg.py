@@ -30,6 +30,8 @@ viewports, etc."
 from math import hypot
 import p_ggen, p_gdxf, p_gimgeo, p_gimage, p_ggeod, p_gbmp
 from p_gmath   import ThanRectCoorTransf, thanRoundCenter
+from p_ggeom   import (rectInRect, rect2Polygon, polylineCrossRect, polylineCrossPolyline,
+                       pointInPolygon, polylineInPolygon, polylineCrossPolygon)
 import thanfonts, thandefs
 from thanlayer import ThanLayerTree, col2tuple
 from thandefs  import ThanId
@@ -144,6 +146,8 @@ class ThanDrawing:
              frozen layer.
         thanAreaIterated: a rectangle >= viewport. All active elements inside (or partly inside)
             this rectangle are drawn in the Canvas.
+        thanDirty: elements which were added, erased or changed in place since the
+            previous draw; their items in the Canvas may be stale
         thanLayerTree: the layer hierarchy and related dictionaries
         __idTag: id (or handle) generator for elements
         thanTagel: maps id (handle) to element
@@ -163,6 +167,7 @@ class ThanDrawing:
         """
         self.thanAreaIterated = (None, None, None, None)  # No element -> no limit in regen
         self.xMinAct = self.yMinAct = self.xMaxAct = self.yMaxAct = None  #Smallest rectangle which contains all active elements
+        self.thanDirty = set()                            # Elements changed since the previous draw
         self.thanLayerTree = ThanLayerTree()
         self.__idTag = ThanId(prefix="E")
         self.thanTagel = ThanTagel(prefix="E")
@@ -328,8 +333,10 @@ class ThanDrawing:
         fw.pushInd()
         for lay in self.thanLayerTree.dilay.values():   #works for python2,3
             layname = lay.thanGetPathname()
+            fw.writeLayerBeg(layname)
             for e in lay.thanQuad:
                 e.thanExpThc(fw, layname)
+            fw.writeLayerEnd(layname, len(lay.thanQuad), lay.thanQuad.thanXymm())
         fw.popInd()
         fw.writeEnd("ELEMENTS")
 
@@ -434,6 +441,7 @@ class ThanDrawing:
         """
         self.thanTagel[elem.thanTags[0]] = elem
         cl.thanQuad.add(elem)
+        self.thanDirty.add(elem)
         if not cl.thanAtts["frozen"].thanVal:
             if self.xMinAct is None:
                 self.xMinAct = elem.thanXymm[0]
@@ -508,56 +516,128 @@ class ThanDrawing:
         self.xMinAct = self.yMinAct = self.xMaxAct = self.yMaxAct = None  # Set as invalid in case user aborts
         xymm = self.thanExtViewPort()
 
-#------Initialise min,max with first element
+#------Compute min,max from the spatial index of the active layers
 
-        if lays == "all": lays = self.thanLayerTree.dilay.values()   #works for python2,3 -> see sorted() function below
+        if lays == "all":
+            lays = self.thanLayerTree.dilay.values()   #works for python2,3 -> see sorted() function below
+            self.thanDirty.clear()                     # All the elements will be drawn from scratch
         #lays = [(lay.thanAtts["draworder"].thanVal, lay) for lay in lays]
         #lays.sort()
         #lays = [lay for i,lay in lays]
         lays = sorted(lays, key=lambda lay: lay.thanAtts["draworder"].thanVal)
-        for lay in lays:
-            if lay.thanAtts["frozen"].thanVal: continue
-            for e in lay.thanQuad:
-                self.xMinAct = e.thanXymm[0]
-                self.yMinAct = e.thanXymm[1]
-                self.xMaxAct = e.thanXymm[2]
-                self.yMaxAct = e.thanXymm[3]
-                break
-            else: continue
-            break
-        else:
+        self.__actFromQuads(lays)
+        if self.xMinAct is None:
             print("no elements found in active layers")
             self.thanAreaIterated = (None, None, None, None)    # No limit in all directions
-            self.xMinAct = self.yMinAct = self.xMaxAct = self.yMaxAct = None
             return    # Drawing has no elements in active layers
 
-#-------Now iterate through all elements of active layers
+#-------Now draw the elements of active layers which are inside xymm
 
         for lay in lays:
             if lay.thanAtts["frozen"].thanVal: continue
             lay.thanTkSet(than)
-            for e in lay.thanQuad:
-                if e.thanXymm[0] < self.xMinAct: self.xMinAct = e.thanXymm[0]
-                if e.thanXymm[1] < self.yMinAct: self.yMinAct = e.thanXymm[1]
-                if e.thanXymm[2] > self.xMaxAct: self.xMaxAct = e.thanXymm[2]
-                if e.thanXymm[3] > self.yMaxAct: self.yMaxAct = e.thanXymm[3]
-                if e.thanInbox(xymm):
-                    if e in than.markselected:   #Add the "selall" tag
-                        temp = e.thanTags
-                        e.thanTags = temp + ("selall",)
-                        e.thanTkDraw(than)
-                        e.thanTags = temp
-                    else:
-                        e.thanTkDraw(than)
-
-#-------Compute limits of thanAreaIterated
+            for e in lay.thanQuad.query(xymm):
+                if e.thanInbox(xymm): self.__tkDrawElem(e, than)
+        self.__setAreaIterated(xymm)
+        self.thanLayerTree.thanCur.thanTkSet(than)
+
+
+    def thanActUpdate(self):
+        """Compute xyMinMaxAct without drawing anything (for windows which do not draw, e.g. batch mode).
+
+        Nothing will be drawn incrementally, so thanDirty is cleared, so that
+        the erased elements are not kept alive."""
+        self.thanDirty.clear()
+        self.__actFromQuads(self.thanLayerTree.dilay.values())   #works for python2,3
+
+
+    def __actFromQuads(self, lays):
+        "Compute xyMinMaxAct from the spatial indices of the active layers among lays."
+        self.xMinAct = self.yMinAct = self.xMaxAct = self.yMaxAct = None
+        for lay in lays:
+            if lay.thanAtts["frozen"].thanVal: continue
+            laymm = lay.thanQuad.thanXymm()
+            if laymm is None: continue
+            if self.xMinAct is None:
+                self.xMinAct, self.yMinAct, self.xMaxAct, self.yMaxAct = laymm
+            else:
+                if laymm[0] < self.xMinAct: self.xMinAct = laymm[0]
+                if laymm[1] < self.yMinAct: self.yMinAct = laymm[1]
+                if laymm[2] > self.xMaxAct: self.xMaxAct = laymm[2]
+                if laymm[3] > self.yMaxAct: self.yMaxAct = laymm[3]
+
+
+    def thanTkDrawIncr(self, than):
+        """Draws only the elements which changed or became visible since the previous draw.
+
+        Changed are the elements of thanDirty, i.e. the elements which were
+        added, erased or changed in place since the previous draw. Their items
+        are deleted from the gui window, and they are drawn again if they are
+        still in the drawing and inside the extended viewport.
+        Exposed is the part of the extended viewport which is outside
+        'thanAreaIterated'. The elements inside it, which were not drawn by the
+        previous draw, are drawn now. The items of the elements which are no
+        longer inside the extended viewport are deleted, so that the gui window
+        holds only the items of the elements inside 'thanAreaIterated'. The
+        elements already drawn are left untouched, and thus a pan or a moderate
+        zoom, which reveals a part of the drawing which was not drawn, does not
+        need to redraw all the elements.
+        It returns the number of elements drawn, or None if an incremental
+        draw is not possible (then the caller should call thanTkDraw()).
+        """
+        q = self.thanAreaIterated
+        if q[0] is not None and q[2] is not None and q[0] > q[2]: return None  # Previous draw was aborted
+        if self.xMinAct is None: return None                                 # No active elements
+        self.thanAreaIterated = (1, 1, -1, -1)                               # Set as invalid in case user aborts
+        xymm = self.thanExtViewPort()
+
+#-------Delete the items of the changed elements and of the elements which scrolled out of view
+
+        dirty = self.thanDirty
+        self.thanDirty = set()
+        lays = sorted(self.thanLayerTree.dilay.values(), key=lambda lay: lay.thanAtts["draworder"].thanVal)   #works for python2,3
+        stale = set(dirty)
+        for lay in lays:
+            if lay.thanAtts["frozen"].thanVal: continue
+            for e in lay.thanQuad.query(q):                      # The elements drawn by the previous draw
+                if not e.thanInbox(xymm): stale.add(e)
+        if stale: than.dc.delete(*[e.thanTags[0] for e in stale])   # One call to the gui for all the items
+        than.thanImages.difference_update(stale)
+
+#-------Draw the changed elements and the elements which were not drawn previously
+
+        n = 0
+        for lay in lays:
+            if lay.thanAtts["frozen"].thanVal: continue
+            lay.thanTkSet(than)
+            for e in lay.thanQuad.query(xymm):
+                if not e.thanInbox(xymm): continue
+                if e not in dirty and e.thanInarea(q): continue  # Drawn by the previous draw
+                self.__tkDrawElem(e, than)
+                n += 1
+        self.__setAreaIterated(xymm)
+        self.thanLayerTree.thanCur.thanTkSet(than)
+        return n
+
+
+    def __tkDrawElem(self, e, than):
+        "Draws an element into a gui window, marking it as selected if needed."
+        if e in than.markselected:   #Add the "selall" tag
+            temp = e.thanTags
+            e.thanTags = temp + ("selall",)
+            e.thanTkDraw(than)
+            e.thanTags = temp
+        else:
+            e.thanTkDraw(than)
+
 
+    def __setAreaIterated(self, xymm):
+        "Compute limits of thanAreaIterated, after all the elements inside xymm were drawn."
         if xymm[0] <= self.xMinAct: xymm[0] = None
         if xymm[1] <= self.yMinAct: xymm[1] = None
         if xymm[2] >= self.xMaxAct: xymm[2] = None
         if xymm[3] >= self.yMaxAct: xymm[3] = None
         self.thanAreaIterated = tuple(xymm)
-        self.thanLayerTree.thanCur.thanTkSet(than)
 
 
     def thanExtViewPort(self):
@@ -584,6 +664,92 @@ class ThanDrawing:
             el.thanTkHiwin(than)
 
 
+    def thanOsnapElems(self, xymm):
+        "Return the elements of the active layers which are (partially) inside rectangle xymm."
+        elems = []
+        for lay in self.__activeLays():
+            elems.extend(e for e in lay.thanQuad.query(xymm) if e.thanInbox(xymm))
+        return elems
+
+
+    def thanOsnapPoints(self, xymm, otypes=None):
+        """Return the osnap points of the active layers, which are inside rectangle xymm.
+
+        The points are found through the spatial index of the layers and they
+        are returned as a list of (element, type, coordinates); see
+        ThanElement.thanSnapPoints()."""
+        ps = []
+        for lay in self.__activeLays():
+            ps.extend(lay.thanQuad.querySnap(xymm, otypes))
+        return ps
+
+
+    def __activeLays(self):
+        "Iterate through the leaf layers which are not frozen."
+        for lay in self.thanLayerTree.dilay.values():    #works for python2,3
+            if not lay.thanAtts["frozen"].thanVal: yield lay
+
+
+    def __selOutline(self, e):
+        """Return the polyline which represents element e for the exact selection tests.
+
+        If the element can not be represented by straight line segments, the
+        bounding rectangle of the element is returned as a closed polyline."""
+        if e.than2Line(None):
+            cp = e.than2Line(0.0)[0]
+            if len(cp) > 0: return cp
+        return rect2Polygon(e.thanXymm)
+
+
+    def thanSelWin(self, xymm):
+        "Return the elements of the active layers which are completely inside rectangle xymm."
+        sel = set()
+        for lay in self.__activeLays():
+            sel.update(e for e in lay.thanQuad.query(xymm) if rectInRect(e.thanXymm, xymm))
+        return sel
+
+
+    def thanSelCros(self, xymm):
+        "Return the elements of the active layers which are (partially) inside rectangle xymm."
+        sel = set()
+        for lay in self.__activeLays():
+            for e in lay.thanQuad.query(xymm):
+                if rectInRect(e.thanXymm, xymm) or polylineCrossRect(self.__selOutline(e), xymm):
+                    sel.add(e)
+        return sel
+
+
+    def thanSelFence(self, cf):
+        "Return the elements of the active layers which intersect polyline (fence) cf."
+        sel = set()
+        if len(cf) < 2: return sel
+        xymm = [min(c[0] for c in cf), min(c[1] for c in cf), max(c[0] for c in cf), max(c[1] for c in cf)]
+        for lay in self.__activeLays():
+            sel.update(e for e in lay.thanQuad.query(xymm) if polylineCrossPolyline(self.__selOutline(e), cf))
+        return sel
+
+
+    def thanSelPolygon(self, cf, crossing=False):
+        """Return the elements of the active layers which are inside polygon cf.
+
+        If crossing is True, the elements which are partially inside cf are
+        returned as well."""
+        sel = set()
+        if len(cf) < 3: return sel
+        pol = list(cf)
+        if tuple(pol[0][:2]) != tuple(pol[-1][:2]): pol.append(pol[0])
+        xymm = [min(c[0] for c in pol), min(c[1] for c in pol), max(c[0] for c in pol), max(c[1] for c in pol)]
+        for lay in self.__activeLays():
+            for e in lay.thanQuad.query(xymm):
+                if not crossing:
+                    if rectInRect(e.thanXymm, xymm) and polylineInPolygon(self.__selOutline(e), pol): sel.add(e)
+                elif polylineCrossPolygon(self.__selOutline(e), pol):
+                    sel.add(e)
+                elif not e.than2Line(None) and pointInPolygon(pol[0], rect2Polygon(e.thanXymm)):
+                    sel.add(e)    # The polygon is inside the bounding rectangle of the element
+        return sel
+
+
 #===========================================================================
 
     def thanMoveSel(self, elems, dc):
@@ -591,6 +757,19 @@ class ThanDrawing:
         if all(dc1==0.0 for dc1 in dc): return
         for e in elems:
             e.thanMove(dc)
+        self.__elementChangedHouse(elems)
+
+    def __elementChangedHouse(self, elems):
+        """Do housekeeping for elements whose geometry was changed in place.
+
+        The elements are reindexed in the spatial index of their layers and
+        xyMinMaxAct is enlarged (if needed) to contain them.
+        """
+        taglay = self.thanLayerTree.dilay
+        self.thanDirty.update(elems)
+        for e in elems:
+            taglay[e.thanTags[1]].thanQuad.thanUpdate((e,))
+            if self.xMinAct is None: continue
             if e.thanXymm[0] < self.xMinAct: self.xMinAct = e.thanXymm[0]
             if e.thanXymm[1] < self.yMinAct: self.yMinAct = e.thanXymm[1]
             if e.thanXymm[2] > self.xMaxAct: self.xMaxAct = e.thanXymm[2]
@@ -622,19 +801,11 @@ class ThanDrawing:
                 cc = e.getInspnt()
                 ThanElement.thanRotateSet(cc, phi)
                 e.thanRotate()
-                if e.thanXymm[0] < self.xMinAct: self.xMinAct = e.thanXymm[0]
-                if e.thanXymm[1] < self.yMinAct: self.yMinAct = e.thanXymm[1]
-                if e.thanXymm[2] > self.xMaxAct: self.xMaxAct = e.thanXymm[2]
-                if e.thanXymm[3] > self.yMaxAct: self.yMaxAct = e.thanXymm[3]
         else:
             ThanElement.thanRotateSet(cc, phi)
             for e in elems:
                 e.thanRotate()
-                if e.thanXymm[0] < self.xMinAct: self.xMinAct = e.thanXymm[0]
-                if e.thanXymm[1] < self.yMinAct: self.yMinAct = e.thanXymm[1]
-                if e.thanXymm[2] > self.xMaxAct: self.xMaxAct = e.thanXymm[2]
-                if e.thanXymm[3] > self.yMaxAct: self.yMaxAct = e.thanXymm[3]
-        self.thanTouch()
+        self.__elementChangedHouse(elems)
 
 
     def thanMirrorSel(self, elems, c1, t):
@@ -642,11 +813,7 @@ class ThanDrawing:
         ThanElement.thanMirrorSet(c1, t)
         for e in elems:
             e.thanMirror()
-            if e.thanXymm[0] < self.xMinAct: self.xMinAct = e.thanXymm[0]
-            if e.thanXymm[1] < self.yMinAct: self.yMinAct = e.thanXymm[1]
-            if e.thanXymm[2] > self.xMaxAct: self.xMaxAct = e.thanXymm[2]
-            if e.thanXymm[3] > self.yMaxAct: self.yMaxAct = e.thanXymm[3]
-        self.thanTouch()
+        self.__elementChangedHouse(elems)
 
 
     def thanPointMirSel(self, elems, c1):
@@ -654,11 +821,7 @@ class ThanDrawing:
         ThanElement.thanPointMirSet(c1)
         for e in elems:
             e.thanPointMir()
-            if e.thanXymm[0] < self.xMinAct: self.xMinAct = e.thanXymm[0]
-            if e.thanXymm[1] < self.yMinAct: self.yMinAct = e.thanXymm[1]
-            if e.thanXymm[2] > self.xMaxAct: self.xMaxAct = e.thanXymm[2]
-            if e.thanXymm[3] > self.yMaxAct: self.yMaxAct = e.thanXymm[3]
-        self.thanTouch()
+        self.__elementChangedHouse(elems)
 
 
     def thanScaleSel(self, elems, cc, fact):
@@ -668,17 +831,56 @@ class ThanDrawing:
             for e in elems:
                 cc = e.getInspnt()
                 e.thanScale(cc, fact)
-                if e.thanXymm[0] < self.xMinAct: self.xMinAct = e.thanXymm[0]
-                if e.thanXymm[1] < self.yMinAct: self.yMinAct = e.thanXymm[1]
-                if e.thanXymm[2] > self.xMaxAct: self.xMaxAct = e.thanXymm[2]
-                if e.thanXymm[3] > self.yMaxAct: self.yMaxAct = e.thanXymm[3]
         else:
             for e in elems:
                 e.thanScale(cc, fact)
-                if e.thanXymm[0] < self.xMinAct: self.xMinAct = e.thanXymm[0]
-                if e.thanXymm[1] < self.yMinAct: self.yMinAct = e.thanXymm[1]
-                if e.thanXymm[2] > self.xMaxAct: self.xMaxAct = e.thanXymm[2]
-                if e.thanXymm[3] > self.yMaxAct: self.yMaxAct = e.thanXymm[3]
+        self.__elementChangedHouse(elems)
+
+#===========================================================================
+
+    def thanGatherCoords(self, elems, progress=p_ggen.doNothing):
+        """Gather the coordinates of the elements into one NumPy array of shape (n, 3).
+
+        The coordinates are the points that thanTransform() of each element
+        passes to the transformation function, in the same order (see
+        ThanElement.thanCoords()); the elements are not changed. Thus the
+        array can be transformed in a single batch, and then written back with
+        thanScatterCoords(). The elements which have no coordinates (they
+        do not implement thanTransform()) are omitted from the returned list of
+        elements. progress(i, n) is called every few elements; if it returns
+        True (the user cancelled), None, None is returned."""
+        import numpy as np
+        buf = []
+        n = len(elems)
+        elemscc = []
+        for i, e in enumerate(elems):
+            cc = e.thanCoords()                  #Read only: the elements are changed only by thanScatterCoords()
+            if len(cc) > 0:
+                buf.extend(cc)
+                elemscc.append(e)
+            if i % 1000 == 0 and progress(i, n): return None, None
+        return np.array(buf, dtype=float).reshape(-1, 3), elemscc
+
+
+    def thanScatterCoords(self, elems, cc, progress=p_ggen.doNothing):
+        """Write back the coordinates cc which were gathered by thanGatherCoords() (and then transformed).
+
+        Since (almost) all the elements of the layers are usually changed, the
+        spatial indices of the layers are rebuilt and xyMinMaxAct is
+        computed from scratch. progress(i, n) is called every few elements."""
+        it = iter(cc.tolist())
+        def fun(c):
+            "Return the next point of cc."
+            return next(it)
+        n = len(elems)
+        for i, e in enumerate(elems):
+            e.thanTransform(fun)
+            if i % 1000 == 0: progress(i, n)
+        taglay = self.thanLayerTree.dilay
+        for taglay1 in set(e.thanTags[1] for e in elems):
+            taglay[taglay1].thanQuad.thanReindex()
+        self.thanDirty.update(elems)
+        self.__actFromQuads(taglay.values())   #works for python2,3
         self.thanTouch()
 
 #===========================================================================
@@ -687,6 +889,7 @@ class ThanDrawing:
         "Deletes elements from the drawing as simply as possible."
         if len(elems) == 0: return
         taglay = self.thanLayerTree.dilay
+        self.thanDirty.update(elems)
         for e in elems:
             lay = taglay[e.thanTags[1]]
             lay.thanQuad.remove(e)
@@ -701,6 +904,7 @@ class ThanDrawing:
         say, over 10000. Again, this is not certain without actual test.
         """
         taglay = self.thanLayerTree.dilay
+        self.thanDirty.update(elems)
         elay = {}
         for e in elems:
             elay.setdefault(e.thanTags[1], set()).add(e)
@@ -737,6 +941,7 @@ class ThanDrawing:
         "Deletes elements from the drawing and canvas as simply as possible, leaving structures intact."
         taglay = self.thanLayerTree.dilay
         dc = proj[2].thanCanvas
+        self.thanDirty.update(elems)
         for e in elems:
             lay = taglay[e.thanTags[1]]
             lay.thanQuad.remove(e)
@@ -935,12 +1140,17 @@ class ThanDrawing:
         return True, ""
 
 
-    def iterElems(self, elems=None, filterfun=lambda e: True):
-        "Iterate through elems or through all elements of drawing, possibly with a filter function."
+    def iterElems(self, elems=None, filterfun=lambda e: True, xymm=None):
+        """Iterate through elems or through all elements of drawing, possibly with a filter function.
+
+        If xymm is not None, only the elements of the drawing which are (partially)
+        inside rectangle xymm are iterated; they are found through the spatial
+        index of the layers."""
         if elems is None:   #Iterate through all elements of the drawing
             for lay in self.thanLayerTree.dilay.values():    #works for python2,3
-                layname = lay.thanGetPathname(THANLC)
-                for e in lay.thanQuad:
+                if xymm is None: quad = lay.thanQuad
+                else:            quad = lay.thanQuad.query(xymm)
+                for e in quad:
                     if filterfun(e): yield e
         else:
             dilay = self.thanLayerTree.dilay
@@ -26,8 +26,9 @@ ThanCad 0.9.1 "Students2024": n-dimensional CAD with raster support for engineer
 This module defines base class for ThanCad fonts made by straight lines.
 """
 
-from math import pi, cos, sin
+from math import pi, cos, sin, fabs
 import copy
+from p_ggen import LruCache
 #from p_ggen import Pyos, thanGetEncoding
 
 class ThanFont:
@@ -107,26 +108,41 @@ class ThanFontLine(ThanFont):
 #=============================================================================
 
     def thanTkPaint(self, tk, xz, yz, h, a, theta, tags):
-        "Draws text using ThanCad's line fonts."
+        "Draws text using ThanCad's line fonts; one canvas item per merged stroke."
         assert h >= 1, "Text height must be > 1 pixel"
-        c = cos(theta); s = sin(theta)
-        scale = h / self.thanHnorm; bx  = scale * c; by = scale * s
-        if self.thanVert:
-            hx2 = 1.2*(0*bx - (-self.thanHnorm*by)); hy2 = 1.2*(-0*by - (-self.thanHnorm*bx))
-        else:
-            hx2 = self.thanBnorm*bx - 0*by; hy2 = -self.thanBnorm*by - 0*bx
-
-#-------Transform the coordinates
-
         dc = tk.dc
         w = tk.tkThick
         col = tk.outline
-        for c in a:                                    # Loop over all the characters in text
-            for pl in self.lines1(c):                  # Loop over all polylines of a char
-                plr = [ (xz+xx*bx-yy*by, yz-(xx*by+yy*bx)) for (xx, yy) in pl ]
-                if len(plr) > 1: dc.create_line(plr, fill=col, width=w, tags=tags)
-            if self.thanProp: xz, yz = plr[0]          # Next character position is defined within current char
-            else:             xz += hx2; yz += hy2     # Advance to next fixed character position
+        for pl in self.thanStrokes(a, h, theta):       # Loop over all merged polylines of the text
+            dc.create_line([(xz+xx, yz+yy) for (xx, yy) in pl], fill=col, width=w, tags=tags)
+
+
+    def thanStrokes(self, a, h, theta):
+        """Return the polylines of text a, relative to the insertion point, in local (pixel) coordinates.
+
+        Consecutive polylines which share an end point are merged into one
+        polyline, so that the text is drawn with as few canvas items as
+        possible. The result is cached per (font, text, height, angle), since
+        the same texts (and the same sizes) tend to repeat in a drawing.
+        """
+        key = (self, a, h, theta)
+        strokes = _strokes.get(key)
+        if strokes is not None: return strokes
+        strokes = []
+        tol = 0.01                                     # Points closer than 0.01 pixels are identical
+        for plr in self.than2lines(0.0, 0.0, h, a, theta):
+            if len(plr) < 2: continue
+            if strokes:
+                cl = strokes[-1][-1]
+                if fabs(cl[0]-plr[0][0]) < tol and fabs(cl[1]-plr[0][1]) < tol:
+                    strokes[-1].extend(plr[1:])        # Continue the previous polyline
+                    continue
+                if fabs(cl[0]-plr[-1][0]) < tol and fabs(cl[1]-plr[-1][1]) < tol:
+                    strokes[-1].extend(plr[-2::-1])    # Continue the previous polyline backwards
+                    continue
+            strokes.append(plr)
+        _strokes[key] = strokes
+        return strokes
 
 
     def lines1(self, c1):
@@ -266,6 +282,7 @@ class ThanFontLine(ThanFont):
         for lines in self.thanDilines.values():   #works for python2,3
             lines[:] = [ [(x*scale, y) for x,y in li] for li in lines]
         self.thanBnorm *= scale
+        _strokes.clear()
 
     def thanObliqueMake(self, phi):
         "Make the font oblique; rotate only y coordinate; affects only x coordinate."
@@ -273,12 +290,14 @@ class ThanFontLine(ThanFont):
         phi = phi * pi / 180; c = cos(phi); s = sin(phi)
         for lines in self.thanDilines.values():  #works for python2,3
             lines[:] = [ [(x + y*s, y) for x,y in li] for li in lines]
+        _strokes.clear()
 
     def thanUpsidedownMake(self):
         "Makes the font upside down; essentially the letters are mirrored."
         h = self.thanHnorm
         for lines in self.thanDilines.values():   #works for python2,3
             lines[:-1] = [ [(x, h-y) for x,y in li] for li in lines[:-1]]
+        _strokes.clear()
 
     def thanBackwardsMake(self):
         "Makes the font look backwards; essentially the letters are mirrored."
@@ -286,6 +305,7 @@ class ThanFontLine(ThanFont):
             if self.thanProp: b = lines[-1][0][0]
             else:             b = self.thanBnorm
             lines[:-1] = [ [(b-x, y) for x,y in li] for li in lines[:-1]]
+        _strokes.clear()
 
     def thanVerticalMake(self):
         "Makes the font look backwards; essentially the letters are mirrored."
@@ -296,5 +316,8 @@ class ThanFontLine(ThanFont):
             lines[:-1] = [ [(x-b, y-h) for x,y in li] for li in lines[:-1]]
         self.thanProp = False            # Next character position defined within current char, is invalid
         self.thanVert = True
+        _strokes.clear()
+
+_strokes = LruCache(20000)       # Cached polylines of texts: (font, text, height, angle) -> polylines
 
 thanFonts = {}
@@ -29,4 +29,5 @@ and some derived dialogs; these should be moves to other packages.
 
 from .thanlayer import ThanLayerTree, THANNAME, col2tuple
 from .thanlaycon import THANNAME
+from .thanquad import ThanQuad
 from . import thanlayatts
@@ -301,7 +301,7 @@ def thanUpdateElements(proj, leaflayers, updatelayers=True):
             nval = atts["frozen"]
             if nval:
                 proj[2].thanGudSetFreezeLayer(lay)       # All items are deleted from canvas; there are no items to update!!!
-                proj[2].thanImages -= lay.thanQuad
+                proj[2].thanImages.difference_update(lay.thanQuad)
             else:
                 proj[1].thanTkDraw(proj[2].than, (lay,)) # All items are redrawn; all items are up to date
                 draworder = True                         # All items are redrawn; thus, probably, the draworder is violated
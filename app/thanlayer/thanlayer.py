@@ -38,6 +38,7 @@ import p_ggen, p_gcol
 from thanvar import ThanLayerError, THANBYPARENT, THANPERSONAL
 from thandefs import ThanId
 from thanopt import thancadconf
+from .thanquad import ThanQuad
 
 from .thanlaycon import THANNAME
 from .thanlayername import checkLayerName, repairLayerUniq, isLayerUniq
@@ -326,7 +327,7 @@ class ThanLayer(object):
         lay.thanParent = self
         lay.thanChildren = []
         lay.thanTag = self.lt.thanIdLay.new()  # In order to exploit TK mechanism
-        lay.thanQuad = set()                   # This holds the elements of the layer
+        lay.thanQuad = ThanQuad()              # This holds the elements of the layer
 
         copyinher = atts is not None
         if atts is None: atts = self.thanAtts
@@ -716,7 +717,7 @@ class ThanLayerTree:
         root.thanParent = None
         root.thanChildren = []
         root.thanTag = root.lt.thanIdLay.new()     # In order to exploit TK mechanism
-        root.thanQuad = set()                      # This holds the elements of the layer
+        root.thanQuad = ThanQuad()                 # This holds the elements of the layer
 
         root.thanAtts = {}
         for a,val in thanlayatts.thanLayAtts.items():   #works for python2,3
@@ -0,0 +1,226 @@
+##############################################################################
+# ThanCad 0.9.1 "Students2024": n-dimensional CAD with raster support for engineers
+#
+# Copyright (C) 2001-2025 Thanasis Stamos, May 20, 2025
+# Athens, Greece, Europe
+# URL: http://thancad.sourceforge.net
+# e-mail: cyberthanasis@gmx.net
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details (www.gnu.org/licenses/gpl.html).
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+##############################################################################
+"""\
+ThanCad 0.9.1 "Students2024": n-dimensional CAD with raster support for engineers
+
+This module defines the structure which holds the elements of a (leaf) layer.
+It behaves as a set of elements, but it also keeps a spatial index (R-tree)
+on the bounding rectangles of the elements (thanXymm), so that the elements
+inside a window (regen, zoom, selection, export of a window) are found
+in about O(log n + k) time, instead of checking all the elements.
+The R-tree is static; it is bulk loaded the first time it is needed (for
+example after a drawing has been read) and it is rebuilt lazily when enough
+elements have been added, deleted or changed. The elements which were
+added since the last build are checked one by one.
+If the geometry of an element of the layer is changed in place, then
+thanUpdate() must be called so that the element is reindexed.
+A second R-tree, built only when object snap is first used, indexes the
+osnap points of the elements which do not depend on the cursor position
+(endpoints, midpoints and vertices, see ThanElement.thanSnapPoints()). It
+is kept up to date in the same lazy way.
+"""
+from p_ggeom import Rtree
+
+
+class ThanQuad:
+    "A set of elements with a spatial index on their bounding rectangles."
+    REBUILDMIN = 256        # Minimum number of pending changes that trigger a rebuild of the R-tree
+
+    def __init__(self, elems=()):
+        "Create a new structure, possibly with some elements."
+        self.__rect = {}    # element -> bounding rectangle which the element was indexed with
+        self.__nobox = set()# Objects without bounding rectangle (e.g. None, as a placeholder)
+        self.__pending = set() # Elements added (or updated) after the R-tree was built
+        self.__ndead = 0    # Number of entries of the R-tree which are no longer valid
+        self.__tree = None  # The R-tree: it is built when it is needed
+        self.__snaptree = None     # The R-tree of the osnap points: it is built when osnap is first used
+        self.__snappending = set() # Elements added (or updated) after the osnap R-tree was built
+        self.__snapndead = 0       # Number of elements of the osnap R-tree which are no longer valid
+        for e in elems: self.add(e)
+
+#---Set operations
+
+    def add(self, e):
+        "Add an element to the structure."
+        if e in self.__rect or e in self.__nobox: return
+        xymm = getattr(e, "thanXymm", None)
+        if xymm is None:
+            self.__nobox.add(e)
+            return
+        self.__rect[e] = tuple(xymm)
+        self.__pending.add(e)
+        if self.__snaptree is not None: self.__snappending.add(e)
+
+
+    def remove(self, e):
+        "Remove an element from the structure; raise KeyError if it does not exist."
+        if e in self.__nobox:
+            self.__nobox.remove(e)
+            return
+        del self.__rect[e]
+        if e in self.__pending: self.__pending.remove(e)
+        else:                   self.__ndead += 1
+        if self.__snaptree is None: return
+        if e in self.__snappending: self.__snappending.remove(e)
+        else:                       self.__snapndead += 1
+
+
+    def discard(self, e):
+        "Remove an element from the structure, if it exists."
+        if e in self.__rect or e in self.__nobox: self.remove(e)
+
+
+    def update(self, elems):
+        "Add many elements to the structure."
+        for e in elems: self.add(e)
+
+
+    def difference_update(self, elems):
+        "Remove many elements from the structure, if they exist."
+        for e in elems: self.discard(e)
+
+
+    def __isub__(self, elems):
+        "Remove many elements from the structure, if they exist."
+        self.difference_update(elems)
+        return self
+
+
+    def clear(self):
+        "Delete all the elements."
+        self.__init__()
+
+
+    def copy(self):
+        "Return a (plain) set with all the elements."
+        return set(self)
+
+
+    def __len__(self):
+        "Return the number of the elements."
+        return len(self.__rect) + len(self.__nobox)
+
+
+    def __contains__(self, e):
+        "Return True if element e is in the structure."
+        return e in self.__rect or e in self.__nobox
+
+
+    def __iter__(self):
+        "Iterate through all the elements."
+        for e in list(self.__rect): yield e
+        for e in list(self.__nobox): yield e
+
+#---Spatial index operations
+
+    def thanUpdate(self, elems):
+        "Reindex elements whose geometry (bounding rectangle) was changed in place."
+        for e in elems:
+            if e not in self.__rect: continue
+            self.remove(e)
+            self.add(e)
+
+
+    def thanReindex(self):
+        "Reindex all the elements, after the geometry of (almost) all of them was changed in place."
+        elems = list(self)
+        self.__init__(elems)     # The R-trees are bulk loaded again when they are needed
+
+
+    def __build(self):
+        "Bulk load the R-tree with all the elements, if needed."
+        nchanged = len(self.__pending) + self.__ndead
+        if self.__tree is not None and nchanged < max(self.REBUILDMIN, len(self.__rect)//8): return
+        self.__tree = Rtree((xymm, (xymm, e)) for e, xymm in self.__rect.items())
+        self.__pending = set()
+        self.__ndead = 0
+
+
+    def query(self, xymm):
+        """Yield the elements whose bounding rectangles intersect rectangle xymm.
+
+        Any of the coordinates of xymm may be None, which means no limit
+        in the corresponding direction (see ThanElement.thanInarea()).
+        The bounding rectangles are those that the elements were indexed with;
+        the caller may further test the exact geometry of the elements."""
+        self.__build()
+        rect = self.__rect
+        temp = [e for r, e in self.__tree.query(xymm) if rect.get(e) is r]
+        xa, ya, xb, yb = xymm
+        for e in self.__pending:
+            r = rect[e]
+            if xb is not None and r[0] > xb: continue
+            if yb is not None and r[1] > yb: continue
+            if xa is not None and r[2] < xa: continue
+            if ya is not None and r[3] < ya: continue
+            temp.append(e)
+        return iter(temp)
+
+
+    def thanXymm(self):
+        """Return a rectangle which contains all the elements, or None if there are no elements.
+
+        If elements were deleted after the R-tree was built, the rectangle may
+        be larger than the smallest rectangle which contains the elements
+        (see ThanDrawing.thanTkDraw() about xyMinMaxAct)."""
+        if len(self.__rect) == 0: return None
+        self.__build()
+        xymm = self.__tree.bounds()
+        if xymm is None: xymm = next(iter(self.__rect[e] for e in self.__pending))
+        xymm = list(xymm)
+        for e in self.__pending:
+            r = self.__rect[e]
+            if r[0] < xymm[0]: xymm[0] = r[0]
+            if r[1] < xymm[1]: xymm[1] = r[1]
+            if r[2] > xymm[2]: xymm[2] = r[2]
+            if r[3] > xymm[3]: xymm[3] = r[3]
+        return xymm
+
+
+    def __buildSnap(self):
+        "Bulk load the R-tree of the osnap points with all the elements, if needed."
+        nchanged = len(self.__snappending) + self.__snapndead
+        if self.__snaptree is not None and nchanged < max(self.REBUILDMIN, len(self.__rect)//8): return
+        self.__snaptree = Rtree(((c[0], c[1], c[0], c[1]), (r, e, typ, c))
+            for e, r in self.__rect.items() for typ, c in e.thanSnapPoints())
+        self.__snappending = set()
+        self.__snapndead = 0
+
+
+    def querySnap(self, xymm, otypes=None):
+        """Yield the osnap points (element, type, coordinates) which are inside rectangle xymm.
+
+        Only the types in otypes are returned, if otypes is not None. Only the
+        osnap points which are returned by thanSnapPoints() of the elements
+        are found here; the rest should be found by thanOsnap() of the elements."""
+        self.__buildSnap()
+        rect = self.__rect
+        temp = [(e, typ, c) for r, e, typ, c in self.__snaptree.query(xymm)
+                if rect.get(e) is r and (otypes is None or typ in otypes)]
+        xa, ya, xb, yb = xymm
+        for e in self.__snappending:
+            for typ, c in e.thanSnapPoints():
+                if otypes is not None and typ not in otypes: continue
+                if c[0] < xa or c[0] > xb or c[1] < ya or c[1] > yb: continue
+                temp.append((e, typ, c))
+        return iter(temp)
@@ -67,6 +67,7 @@ thanTranslateTo = "en"
 thanFiledir = ""                 #Directory where previous drawings were found
 thanFilerecent = []              #Recently opened files
 thanCameradir = ""               #Directory where photogrammetric camera files are stored
+thanSaveBinary = False           #If True, .thcx drawings are saved as binary chunks instead of bz2 text
 thanTempPrefix = "untitled"      #Prefix for the names of new drawings
 thanUndefPrefix = "<undefined>"  #Prefix for the undefined names (files, dirs etc)
 
@@ -138,7 +139,7 @@ def thanOptInterGet(c):
 
 def thanOptFilesGet(c):
     "Read recent opened file and recent directories."
-    global thanFiledir, thanFilerecent, thanCameradir
+    global thanFiledir, thanFilerecent, thanCameradir, thanSaveBinary
     try: val = c.get("files", "recent files")
     except: pass
     else: thanFilerecent = [ p_ggen.path(filnam) for filnam in val.split(";") if filnam.strip() != ""]
@@ -159,6 +160,11 @@ def thanOptFilesGet(c):
         thanCameradir = val
         if thanCameradir.strip() == "": thanCameradir = ""
 
+    try:
+        thanSaveBinary = c.getboolean("files", "save binary thcx")
+    except:
+        pass
+
 
 def thanOptGeometryGet(c):
     "Read dimensions in pixels of various objects."
@@ -220,6 +226,7 @@ def thanOptFilesSave(c):
     c.set("files", "recent files", ";".join(thanFilerecent))
     c.set("files", "recent directory", thanFiledir)
     c.set("files", "camera directory", thanCameradir)
+    c.set("files", "save binary thcx", str(bool(thanSaveBinary)))
 
 
 def thanOptGeometrySave(c):
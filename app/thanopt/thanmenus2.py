@@ -52,6 +52,7 @@ def thanStandardMenus2():
 
           (("save"),   T["&Save"],    T["Saves drawing into a file"]),
           (("saveas"), T["S&ave as"], T["Saves drawing into a file"]),
+          (("thcxformat"), T["Save &format"], T["Chooses text or binary format for the saved .thcx drawings"]),
           (("close"),  T["&Close"],   T["Closes current drawing"]),
 
           ("menu", T["Export to spreadsheet"], ""),             # Sub Menu Title
@@ -218,6 +219,7 @@ def thanStandardMenus2():
           (("glpexport"),       T["Export global points"], T["Writes gloabal point to a file"]),
           ("-",),
           ("geodeticprojection", T["Geo&detic Projection"], T["Displays and changes the geodetic projection of the drawing"]),
+          ("reproject", T["Re&project Drawing"], T["Transforms all the elements of the drawing to another geodetic projection"]),
           (("demload"),   T["Load DE&Ms"],       T["Loads DEMs (USGS format) stored in .tif files"]),
           (("dem"),       T["Manage DE&Ms"],     T["Manages DEMs (USGS format) stored in .tif files"]),
           (("demdirectory"), T["Locate DEM directory"], T["Locates the directory for missing files of DEMs"]),
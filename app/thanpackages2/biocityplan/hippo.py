@@ -30,7 +30,8 @@ from math import cos, sin, pi
 import itertools
 import p_gimage
 import p_ggen, p_gcol, p_gdxf, p_gchart, p_gmath, p_gtri, p_ggeom
-from . import roadut, hippocache, roadem
+from p_gpoleod import hippocache
+from . import roadut, roadem
 
 
 class HippoUrban:
@@ -72,9 +73,9 @@ class HippoUrban:
         return self.changed == other.changed
 
 
-    def build_cache(self, dtm, prt=p_ggen.prg):
-        "Create road grid every dx, dy, dtheta; cache the results."
-        self.cache.build_cache(dtm, self.hull, prt, self.devdebug)
+    def build_cache(self, dtm, prt=p_ggen.prg, nworkers=1, cachedir=None):
+        "Create road grid every dx, dy, dtheta; cache the results (see HippoCache.build_cache())."
+        self.cache.build_cache(dtm, self.hull, prt, nworkers, cachedir)
         self.minmax(dtm, prt)
         self.changed += 1    #Object has been modified
 
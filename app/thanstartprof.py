@@ -0,0 +1,153 @@
+##############################################################################
+# ThanCad 0.9.1 "Students2024": n-dimensional CAD with raster support for engineers
+#
+# Copyright (C) 2001-2025 Thanasis Stamos, May 20, 2025
+# Athens, Greece, Europe
+# URL: http://thancad.sourceforge.net
+# e-mail: cyberthanasis@gmx.net
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details (www.gnu.org/licenses/gpl.html).
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+##############################################################################
+"""\
+ThanCad 0.9.1 "Students2024": n-dimensional CAD with raster support for engineers
+
+Package thancad.
+This module profiles the startup of ThanCad. It is enabled if the environment
+variable THANCAD_STARTPROF is set to the name of a JSON file, for example:
+    THANCAD_STARTPROF=/tmp/startprof.json python3 thancad.py
+It records the wall-clock time of each initialisation phase and of each
+import which actually loads modules (cumulative time, and self time which
+excludes the nested imports). When the startup ends, a report sorted by time
+is written to a text file with the same name and suffix .txt, and all the
+data are written to the JSON file.
+This module must be imported first, and it uses only the standard library,
+so that the imports of ThanCad itself are measured.
+"""
+
+import sys, os, time, json, threading, builtins
+from contextlib import contextmanager
+from importlib.util import resolve_name
+
+ENVNAME = "THANCAD_STARTPROF"
+
+
+def thanStartProfile():
+    "Return a profiler of the startup; it does nothing if the environment variable is not set."
+    return ThanStartProfile(os.environ.get(ENVNAME) or None)
+
+
+class ThanStartProfile:
+    "Records the time of the initialisation phases and of the imports of ThanCad."
+
+    def __init__(self, filnam=None):
+        "Start profiling (if filnam is not None)."
+        self.filnam = filnam
+        self.phases = []          # (phase name, seconds)
+        self.imports = []         # Dictionaries with the time of each import
+        self.__t0 = time.perf_counter()
+        self.__phase = ""         # The current phase
+        self.__stack = []         # Time of the nested imports of each pending import
+        self.__import = None      # The original __import__()
+        self.__thread = threading.get_ident()
+        if filnam is None: return
+        self.__import = builtins.__import__
+        builtins.__import__ = self.__timedImport
+
+
+    @contextmanager
+    def phase(self, name):
+        "Record the time of the statements in the with block as phase name."
+        if self.filnam is None:
+            yield
+            return
+        prev = self.__phase
+        self.__phase = name
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter()-t))
+            self.__phase = prev
+
+
+    def __timedImport(self, name, globals=None, locals=None, fromlist=(), level=0):
+        "Call the original __import__() and record its time, if it loaded any module."
+        if threading.get_ident() != self.__thread:
+            return self.__import(name, globals, locals, fromlist, level)
+        n = len(sys.modules)
+        self.__stack.append(0.0)
+        t = time.perf_counter()
+        try:
+            return self.__import(name, globals, locals, fromlist, level)
+        finally:
+            dt = time.perf_counter() - t
+            dtnested = self.__stack.pop()
+            if len(sys.modules) != n:                  # Modules were actually loaded
+                if self.__stack: self.__stack[-1] += dt
+                self.imports.append(dict(module=_absName(name, globals, level),
+                    fromlist=list(fromlist or ()), cumulative=dt, self=dt-dtnested,
+                    depth=len(self.__stack), phase=self.__phase))
+
+
+    def end(self):
+        "Stop profiling and write the report and the JSON file."
+        if self.filnam is None: return
+        if builtins.__import__ == self.__timedImport: builtins.__import__ = self.__import
+        total = time.perf_counter() - self.__t0
+        data = dict(total=total, argv=sys.argv, python=sys.version, nmodules=len(sys.modules),
+            phases=[dict(name=name, seconds=dt) for name, dt in self.phases],
+            imports=self.imports)
+        try:
+            with open(self.filnam, "w") as fw:
+                json.dump(data, fw, indent=1)
+            with open(os.path.splitext(self.filnam)[0] + ".txt", "w") as fw:
+                self.write(fw, total)
+        except (IOError, OSError) as why:
+            print("Startup profile could not be written to %s: %s" % (self.filnam, why), file=sys.stderr)
+        self.filnam = None
+
+
+    def write(self, fw, total):
+        "Write a report sorted by time to a file (like) object."
+        fw.write("ThanCad startup: %.3f s, %d modules loaded\n" % (total, len(sys.modules)))
+        fw.write("\nPhases:\n")
+        for name, dt in self.phases:
+            fw.write("%10.1f ms  %s\n" % (dt*1000, name))
+        fw.write("\nTop level imports, sorted by cumulative time:\n")
+        fw.write("%10s  %10s  %-40s %s\n" % ("cum ms", "self ms", "module", "phase"))
+        for imp in sorted((imp for imp in self.imports if imp["depth"] == 0), key=lambda imp: -imp["cumulative"]):
+            fw.write("%10.1f  %10.1f  %-40s %s\n" % (imp["cumulative"]*1000, imp["self"]*1000, _label(imp), imp["phase"]))
+        fw.write("\nAll imports, sorted by self time:\n")
+        fw.write("%10s  %10s  %5s  %s\n" % ("self ms", "cum ms", "depth", "module"))
+        for imp in sorted(self.imports, key=lambda imp: -imp["self"]):
+            fw.write("%10.1f  %10.1f  %5d  %s\n" % (imp["self"]*1000, imp["cumulative"]*1000, imp["depth"], _label(imp)))
+
+
+def _absName(name, globals, level):
+    "Return the absolute name of a (possibly relative) import."
+    if level == 0 or not globals: return name
+    package = globals.get("__package__") or globals.get("__name__", "")
+    try:
+        return resolve_name("."*level + name, package)
+    except (ImportError, ValueError):
+        return name
+
+
+def _label(imp):
+    "Return the module of an import, with the names imported from it."
+    names = imp["fromlist"]
+    if not names: return imp["module"]
+    if len(names) > 4: names = names[:3] + ["..."]
+    return "%s (%s)" % (imp["module"], ", ".join(names))
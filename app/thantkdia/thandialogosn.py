@@ -31,7 +31,6 @@ from tkinter import Tk, Frame, Button, Label, Canvas, Checkbutton, IntVar, NORMA
 import p_ggen, p_gtkwid
 from thanopt import thancadconf
 from thandefs.thanatt import ThanAttCol
-from thanvar import thanimag
 from thantrans import T
 S = p_ggen.ThanStub
 
@@ -89,6 +88,7 @@ class ThanTkOsnap(p_gtkwid.ThanDialog):
         w = Label(f, text=" Object Snap Modes")
         w.grid(row=0, column=1, columnspan=4, sticky="w")
 
+        from thanvar import thanimag      #It is big: import it only when the dialog is shown
         but = p_gtkwid.ThanButtonIm(f, image=thanimag.ntuabig3(), title=T["National Technical University of Athens"],
             url="www.ntua.gr/en", iconsize=(480,360))
 #        but = p_gtkwid.ThanButtonIm(f, image=thanimag.hannover_leibniz(), title=T["Leibniz Universitaet Hannover"],
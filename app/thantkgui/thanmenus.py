@@ -124,6 +124,7 @@ def thanStandardMenus(B):
           (S(B, "openunload"), T["Open &without images"], T["Opens an existing drawing with the images unloaded"]),
           (S(B, "save"),   T["&Save"],    T["Saves drawing into a file"]),
           (S(B, "saveas"), T["S&ave as"], T["Saves drawing into a file"]),
+          (S(B, "thcxformat"), T["Save &format"], T["Chooses text or binary format for the saved .thcx drawings"]),
           (S(B, "close"),  T["&Close"],   T["Closes current drawing"]),
           ("-",),               # Separator
           (S(B, "insert"), T["Ins&ert"],    T["Inserts other drawings into current drawing"]),
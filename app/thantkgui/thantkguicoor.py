@@ -76,6 +76,7 @@ class ThanTkGuiCoor:
         self.__onsizepreempt = False
         self.__autoregen_preempt = False
         self.__regen_preempt = False
+        self.__regenDt = None               # Length of 20 pixels at the last full regen
 
         self.thanCanvas.bind("<Configure>", self.__onSize)    # Bind in the end, in order to avoid preemptive calls
 
@@ -257,7 +258,7 @@ class ThanTkGuiCoor:
             return
         self.__autoregen_preempt = True
 
-        if self.__isRegenNeeded():
+        if self.__isRegenNeeded() and not self.thanRegenIncr():
             self.thanRegen()                      # This, of course, regenerates images too
         else:
             d = self.thanImages.copy()            # Shallow copy (i.e fast)
@@ -297,6 +298,7 @@ class ThanTkGuiCoor:
         self.__resetWinCoor()                   # Reset coordinates so that Canvas logical coordinates are near 0,0
         self.thanGudCalcScale()                 # It is neeeded because logical port was changed
         self.thanCanvas.thanGudCoorChanged()
+        self.__regenDt = self.thanGudGetDt()
         import time
         t1 = time.time()
         print("Regenerating elements..",)
@@ -310,6 +312,29 @@ class ThanTkGuiCoor:
         self.thanCom.thanAppend(T["end of regeneration.\n"])   # Inform that regeneration finished
 
 
+    def thanRegenIncr(self):
+        """Draws only the changed elements and the newly exposed part of the drawing.
+
+        It is used instead of a full regen after a pan or a zoom; the elements
+        which are already in the canvas are left as they are. However, curves
+        (circles, arcs etc.) are approximated by line segments according to the
+        scale at the time they were drawn. If the scale has changed too much
+        since the last full regen, the approximation is too coarse (or too
+        fine), and False is returned so that the caller does a full regen.
+        IT DOES NOT CHANGE THE COORDINATE SYSTEM TRANSFORMATION.
+        """
+        if self.__regenDt is None: return False
+        r = self.thanGudGetDt() / self.__regenDt
+        if r < 0.5 or r > 2.0: return False
+        temp = self.than.markselected
+        self.than.markselected = self.thanSelall
+        n = self.thanProj[1].thanTkDrawIncr(self.than)
+        self.than.markselected = temp
+        if n is None: return False
+        if n > 0: self.thanRedraw()             # New items are on top: restore the draworder of the layers
+        return True
+
+
     def thanRedraw(self):
         """Ensures the relative draworder of the layers.
 
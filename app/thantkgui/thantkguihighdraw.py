@@ -274,7 +274,6 @@ class ThanTkGuiHighDraw:
         phi = (phi*180.0/pi) % 360.0
 
         dc = self.thanCanvas
-        tagel = self.thanProj[1].thanTagel
         for item in dc.find_withtag("selall"):
             t = dc.type(item)
             c = dc.coords(item)
@@ -298,13 +297,11 @@ class ThanTkGuiHighDraw:
                 c.append(c[0]+dx)     #This is the new upper..
                 c.append(c[1]-dy)     #..right corner
             elif t == "image" or t == "bitmap":   #Thanasis2022_12_20: code for bitmap and image
-                titem = dc.gettags(item)[0]
-                e = tagel[titem]
-                im = e.imagez
-                if im is None:
-                    print("Warning: associated Element of canvas.image, does not have the photoimage!!")
-                    return
-                dy = im.height()                  #c[0],c[1] is always the upper left corner
+                if t == "image":                  #An image element may be drawn as many tiles (items)
+                    dy = int(dc.tk.call("image", "height", dc.itemcget(item, "image")))
+                else:
+                    xy = dc.bbox(item)
+                    dy = xy[3] - xy[1]
                 c = [c[0], c[1]+dy]               #This the lower left corner (y axis positive is downwards)
                 ThanElement.thanRotateXypn2(c)
                 c = [c[0], c[1]-dy]               #This is the new upper left corner
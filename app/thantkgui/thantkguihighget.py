@@ -27,7 +27,6 @@ This module defines functionality necessary for user interaction in a drawing
 window.
 """
 
-import time
 from math import atan2, hypot, cos, sin
 import tkinter
 from tkinter import simpledialog
@@ -932,27 +931,46 @@ class ThanTkGuiHighGet:
 
 
     def thanGudGetSelWin(self, xa, ya, xb, yb):
-        "Gets a selection on a given window."
-        ct = self.thanCt
-        xa, ya = ct.global2Local(xa, ya)
-        xb, yb = ct.global2Local(xb, yb)
+        """Gets a selection on a given window.
+
+        The elements are found geometrically in model space (see
+        ThanDrawing.thanSelWin()); the canvas is only used to mark them."""
+        xymm = min(xa, xb), min(ya, yb), max(xa, xb), max(ya, yb)
+        return self.__selElems(self.thanProj[1].thanSelWin(xymm))
+
+
+    def thanGudGetSelFence(self, cf):
+        "Gets a selection of the elements which intersect a polyline (fence)."
+        return self.__selElems(self.thanProj[1].thanSelFence(cf))
+
+
+    def thanGudGetSelPolygon(self, cf, crossing=False):
+        "Gets a selection of the elements which are inside (or cross, if crossing is True) a polygon."
+        return self.__selElems(self.thanProj[1].thanSelPolygon(cf, crossing))
+
+
+    def __selElems(self, elems):
+        "Marks the elements, which were found geometrically, as current selection and counts them."
         dc = self.thanCanvas
-#        self.thanGudSetSelClear()
         dc.dtag("selall", "sel")                     # Clear tag "sel"
         self.thanProj[2].thanCanvas.thanCh.thanDisable()
-        items = dc.addtag_enclosed("sel", xa, ya, xb, yb)
-#       No need to avoid selecting the raster of ThanImage, because all the raster must be enclosed, in order to be selected
-        print("filterwin started"); t1 = time.time()
-        self.__filterwin()
-        print("filterwin ended:", time.time()-t1)
-        return self.__selCount()
+        ft = self.__externalFilterFunc
+        if ft is not None: elems = {e for e in elems if ft(e)} # If element satisfies the external filter OK
+        for e in elems: dc.addtag_withtag("sel", e.thanTags[0])
+        dc.addtag_withtag("selall", "sel")          # Add selall to all selected items
+        return self.__selCount(elems)
 
-    def __selCount(self):
-        "Updates and counts the selected ThanCad elements."
+
+    def __selCount(self, elems=None):
+        """Updates and counts the selected ThanCad elements.
+
+        If elems is None, the selected elements are found from the canvas items with tag "sel"."""
 #        cget = self.thanCanvas.itemcget
-        cget = self.thanCanvas.gettags
-        tagel = self.thanProj[1].thanTagel
-        self.thanSel = set(tagel[cget(item)[0]] for item in self.thanCanvas.find_withtag("sel"))
+        if elems is None:
+            cget = self.thanCanvas.gettags
+            tagel = self.thanProj[1].thanTagel
+            elems = set(tagel[cget(item)[0]] for item in self.thanCanvas.find_withtag("sel"))
+        self.thanSel = set(elems)
         nselect = len(self.thanSel)
         nduplic = nselect - len(self.thanSel - self.thanSelall)
         self.thanSelall |= self.thanSel
@@ -1002,40 +1020,6 @@ class ThanTkGuiHighGet:
         dc.addtag_withtag("selall", "sel")  # Add selall to all selected items
 
 
-    def __filterwin(self):
-        """Discards 'compound' items that are not completely within the window.
-
-        Some of ThanCad's elements, for now points and texts (and all the
-        elements with dashed lines in the future), are represented by more
-        than one Tkinter items. In select window, we must make sure that all
-        the items of a single compound element are present within the window.
-        If they are not, the element and its corresponding items are deleted
-        from the selection.
-        """
-        dc = self.thanCanvas
-        items1 = {}
-        for item in dc.find_all():
-            tags = dc.gettags(item)
-            if len(tags) == 0: continue   #Avoid osnap symbols  #Thanasis2021_11_28
-            titem = tags[0]
-            try: items1[titem].add(item)     # These are the items of a single ThanCad (compound) element
-            except KeyError: items1[titem] = set((item,))
-
-        dc.addtag_withtag("sel1", "sel")     # Add sel1 to all items within selection window
-        dc.dtag("nocomp", "sel1")            # Delete sel1 from items of non-compound elements
-        items = set(dc.find_withtag("sel1")) # All items of compound elements within selection window
-        while len(items) > 0:
-            for item in items: break
-            titem = dc.gettags(item)[0]
-            items2 = items1[titem]           # I use this instead of items2=dc.find_withtag(titem), because it is 30 times faster
-            if not items2 <= items:          # If items1 is not subset of items, then the ThanCad element..
-                dc.dtag(titem, "sel")        # .. is removed from selection
-            items -= items2
-        dc.dtag("all", "sel1")
-        if self.__externalFilterFunc is not None: self.__filterexternal()
-        dc.addtag_withtag("selall", "sel")   # Add selall to all selected items
-
-
     def __filterexternal(self):
         "Removes elements that do not satisfy external filter."
         dc = self.thanCanvas
@@ -1052,20 +1036,12 @@ class ThanTkGuiHighGet:
 
 
     def thanGudGetSelCros(self, xa, ya, xb, yb):
-        "Gets a selection on a given crossing window."
-        ct = self.thanCt
-        xa, ya = ct.global2Local(xa, ya)
-        xb, yb = ct.global2Local(xb, yb)
-        dc = self.thanCanvas
-#        self.thanGudSetSelClear()
-        dc.dtag("selall", "sel")                     # Clear tag "sel"
-        self.thanProj[2].thanCanvas.thanCh.thanDisable()
-        dc.addtag_overlapping("sel", xa, ya, xb, yb)
-#       We need to avoid selecting the raster of ThanImage
-        print("filtercros started"); t1 = time.time()
-        self.__filtercros()
-        print("filtercros ended:", time.time()-t1)
-        return self.__selCount()
+        """Gets a selection on a given crossing window.
+
+        The elements are found geometrically in model space (see
+        ThanDrawing.thanSelCros()); the canvas is only used to mark them."""
+        xymm = min(xa, xb), min(ya, yb), max(xa, xb), max(ya, yb)
+        return self.__selElems(self.thanProj[1].thanSelCros(xymm))
 
 
     def __filtercrosold(self):
@@ -26,11 +26,16 @@ ThanCad 0.9.1 "Students2024": n-dimensional CAD with raster support for engineer
 This module defines the object snap functionality.
 """
 
+from math import fabs
 from thanvar import thanLogTk
 from thanopt import thancadconf
 from thandefs.thanatt import ThanAttCol
 
-_AVOIDTAG = frozenset(("e0", "edrag", "enull"))
+
+def _otypesRest(otypes, e):
+    "Return the osnap types which are not found through the osnap points index for element e."
+    if not e.thanSnapTypes: return otypes
+    return set(otypes) - e.thanSnapTypes
 
 
 class ThanOsnap:
@@ -61,65 +66,57 @@ class ThanOsnap:
 
 
     def thanFind(self):
-        "Finds end, mid, center etc near the mouse cursor."
+        """Finds end, mid, center etc near the mouse cursor.
+
+        The elements and the osnap points near the cursor are found in model
+        space through the spatial index of the layers, and not through the
+        canvas items (see thanlayer.ThanQuad); the canvas is only used to
+        show the osnap symbol."""
         if self.preempt:
             thanLogTk.error("tklowget: osnapFind: preemptive call. It shouldn't happen.")
             return
         self.preempt = True
         dc = self.thanProj[2].thanCanvas
-        tagel = self.thanProj[1].thanTagel
+        dr = self.thanProj[1]
         ct = self.thanProj[2].thanCt
         bpix, hpix = self.BSEL//2, self.BSEL//2
-        x1, y1 = dc.thanXcu-bpix, dc.thanYcu-hpix
-        x2, y2 = dc.thanXcu+bpix, dc.thanYcu+hpix
-        items = dc.find_overlapping(x1, y1, x2, y2)
+        xa, ya = ct.local2Global(dc.thanXcu-bpix, dc.thanYcu+hpix)
+        xb, yb = ct.local2Global(dc.thanXcu+bpix, dc.thanYcu-hpix)
+        xymm = min(xa, xb), min(ya, yb), max(xa, xb), max(ya, yb)
         otypes = self.types
 
         ccu = list(self.thanProj[1].thanVar["elevation"])
         ccu[:2] = ct.local2Global(dc.thanXcu, dc.thanYcu)
         if "ele" in otypes:
-            selems = self.selems
-            for item in items:
-                tags = dc.gettags(item)
-                                                # Tkinter may automatically add the tag 'current' in any element
-                                                # so the next test (which should succeed) does not succeed.
-                                                # Thus we have to check for "e0", "edrag" and "enull"
-                if len(tags) < 2: continue      # We avoid current (rubber line)
-                if tags[0] in _AVOIDTAG: continue    # We avoid current compound element (we shouldn't really)
-                e = tagel[tags[0]]
-                if e in selems:
-                    dc.delete("e0")
-                    self.selem = e
-                    e1 = e.thanClone()
-                    e1.thanUntag()             #Make thanTags and handle invalid
-                    e1.thanTags = ("e0",)
-                    than = self.thanProj[2].than
-                    col1 = than.outline
-                    than.outline = self.tcol
-                    e1.thanTkDraw(than)
-                    dc.itemconfig("e0", width=5)
-                    than.outline = col1
-                    self.preempt = False
-                    return
+            e = self.__ele(dr.thanOsnapElems(xymm), ccu, (xymm[2]-xymm[0])+(xymm[3]-xymm[1]))
+            if e is not None:
+                dc.delete("e0")
+                self.selem = e
+                e1 = e.thanClone()
+                e1.thanUntag()             #Make thanTags and handle invalid
+                e1.thanTags = ("e0",)
+                than = self.thanProj[2].than
+                col1 = than.outline
+                than.outline = self.tcol
+                e1.thanTkDraw(than)
+                dc.itemconfig("e0", width=5)
+                than.outline = col1
+                self.preempt = False
+                return
             self.selem = None
             dc.delete("e0")
             self.preempt = False
             return
-        elif "int" in otypes:
-            ps = self.__int(dc, tagel, otypes, items, ccu, self.cc1)
+
+        if "ena" not in otypes: ps = []             # Object snap is disabled
+        else: ps = [(fabs(c[0]-ccu[0])+fabs(c[1]-ccu[1]), typ, c) for e, typ, c in dr.thanOsnapPoints(xymm, otypes)]
+        elems = dr.thanOsnapElems(xymm)
+        if "int" in otypes:
+            ps.extend(self.__int(elems, otypes, ccu, self.cc1))
         else:
-            ps = []
-            for item in items:
-#               tags = dc.itemcget(item, "tags").split()
-                if dc.type(item) == "image": continue # Ignore Tk images; only the bounding rectangle counts
-                tags = dc.gettags(item)
-                if len(tags) < 2: continue      # We avoid current (rubber line)
-                if tags[0] in _AVOIDTAG: continue    # We avoid current compound element (we shouldn't really)
-                e = tagel[tags[0]]
-                p = e.thanOsnap(self.thanProj, otypes, ccu, None, self.cc1)
-                if p is not None:
-                    ps.append(p)
-                    if len(ps) > 2: break
+            for e in elems:
+                p = e.thanOsnap(self.thanProj, _otypesRest(otypes, e), ccu, None, self.cc1)
+                if p is not None: ps.append(p)
         for item1 in self.items: dc.delete(item1)
         if len(ps) < 1:
             self.items = ()
@@ -187,34 +184,39 @@ class ThanOsnap:
         self.preempt = False
 
 
-    def __int(self, dc, tagel, otypes, items, ccu, cc1):
+    def __ele(self, elems, ccu, dmax):
+        "Finds the selectable element nearest to the mouse cursor."
+        selems = self.selems
+        emin = None
+        for e in elems:
+            if e not in selems: continue
+            c = e.thanPntNearest(ccu)
+            if c is None:
+                d = dmax                    # Nearest point not implemented: the bounding rectangle suffices
+            else:
+                d = fabs(c[0]-ccu[0])+fabs(c[1]-ccu[1])
+                if d > dmax: continue
+            if emin is None or d < dmin: emin, dmin = e, d
+        return emin
+
+
+    def __int(self, elems, otypes, ccu, cc1):
         "Finds int near the mouse cursor."
-        dc = self.thanProj[2].thanCanvas
         ps = []
-        it = iter(items)
-        for item in it:                     # Search for first element of intersection
-            if dc.type(item) == "image": continue # Ignore Tk images; only the bounding rectangle counts
-            tags = dc.gettags(item)
-            if len(tags) < 2:   continue    # We avoid current (rubber line)
-            if tags[0] in _AVOIDTAG: continue    # We avoid current compound element (we shouldn't really)
-            e = tagel[tags[0]]
-            p = e.thanOsnap(self.thanProj, otypes, ccu, None, self.cc1)
+        it = iter(elems)
+        for e in it:                        # Search for first element of intersection
+            p = e.thanOsnap(self.thanProj, _otypesRest(otypes, e), ccu, None, self.cc1)
             if p is not None: ps.append(p)
             break
         else: return ps
         etried = False
-        for item in it:                     # Search for second element of intersection
-            if dc.type(item) == "image": continue # Ignore Tk images; only the bounding rectangle counts
-            tags = dc.gettags(item)
-            if len(tags) < 2:   continue    # We avoid current (rubber line)
-            if tags[0] in _AVOIDTAG: continue    # We avoid current compound element (we shouldn't really)
+        for e2 in it:                       # Search for second element of intersection
             etried = True
-            e2 = tagel[tags[0]]
-            p = e.thanOsnap(self.thanProj, otypes, ccu, e2, cc1)
+            p = e.thanOsnap(self.thanProj, _otypesRest(otypes, e), ccu, e2, cc1)
             if p is not None: ps.append(p); break
             e = e2
         if etried: return ps
-        p = e.thanOsnap(self.thanProj, otypes, ccu, None, cc1)
+        p = e.thanOsnap(self.thanProj, _otypesRest(otypes, e), ccu, None, cc1)
 
         if p is not None: ps.append(p)
         return ps
@@ -92,6 +92,7 @@ class ThanTkGuiWinDraw(tkinter.Toplevel,
         self.than.thanDimstyles  = dr.thanDimstyles           # Just a reference
         self.than.thanImages = self.thanImages = set()        # For image zoom reasons
         self.than.fillModeOn = dr.thanVar["fillmode"]
+        self.than.draftTextOn = False     #If True, horizontal texts are drawn with canvas fonts (fast but inaccurate)
         self.than.thanGudGetDt = self.thanProj[2].thanGudGetDt
 
         width, height, widthmm, heightmm = p_gtkwid.thanRobustDim()
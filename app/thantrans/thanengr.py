@@ -54,6 +54,13 @@ en2gr = \
 "&Save"                                           : u"Αποθήκευση",
 "Save"                                            : u"Αποθήκευση",
 "S&ave as"                                        : u"Αποθήκευση ως",
+"Save &format"                                    : u"Μορφή αποθήκευσης",
+"Chooses text or binary format for the saved .thcx drawings":
+    u"Επιλέγει μορφή κειμένου ή δυαδική για τα αποθηκευμένα σχέδια .thcx",
+"Save .thcx drawings as Text/Binary (enter=%s): " : u"Αποθήκευση σχεδίων .thcx ως Κείμενο(Text)/Δυαδικά(Binary) (enter=%s): ",
+"Drawings will be saved as binary .thcx (faster to open; older ThanCad versions can not read them).":
+    u"Τα σχέδια θα αποθηκεύονται ως δυαδικά .thcx (ανοίγουν γρηγορότερα· παλαιότερες εκδόσεις του ThanCad δεν μπορούν να τα διαβάσουν).",
+"Drawings will be saved as text .thcx."           : u"Τα σχέδια θα αποθηκεύονται ως κείμενο .thcx.",
 
 "with &surface"                                   : "με επιφάνεια",
 "Opens spreadsheets (ods,xls,xlsx) which contain coordinates of surface.":
@@ -103,6 +110,8 @@ en2gr = \
 "Choose files to open"                            : u"Επιλέξτε αρχεία για άνοιγμα",
 "file has been successfully imported (into another window).": u"Το αρχείο εισήχθη επιτυχώς (σε άλλο παράθυρο).",
 "import failed."                                  : u"η εισαγωγή απέτυχε.",
+"importing.."                                     : u"εισαγωγή..",
+"Import was cancelled by the user."               : u"Η εισαγωγή ακυρώθηκε από το χρήστη.",
 "file has been successfully exported."            : u"Το αρχείο εξήχθη επιτυχώς.",
 "export failed."                                  : u"η εξαγωγή απέτυχε.",
 
@@ -253,6 +262,21 @@ en2gr = \
                                                     u"Επιλογή ελειψοειδούς: g=GRS80/w=WGS84/r=Ελληνικό(ΕΓΣΑ87)/n=NAD83 (enter=g): ",
 "UTM zone (1-60) (enter=34): "                    : u"Ζώνη παγκόσμιας μερκατορικής προβολής (1-60) (enter=34): ",
 "North/South (enter=N): "                         : u"N=βόρειο ημισφαίριο/S=νότιο ημισφαίριο (enter=βόρειο): ",
+"Re&project Drawing"                              : u"Μετασχηματισμός Σχεδίου",
+"Transforms all the elements of the drawing to another geodetic projection":
+                                                    u"Μετασχηματίζει όλα τα στοιχεία του σχεδίου σε άλλη γεωδαιτική προβολή",
+"The drawing is already in this geodetic projection.": u"Το σχέδιο είναι ήδη σε αυτή τη γεωδαιτική προβολή.",
+"Reprojecting.."                                  : u"Μετασχηματισμός..",
+"Reproject was cancelled by the user."            : u"Ο μετασχηματισμός ακυρώθηκε από το χρήστη.",
+"No elements to reproject."                       : u"Δεν υπάρχουν στοιχεία για μετασχηματισμό.",
+"%d points can not be transformed to the new geodetic projection.":
+                                                    u"%d σημεία δεν μπορούν να μετασχηματιστούν στη νέα γεωδαιτική προβολή.",
+"%d elements (%d points) were reprojected."       : u"%d στοιχεία (%d σημεία) μετασχηματίστηκαν.",
+"Script ended while a command was waiting for input.":
+                                                    u"Το αρχείο εντολών τελείωσε ενώ μια εντολή περίμενε δεδομένα.",
+"File %s does not exist. Try again."              : u"Το αρχείο %s δεν υπάρχει. Ξαναδοκίμασε.",
+"Warning: the drawing was modified, but it was not saved.":
+                                                    u"Προσοχή: το σχέδιο τροποποιήθηκε, αλλά δεν αποθηκεύτηκε.",
 
 "Load DE&Ms"                                      : u"Εισαγωγή ΨΜΕπ",
 "Loads DEMs (USGS format) stored in .tif files"   : u"Εισαγωγή Ψηφιακών Μοντέλων Επιφανείας (μορφή USGS) που είναι αποθηκευμένα σε αρχεία .tif",
@@ -280,11 +304,13 @@ en2gr = \
 "&Interchange"                                    : u"Κυκλοφοριακός κόμβος",
 "Creates an interchange between 2 highways"       : u"Υπολογίζει και σχεδιάζει κυκλοφορικαό κόμβο μεταξύ 2 εθνικών οδών",
 
-"Select an element (w=window/c=crossing/l=layers/f=layer of/p=previous): ":
+"Select an element (w=window/c=crossing/fence/wpolygon/cpolygon/l=layers/f=layer of/p=previous): ":
                                                     u"Επιλογή ενός στοιχείου (w=παράθυρο/c=παράθυρο τομής/"\
+                                                    u"fence=φράχτης/wpolygon=πολύγωνο/cpolygon=πολύγωνο τομής/"\
                                                     u"l=διαφάνειες/f=διαφάνεια του/p=προηγούμενα): ",
-"Select an element (w=window/c=crossing/l=layers/f=layer of/p=previous/%s): ":
+"Select an element (w=window/c=crossing/fence/wpolygon/cpolygon/l=layers/f=layer of/p=previous/%s): ":
                                                     u"Επιλογή ενός στοιχείου (w=παράθυρο/c=παράθυρο τομής/"\
+                                                    u"fence=φράχτης/wpolygon=πολύγωνο/cpolygon=πολύγωνο τομής/"\
                                                     u"l=διαφάνειες/f=διαφάνεια του/p=προηγούμενα/%s): ",
 
 "First window corner: "                           : u"Πρώτη κορυφή παραθύρου: ",
@@ -313,6 +339,7 @@ en2gr = \
 "Select a line with 3 point to fit highway interchange\n": u"Επιλέξτε μία γραμμή με 3 σημεία για να τοποθετηθεί κυκλοφοριακός κόμβος\n",
 "First point: "                                   : u"Πρώτο σημείο: ",
 "Next point: "                                    : u"Επόμενο σημείο: ",
+"Next point (enter=end): "                        : u"Επόμενο σημείο (enter=τέλος): ",
 "(closed)"                                        : u"(κλειστή)",
 "(open)"                                          : u"(ανοικτή)",
 "Press enter to continue.."                       : u"(Πατείστε enter για συνέχεια..",
@@ -565,6 +592,8 @@ en2gr = \
 "%d points with invalid z were put into layer %s.": u"%d σημεία με λάθος z τοποθετήθηκαν στη διαφάνεια %s.",
 "%d profiles were created."                       : u"Δημιουργήθηκαν %d μηκοτομές.",
 "%d triangles were generated."                    : u"Δημιουργήθηκαν %d τρίγωνα.",
+"Warning: %d break line segments could not be inserted into the triangulation:":
+    u"Προσοχή: %d τμήματα γραμμών αλλαγής κλίσης δεν ήταν δυνατό να εισαχθούν στον τριγωνισμό:",
 "%d unknown elements were not imported"           : u"Δεν έγινε εισαγωγή %d άγνωστων στοιχείων.",
 "%d/%d lines were transformed to 3d."             : u"%d/%d γραμμές μετατράπηκαν σε τρισδιάστατες.",
 "%d/%d points were transformed to 3d."            : u"%d/%d σημεία μετατράπηκαν σε τρισδιάστατες.",
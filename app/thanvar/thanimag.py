@@ -27,6 +27,9 @@ ThanCad 0.9.1 "Students2024": n-dimensional CAD with raster support for engineer
 
 This module contains the definitions of some raster images
 Use im2py.py utility to convert jpgs to this format.
+An image is decoded only when its function is called. The module is big,
+so it should be imported only when an image is actually needed, and not
+at the top of other modules which are imported at startup.
 """
 import base64, io
 import p_gimage